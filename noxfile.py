@@ -577,6 +577,19 @@ def rr_tests(session: nox.Session) -> None:
     session.run("pytest", *session.posargs, env={"PYTHONWARNDEFAULTENCODING": "1"})
 
 
+@nox.session(default=False)
+def rr_bench(session: nox.Session) -> None:
+    """
+    Run the sp-repo-review benchmarks. Pass --bench-save to save the timings
+    as the baseline that later runs are compared against.
+    """
+    pyproject = nox.project.load_toml()
+    test_deps = nox.project.dependency_groups(pyproject, "test")
+
+    session.install("-e.", *test_deps)
+    session.run("pytest", "tests/benchmarks", "-s", *session.posargs)
+
+
 @nox.session(reuse_venv=True, default=False)
 def rr_build(session: nox.Session) -> None:
     """
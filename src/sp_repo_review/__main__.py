@@ -0,0 +1,286 @@
+"""
+The ``sp-repo-review`` command: repo-review's command line, but reviewing
+with :func:`sp_repo_review.processor.process` and this package's
+:class:`~sp_repo_review.processor.Registry`, so checks outside ``--select``
+and ``--ignore`` (and the files only they read) are skipped instead of run
+and filtered out, and files over the size limit fail the checks that read
+them.
+
+:func:`parser` and :func:`review_packages` are shared with
+:mod:`sp_repo_review.daemon.server`, so both print the same output.
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = ["logging", "os", "sys", "urllib", "urllib.error"]
+
+import argparse
+import logging
+import os
+import sys
+import urllib.error
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .batch import RepoReview, get_check_cache, get_registry
+from .processor import process
+
+if TYPE_CHECKING:
+    from repo_review.ghpath import GHPath
+
+    from ._compat.importlib.resources.abc import Traversable
+
+__all__ = ["main", "parser", "review_packages"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+_FORMATS = ["rich", "json", "html", "svg"]
+
+
+def parser(
+    parser_class: type[argparse.ArgumentParser] = argparse.ArgumentParser,
+) -> argparse.ArgumentParser:
+    "The options of ``sp-repo-review``, the same as repo-review's."
+    from repo_review import __version__  # noqa: PLC0415
+
+    result = parser_class(
+        prog="sp-repo-review",
+        description="Pass in a local Path or gh:org/repo[@branch][:path]. Will run on the current directory if no path passed.",
+    )
+    result.add_argument("--version", action="version", version=__version__)
+    result.add_argument(
+        "--versions", action="store_true", help="List all plugin versions and exit"
+    )
+    result.add_argument(
+        "--log-level",
+        help="Set logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL).",
+        metavar="LEVEL",
+    )
+    result.add_argument(
+        "--list-all", action="store_true", help="List all checks and exit"
+    )
+    result.add_argument(
+        "packages", nargs="*", help="Local path or gh:org/repo[@branch][:path]"
+    )
+    result.add_argument(
+        "--format",
+        dest="format_opt",
+        choices=_FORMATS,
+        default="rich",
+        help="Select output format.",
+    )
+    result.add_argument(
+        "--stderr",
+        dest="stderr_fmt",
+        choices=_FORMATS,
+        help="Select additional output format for stderr. Will disable terminal escape codes for stdout for easy redirection.",
+    )
+    result.add_argument(
+        "--show",
+        choices=["all", "err", "errskip"],
+        default="all",
+        help="Show all (default), or just errors, or errors and skips",
+    )
+    result.add_argument(
+        "--select",
+        default="",
+        help="Only run certain checks, comma separated. All checks run if empty.",
+    )
+    result.add_argument(
+        "--ignore", default="", help="Ignore a check or checks, comma separated."
+    )
+    result.add_argument(
+        "--extend-select",
+        default="",
+        help="Checks to run in addition to the ones selected.",
+    )
+    result.add_argument(
+        "--extend-ignore",
+        default="",
+        help="Checks to ignore in addition to the ones ignored.",
+    )
+    result.add_argument(
+        "--package-dir", "-p", default="", help="Path to python package."
+    )
+    return result
+
+
+def _split(value: str) -> frozenset[str]:
+    return frozenset(x.strip() for x in value.split(",") if x.strip())
+
+
+def _remote(package: str) -> GHPath:
+    "The GitHub path for ``gh:org/repo[@branch][:path]``."
+    import rich  # noqa: PLC0415
+    from repo_review.ghpath import GHPath  # noqa: PLC0415
+
+    _, org_repo_branch, *p = package.split(":", maxsplit=2)
+    org_repo, _, branch = org_repo_branch.partition("@")
+    try:
+        return GHPath(repo=org_repo, branch=branch or "HEAD", path=p[0] if p else "")
+    except urllib.error.HTTPError as e:
+        rich.print(f"[red][bold]Error[/bold] accessing {e.url}", file=sys.stderr)
+        rich.print(f"[red]{e}", file=sys.stderr)
+        raise SystemExit(1) from None
+    except urllib.error.URLError as e:
+        rich.print(f"[red][bold]Error[/bold] accessing {package}", file=sys.stderr)
+        rich.print(f"[red]{e.reason}", file=sys.stderr)
+        raise SystemExit(1) from None
+
+
+def _prefetch(package: GHPath, subdir: str) -> None:
+    "Fetches the files the checks read concurrently, where httpx is installed."
+    import asyncio  # noqa: PLC0415
+    import importlib.util  # noqa: PLC0415
+
+    from repo_review.files import (  # noqa: PLC0415
+        collect_prefetch_files,
+        process_prefetch_files,
+    )
+
+    if importlib.util.find_spec("httpx") is not None:
+        asyncio.run(
+            process_prefetch_files(package, collect_prefetch_files(), subdir=subdir)
+        )
+
+
+def _root(
+    package: str, parsed: argparse.Namespace, cwd: Path
+) -> tuple[Traversable, str]:
+    "The root to review for ``package`` and its header."
+    if package.startswith("gh:"):
+        import rich  # noqa: PLC0415
+
+        remote = _remote(package)
+        if parsed.format_opt == "rich":
+            rich.print(f"[bold]Processing [blue]{remote}[/blue] from GitHub\n")
+        _prefetch(remote, parsed.package_dir)
+        return remote, remote.repo
+    path = Path(package)
+    # Pointing at a pyproject.toml reviews the directory containing it
+    if path.name == "pyproject.toml" and cwd.joinpath(path).is_file():
+        return cwd / path.parent, path.parent.name
+    return cwd / path, path.name
+
+
+def _print_json_braces(parsed: argparse.Namespace, text: str) -> None:
+    "Prints the braces around the JSON output for several packages."
+    for stream, fmt in (
+        (sys.stdout, parsed.format_opt),
+        (sys.stderr, parsed.stderr_fmt),
+    ):
+        if fmt == "json":
+            print(text, file=stream)
+
+
+def _display(
+    parsed: argparse.Namespace,
+    result: RepoReview,
+    *,
+    header: str,
+    multiple: bool,
+    last: bool,
+) -> None:
+    "Prints a review like repo-review, to stdout and maybe stderr."
+    # Rendering is shared with repo-review, so the output is identical
+    from repo_review.__main__ import display_output  # noqa: PLC0415
+
+    for stderr, fmt, color in (
+        (False, parsed.format_opt, parsed.stderr_fmt is None),
+        (True, parsed.stderr_fmt, True),
+    ):
+        if fmt is None:
+            continue
+        display_output(
+            result.families,
+            result.results,
+            format_opt=fmt,
+            stderr=stderr,
+            color=color,
+            status=result.status,
+            header=header,
+        )
+        if multiple and fmt == "json":
+            print("" if last else ",", file=sys.stderr if stderr else sys.stdout)
+
+
+def review_packages(parsed: argparse.Namespace, *, cwd: Path | None = None) -> int:
+    """
+    Reviews the packages in ``parsed`` (from :func:`parser`), relative to
+    ``cwd``, and prints each review. Returns the exit code.
+    """
+    packages: list[str] = parsed.packages or ["."]
+    multiple = len(packages) > 1
+    registry = get_registry()
+    check_cache = get_check_cache()
+    exit_code = 0
+
+    if multiple:
+        _print_json_braces(parsed, "{")
+    for n, package in enumerate(packages):
+        root, header = _root(package, parsed, cwd or Path())
+        families, results = process(
+            root,
+            select=_split(parsed.select),
+            ignore=_split(parsed.ignore),
+            extend_select=_split(parsed.extend_select),
+            extend_ignore=_split(parsed.extend_ignore),
+            subdir=parsed.package_dir,
+            registry=registry,
+            check_cache=check_cache,
+        )
+        result = RepoReview.from_results(package, families, results)
+        _display(
+            parsed,
+            result.shown(parsed.show),
+            header=header if multiple else "",
+            multiple=multiple,
+            last=n == len(packages) - 1,
+        )
+        exit_code |= result.exit_code
+    if multiple:
+        _print_json_braces(parsed, "}")
+    return exit_code
+
+
+def _log_level(level: str) -> None:
+    "Sends repo-review's logs at ``level`` and above to stderr."
+    import rich.console  # noqa: PLC0415
+    from rich.logging import RichHandler  # noqa: PLC0415
+
+    logger = logging.getLogger("repo_review")
+    logger.setLevel(getattr(logging, level.upper(), logging.INFO))
+    logger.addHandler(RichHandler(console=rich.console.Console(stderr=True)))
+    logger.propagate = False
+
+
+def main(args: list[str] | None = None) -> None:
+    """
+    Pass in a local Path or gh:org/repo[@branch][:path]. Will run on the current
+    directory if no path passed.
+    """
+    parsed = parser().parse_args(args)
+
+    if parsed.versions or parsed.list_all:
+        # Listing doesn't review anything, so repo-review's CLI does it
+        import repo_review.__main__  # noqa: PLC0415
+
+        repo_review.__main__.main(args)
+        return
+
+    if level := parsed.log_level or os.environ.get("REPO_REVIEW_LOG_LEVEL"):
+        _log_level(level)
+
+    for stream in (sys.stdout, sys.stderr):
+        if hasattr(stream, "reconfigure") and stream.encoding != "utf-8":
+            stream.reconfigure(encoding="utf-8")
+
+    if exit_code := review_packages(parsed):
+        raise SystemExit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
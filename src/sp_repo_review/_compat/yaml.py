@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import IO, Any
+
+import yaml
+
+__all__ = ["BACKEND", "SafeLoader", "safe_load"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+# PyYAML is built without libyaml in some places, like Pyodide
+SafeLoader: type[yaml.SafeLoader | yaml.CSafeLoader]
+if yaml.__with_libyaml__:
+    SafeLoader = yaml.CSafeLoader
+    #: The active parser, ``"libyaml"`` or ``"python"``, for diagnostics.
+    BACKEND = "libyaml"
+else:
+    SafeLoader = yaml.SafeLoader
+    BACKEND = "python"
+
+
+def safe_load(stream: bytes | str | IO[bytes] | IO[str]) -> Any:  # noqa: ANN401
+    """
+    Like :func:`yaml.safe_load`, but uses libyaml when PyYAML was built with it.
+    """
+    return yaml.load(stream, Loader=SafeLoader)  # noqa: S506
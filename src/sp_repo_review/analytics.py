@@ -0,0 +1,245 @@
+"""
+Fleet analytics on a matrix of batch review results. Needs NumPy (the
+``analytics`` extra).
+
+:class:`ResultMatrix` holds one ``int8`` state per repository and check
+(:data:`PASSED`, :data:`FAILED`, :data:`SKIPPED`, or :data:`MISSING` if the
+check wasn't reported), with the check ids and their families. Summaries are
+computed on the whole matrix at once. On disk, the states are two packed
+bit planes, two bits per result, in a ``.npz`` file.
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = ["json", "numpy"]
+
+import dataclasses
+import json
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .batch.jsonl import record
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterable, Mapping
+
+    from numpy.typing import NDArray
+
+    from .batch import RepoReview
+
+__all__ = [
+    "FAILED",
+    "MISSING",
+    "PASSED",
+    "SKIPPED",
+    "ResultMatrix",
+]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+MISSING = 0
+PASSED = 1
+FAILED = 2
+SKIPPED = 3
+
+_STATES = {True: PASSED, False: FAILED, None: SKIPPED}
+
+
+def _rate(passed: NDArray[Any], failed: NDArray[Any]) -> NDArray[np.float64]:
+    "Passed over passed and failed, NaN where neither."
+    total = passed + failed
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, passed / total, np.nan)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class ResultMatrix:
+    """
+    Review results, one row per repository and one column per check. Build
+    one with :meth:`from_reviews`, :meth:`from_records`, or
+    :meth:`from_jsonl`.
+    """
+
+    #: The repository of each row.
+    repos: tuple[str, ...]
+
+    #: The check of each column.
+    checks: tuple[str, ...]
+
+    #: The family of each check.
+    families: tuple[str, ...]
+
+    #: The ``int8`` state of each result, repositories by checks.
+    states: NDArray[np.int8] = dataclasses.field(repr=False)
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Mapping[str, Any]],
+        *,
+        header: Mapping[str, Any] | None = None,
+    ) -> ResultMatrix:
+        """
+        From review lines in the JSON Lines format (see
+        :func:`sp_repo_review.batch.jsonl.record`). The checks are those in
+        ``header`` if given, in its order, then any others as first seen.
+        """
+        records = list(records)
+        columns: dict[str, str] = {
+            name: check["family"]
+            for name, check in (header or {}).get("checks", {}).items()
+        }
+        for line in records:
+            for check in line.get("checks", ()):
+                columns.setdefault(check["id"], check["family"])
+        index = {name: n for n, name in enumerate(columns)}
+
+        states = np.zeros((len(records), len(columns)), dtype=np.int8)
+        for row, line in enumerate(records):
+            results = line.get("checks", ())
+            states[row, [index[c["id"]] for c in results]] = [
+                _STATES[c["result"]] for c in results
+            ]
+        return cls(
+            repos=tuple(line["path"] for line in records),
+            checks=tuple(columns),
+            families=tuple(columns.values()),
+            states=states,
+        )
+
+    @classmethod
+    def from_reviews(cls, reviews: Iterable[RepoReview]) -> ResultMatrix:
+        "From reviews made by :mod:`sp_repo_review.batch`."
+        return cls.from_records(record(r) for r in reviews)
+
+    @classmethod
+    def from_jsonl(cls, path: str | os.PathLike[str]) -> ResultMatrix:
+        "From the output of ``sp-repo-review-batch --format jsonl``."
+        header = None
+        records = []
+        with open(path, encoding="utf-8") as f:  # noqa: PTH123
+            for line in f:
+                if not line.strip():
+                    continue
+                value = json.loads(line)
+                if value.get("type") == "header":
+                    header = value
+                elif value.get("type") == "review":
+                    records.append(value)
+        return cls.from_records(records, header=header)
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        "Writes a compressed ``.npz`` file with the states packed in two bits."
+        np.savez_compressed(
+            path,
+            shape=np.array(self.states.shape),
+            low=np.packbits(self.states & 1),
+            high=np.packbits(self.states >> 1),
+            repos=np.array(self.repos, dtype=str),
+            checks=np.array(self.checks, dtype=str),
+            families=np.array(self.families, dtype=str),
+        )
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> ResultMatrix:
+        "Reads a file written by :meth:`save`."
+        with np.load(path, allow_pickle=False) as data:
+            shape = tuple(data["shape"])
+            count = int(np.prod(shape))
+            low = np.unpackbits(data["low"], count=count)
+            high = np.unpackbits(data["high"], count=count)
+            return cls(
+                repos=tuple(data["repos"].tolist()),
+                checks=tuple(data["checks"].tolist()),
+                families=tuple(data["families"].tolist()),
+                states=(low | high << 1).astype(np.int8).reshape(shape),
+            )
+
+    def counts(self) -> NDArray[np.int64]:
+        "Passed, failed, and skipped counts for each check, checks by three."
+        return np.stack(
+            [(self.states == s).sum(axis=0) for s in (PASSED, FAILED, SKIPPED)],
+            axis=1,
+        )
+
+    def pass_rates(self) -> dict[str, float]:
+        "The fraction of repositories that pass each check, of those it ran on."
+        counts = self.counts()
+        rates = _rate(counts[:, 0], counts[:, 1])
+        return {
+            check: float(rate)
+            for check, rate in zip(self.checks, rates, strict=True)
+            if not np.isnan(rate)
+        }
+
+    def family_scores(self) -> dict[str, float]:
+        "The fraction of passed results in each family, across the fleet."
+        counts = self.counts()
+        names, columns = np.unique(
+            np.array(self.families, dtype=str), return_inverse=True
+        )
+        passed = np.bincount(columns, weights=counts[:, 0], minlength=len(names))
+        failed = np.bincount(columns, weights=counts[:, 1], minlength=len(names))
+        return {
+            str(name): float(rate)
+            for name, rate in zip(names, _rate(passed, failed), strict=True)
+            if not np.isnan(rate)
+        }
+
+    def repo_scores(self, *, family: str = "") -> NDArray[np.float64]:
+        """
+        The fraction of passed results of each repository (NaN if none ran),
+        for the checks in ``family`` if given.
+        """
+        states = self.states
+        if family:
+            states = states[:, np.array(self.families, dtype=str) == family]
+        return _rate((states == PASSED).sum(axis=1), (states == FAILED).sum(axis=1))
+
+    def ranking(
+        self, *, family: str = "", worst: bool = False, top: int | None = None
+    ) -> list[tuple[str, float]]:
+        """
+        Repositories by :meth:`repo_scores`, best first (or worst first), and
+        then by path. Repositories with no results are left out.
+        """
+        scores = self.repo_scores(family=family)
+        order = np.lexsort(
+            (np.array(self.repos, dtype=str), scores if worst else -scores)
+        )
+        order = order[~np.isnan(scores[order])][:top]
+        return [(self.repos[n], float(scores[n])) for n in order]
+
+    def co_failures(self, top: int = 10) -> list[tuple[str, str, int, float]]:
+        """
+        The pairs of checks that most often fail in the same repositories, as
+        ``(check, check, repositories, correlation)``, where the correlation
+        is the phi coefficient of failing.
+        """
+        failed = (self.states == FAILED).astype(np.float64)
+        both = failed.T @ failed
+        n = len(self.repos)
+        per_check = np.diag(both)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            phi = (n * both - np.outer(per_check, per_check)) / np.sqrt(
+                np.outer(per_check * (n - per_check), per_check * (n - per_check))
+            )
+
+        first, second = np.triu_indices(len(self.checks), k=1)
+        pairs = both[first, second]
+        order = np.lexsort((-np.nan_to_num(phi[first, second]), -pairs))
+        order = order[pairs[order] > 0][:top]
+        return [
+            (
+                self.checks[first[k]],
+                self.checks[second[k]],
+                int(pairs[k]),
+                float(np.nan_to_num(phi[first[k], second[k]])),
+            )
+            for k in order
+        ]
@@ -0,0 +1,148 @@
+"""
+Review tar and zip archives, such as sdists or ``git archive`` output,
+without extracting them.
+
+:func:`open_archive` reads the archive's index and returns a
+:class:`~sp_repo_review.memorypath.MemoryPath` whose files are an
+:class:`ArchiveFiles` mapping: a member is only decompressed when a fixture
+opens it. If every member is inside a single top-level directory, as in an
+sdist, that directory is the root.
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = ["tarfile", "zipfile"]
+
+import contextlib
+import os
+import tarfile
+import zipfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .cache import FileTooLarge, max_file_size
+from .memorypath import MemoryPath, _normalize
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+__all__ = ["ARCHIVE_SUFFIXES", "ArchiveFiles", "is_archive", "open_archive"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+#: The file name endings recognized as archives.
+ARCHIVE_SUFFIXES = (
+    ".tar",
+    ".tar.gz",
+    ".tgz",
+    ".tar.bz2",
+    ".tbz2",
+    ".tar.xz",
+    ".txz",
+    ".zip",
+)
+
+
+def is_archive(path: str | os.PathLike[str]) -> bool:
+    "True if ``path`` is a file with an archive suffix."
+    return os.fspath(path).lower().endswith(ARCHIVE_SUFFIXES) and Path(path).is_file()
+
+
+def _common_prefix(names: list[str]) -> str:
+    """The single top-level directory everything is in, with a ``/``, or ``""``."""
+    tops = {name.partition("/")[0] for name in names}
+    if len(tops) != 1 or all("/" not in name for name in names):
+        return ""
+    return f"{tops.pop()}/"
+
+
+class ArchiveFiles(Mapping[str, bytes]):
+    """
+    The regular files in a tar or zip archive, by path, read on demand. Paths
+    are relative to the single top-level directory, if there is one. A member
+    over the :func:`~sp_repo_review.cache.max_file_size` limit raises
+    :class:`~sp_repo_review.cache.FileTooLarge` without being decompressed.
+    The archive stays open until :meth:`close`.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = os.fspath(path)
+
+        #: The paths that were read, in order.
+        self.read: list[str] = []
+
+        self._tar: tarfile.TarFile | None = None
+        self._zip: zipfile.ZipFile | None = None
+        names: dict[str, tarfile.TarInfo | zipfile.ZipInfo] = {}
+        dirs: list[str] = []
+        if zipfile.is_zipfile(self.path):
+            self._zip = zipfile.ZipFile(self.path)
+            for info in self._zip.infolist():
+                name = _normalize(info.filename)
+                if info.is_dir():
+                    dirs.append(name)
+                elif name:
+                    names[name] = info
+        else:
+            self._tar = tarfile.open(self.path)  # noqa: SIM115
+            for member in self._tar.getmembers():
+                name = _normalize(member.name)
+                if member.isdir():
+                    dirs.append(name)
+                elif member.isreg() and name:
+                    names[name] = member
+
+        prefix = _common_prefix([*names, *(f"{d}/" for d in dirs if d)])
+        self._members = {name[len(prefix) :]: info for name, info in names.items()}
+
+        #: Directories listed in the archive, relative to the root.
+        self.directories = frozenset(
+            d[len(prefix) :] for d in dirs if d.startswith(prefix)
+        )
+
+    def __getitem__(self, key: str) -> bytes:
+        info = self._members[key]
+        limit = max_file_size()
+        size = info.file_size if isinstance(info, zipfile.ZipInfo) else info.size
+        if limit and size > limit:
+            raise FileTooLarge(key, limit)
+        self.read.append(key)
+        if self._zip is not None:
+            return self._zip.read(info)  # type: ignore[arg-type]
+        assert self._tar is not None
+        extracted = self._tar.extractfile(info)  # type: ignore[arg-type]
+        assert extracted is not None
+        with extracted:
+            return extracted.read()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._members)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._members
+
+    def close(self) -> None:
+        for archive in (self._tar, self._zip):
+            if archive is not None:
+                archive.close()
+
+
+@contextlib.contextmanager
+def open_archive(path: str | os.PathLike[str]) -> Iterator[MemoryPath]:
+    """
+    Opens a tar (optionally compressed) or zip archive for reviewing, as the
+    root of a :class:`~sp_repo_review.memorypath.MemoryPath`. Members are
+    read when used, until the ``with`` block ends.
+    """
+    files = ArchiveFiles(path)
+    try:
+        yield MemoryPath(files=files, directories=files.directories)
+    finally:
+        files.close()
@@ -0,0 +1,510 @@
+"""
+Review many local repositories in one go.
+
+:func:`review_many` loads the plugins once per worker process and spreads the
+repositories over a process pool, instead of paying for interpreter startup
+and entry-point discovery per repository. Reviews are yielded in input order
+as soon as they are ready, so the output is deterministic, and each matches
+what ``sp-repo-review --format json`` reports for that repository.
+
+Paths to tar or zip archives, such as sdists, are reviewed without
+extracting them (see :mod:`sp_repo_review.archivepath`), and git
+repositories can be reviewed at a ref without checking it out (see
+:mod:`sp_repo_review.gitpath`); bare repositories always are, at ``HEAD`` by
+default. :func:`review_monorepo` reviews each package in a monorepo, sharing
+the fixtures that only read the repository root between them.
+
+Check results are cached by their inputs (see
+:class:`~sp_repo_review.cache.CheckCache`), so repositories sharing
+configuration compute each check once per worker. Whole reviews can be kept between scans in a
+:class:`~sp_repo_review.batch.store.ResultStore`, so only repositories with
+new commits are reviewed again.
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = [
+    "concurrent",
+    "concurrent.futures",
+    "contextlib",
+    "os",
+    "sys",
+    "time",
+]
+
+import concurrent.futures
+import contextlib
+import dataclasses
+import functools
+import os
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal, TypeVar
+
+from repo_review.families import sort_family_keys
+from repo_review.processor import as_simple_dict
+
+from ..archivepath import is_archive, open_archive
+from ..cache import CheckCache
+from ..gitpath import is_bare_repository, open_ref
+from ..processor import Registry, process, root_fixtures
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Iterable, Iterator
+    from collections.abc import Set as AbstractSet
+    from contextlib import AbstractContextManager
+
+    from repo_review.families import Family
+    from repo_review.processor import Result
+
+    from .._compat.importlib.resources.abc import Traversable
+    from .store import ResultStore
+
+__all__ = [
+    "RepoReview",
+    "Show",
+    "Status",
+    "find_packages",
+    "get_check_cache",
+    "get_registry",
+    "open_root",
+    "review",
+    "review_many",
+    "review_monorepo",
+]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+Status = Literal["empty", "passed", "skips", "errors"]
+Show = Literal["all", "err", "errskip"]
+
+T = TypeVar("T")
+
+_SKIP_DIRS = frozenset({"__pycache__", "node_modules"})
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class RepoReview:
+    #: The path, as given.
+    path: str
+
+    #: Overall status, from all results (before ``show`` filtering).
+    status: Status
+
+    #: The families, filtered like the results.
+    families: dict[str, Family]
+
+    #: The check results.
+    results: list[Result]
+
+    #: The error, if the review failed.
+    error: str = ""
+
+    #: Wall time taken by the review, in seconds.
+    duration: float = 0.0
+
+    #: Checks answered from the check cache.
+    cache_hits: int = 0
+
+    #: Checks run and added to the check cache.
+    cache_misses: int = 0
+
+    #: True if reused from a :class:`~sp_repo_review.batch.store.ResultStore`.
+    stored: bool = False
+
+    @classmethod
+    def from_results(
+        cls,
+        path: str,
+        families: dict[str, Family],
+        results: list[Result],
+        *,
+        duration: float = 0.0,
+    ) -> RepoReview:
+        "A review of all of ``results``, with the status worked out from them."
+        return cls(
+            path=path,
+            status=_status(results),
+            families=families,
+            results=results,
+            duration=duration,
+        )
+
+    def shown(self, show: Show) -> RepoReview:
+        """
+        This review with only the results ``show`` asks for, and the families
+        they belong to (or that have a description). The status is unchanged.
+        """
+        if show == "all":
+            return self
+        results = [r for r in self.results if not r.result]
+        if show == "err":
+            results = [r for r in results if r.result is not None]
+        known_families = {r.family for r in results}
+        families = {
+            k: v
+            for k, v in self.families.items()
+            if k in known_families or v.get("description", "")
+        }
+        return dataclasses.replace(self, families=families, results=results)
+
+    @property
+    def exit_code(self) -> int:
+        "The exit code the single-repo CLI would give, or 1 on error."
+        if self.error:
+            return 1
+        return {"errors": 3, "empty": 2}.get(self.status, 0)
+
+    def as_dict(self) -> dict[str, Any]:
+        "The same structure as repo-review's JSON output."
+        if self.error:
+            return {"error": self.error}
+        return {
+            "status": self.status,
+            "families": {k: self.families[k] for k in sort_family_keys(self.families)},
+            "checks": as_simple_dict(self.results),
+        }
+
+
+@functools.cache
+def get_registry() -> Registry:
+    "The plugin registry for this process, loaded on first use."
+    return Registry.load()
+
+
+#: Check results each process keeps in memory.
+MAX_CHECK_RESULTS = 100_000
+
+
+@functools.cache
+def get_check_cache() -> CheckCache:
+    "The check result cache for this process."
+    return CheckCache(max_entries=MAX_CHECK_RESULTS)
+
+
+def _init_worker() -> None:
+    from ..checks.github import WORKERS_ENV  # noqa: PLC0415
+
+    # The workers are the parallelism; a pool per workflow parse in each of
+    # them would start workers squared processes.
+    os.environ[WORKERS_ENV] = "1"
+    get_registry()
+    get_check_cache()
+
+
+def _status(results: list[Result]) -> Status:
+    if not results:
+        return "empty"
+    if any(r.result is False for r in results):
+        return "errors"
+    if any(r.result is None for r in results):
+        return "skips"
+    return "passed"
+
+
+def open_root(
+    path: str | os.PathLike[str], *, ref: str = ""
+) -> AbstractContextManager[Traversable]:
+    """
+    The root to review for ``path``, for use in a ``with`` block: the tree
+    of ``ref`` if given (or ``HEAD`` of a bare repository), the contents of
+    an archive, or else the directory itself.
+    """
+    if ref or is_bare_repository(path):
+        return open_ref(path, ref or "HEAD")
+    if is_archive(path):
+        return open_archive(path)
+    return contextlib.nullcontext(Path(path))
+
+
+def review(
+    path: str | os.PathLike[str],
+    *,
+    select: AbstractSet[str] = frozenset(),
+    ignore: AbstractSet[str] = frozenset(),
+    extend_select: AbstractSet[str] = frozenset(),
+    extend_ignore: AbstractSet[str] = frozenset(),
+    subdir: str = "",
+    show: Show = "all",
+    check_cache: bool = True,
+    ref: str = "",
+) -> RepoReview:
+    """
+    Reviews one local repository in this process. A path to a
+    ``pyproject.toml`` reviews the directory containing it, like the CLI, and
+    other roots are opened with :func:`open_root` (so ``ref`` reviews that
+    ref of a git repository).
+    Exceptions are reported in :attr:`RepoReview.error`. Set ``check_cache``
+    to False to run every check even if its inputs were seen before.
+    """
+    start = time.perf_counter()
+    cache = get_check_cache() if check_cache else None
+    hits, misses = (cache.hits, cache.misses) if cache else (0, 0)
+    root = Path(path)
+    if root.name == "pyproject.toml" and root.is_file():
+        root = root.parent
+
+    try:
+        with open_root(root, ref=ref) as target:
+            families, results = process(
+                target,
+                select=select,
+                ignore=ignore,
+                extend_select=extend_select,
+                extend_ignore=extend_ignore,
+                subdir=subdir,
+                registry=get_registry(),
+                check_cache=cache,
+            )
+    except Exception as err:  # noqa: BLE001
+        return _failed(os.fspath(path), err, start=start)
+
+    return _reviewed(
+        os.fspath(path),
+        families,
+        results,
+        show=show,
+        start=start,
+        cache=cache,
+        hits=hits,
+        misses=misses,
+    )
+
+
+def _failed(path: str, err: Exception, *, start: float) -> RepoReview:
+    return RepoReview(
+        path=path,
+        status="errors",
+        families={},
+        results=[],
+        error=f"{type(err).__name__}: {err}",
+        duration=time.perf_counter() - start,
+    )
+
+
+def _reviewed(
+    path: str,
+    families: dict[str, Family],
+    results: list[Result],
+    *,
+    show: Show,
+    start: float,
+    cache: CheckCache | None,
+    hits: int,
+    misses: int,
+) -> RepoReview:
+    return RepoReview(
+        path=path,
+        status=_status(results),
+        families=families,
+        results=results,
+        duration=time.perf_counter() - start,
+        cache_hits=cache.hits - hits if cache else 0,
+        cache_misses=cache.misses - misses if cache else 0,
+    ).shown(show)
+
+
+def find_packages(root: Traversable) -> list[str]:
+    """
+    The directories under ``root`` with a ``pyproject.toml``, relative to it
+    (``""`` for ``root`` itself), sorted. Hidden directories,
+    ``node_modules``, and virtual environments are not searched.
+    """
+    found = []
+    pending = [("", root)]
+    while pending:
+        subdir, directory = pending.pop()
+        if directory.joinpath("pyproject.toml").is_file():
+            found.append(subdir)
+        pending += [
+            (f"{subdir}/{child.name}" if subdir else child.name, child)
+            for child in directory.iterdir()
+            if child.is_dir()
+            and not child.name.startswith(".")
+            and child.name not in _SKIP_DIRS
+            and not child.joinpath("pyvenv.cfg").is_file()
+        ]
+    return sorted(found)
+
+
+def review_monorepo(
+    path: str | os.PathLike[str],
+    *,
+    select: AbstractSet[str] = frozenset(),
+    ignore: AbstractSet[str] = frozenset(),
+    extend_select: AbstractSet[str] = frozenset(),
+    extend_ignore: AbstractSet[str] = frozenset(),
+    show: Show = "all",
+    check_cache: bool = True,
+    ref: str = "",
+) -> list[RepoReview]:
+    """
+    Reviews each package in the repository at ``path`` (see
+    :func:`find_packages`), like :func:`review` with ``subdir`` set to it,
+    but the fixtures that only read the repository root, such as the
+    pre-commit config and the workflows, are computed once for all of them.
+    Each review's path is the package's directory.
+    """
+    start = time.perf_counter()
+    cache = get_check_cache() if check_cache else None
+    registry = get_registry()
+    names = root_fixtures(registry.fixtures)
+    reviews = []
+
+    try:
+        with open_root(path, ref=ref) as target:
+            packages = find_packages(target)
+            if not packages:
+                err = FileNotFoundError(f"no pyproject.toml in {os.fspath(path)}")
+                return [_failed(os.fspath(path), err, start=start)]
+
+            shared: dict[str, Any] | None = None
+            for subdir in packages:
+                package = os.path.join(path, subdir) if subdir else os.fspath(path)  # noqa: PTH118
+                package_start = time.perf_counter()
+                hits, misses = (cache.hits, cache.misses) if cache else (0, 0)
+                try:
+                    collected = registry.collect(target, subdir, shared=shared)
+                    if shared is None:
+                        shared = {name: collected.fixtures[name] for name in names}
+                    families, results = process(
+                        target,
+                        select=select,
+                        ignore=ignore,
+                        extend_select=extend_select,
+                        extend_ignore=extend_ignore,
+                        subdir=subdir,
+                        registry=registry,
+                        check_cache=cache,
+                        collected=collected,
+                    )
+                except Exception as err:  # noqa: BLE001
+                    reviews.append(_failed(package, err, start=package_start))
+                    continue
+                reviews.append(
+                    _reviewed(
+                        package,
+                        families,
+                        results,
+                        show=show,
+                        start=package_start,
+                        cache=cache,
+                        hits=hits,
+                        misses=misses,
+                    )
+                )
+    except Exception as err:  # noqa: BLE001
+        reviews.append(_failed(os.fspath(path), err, start=start))
+    return reviews
+
+
+def review_many(
+    paths: Iterable[str | os.PathLike[str]],
+    *,
+    workers: int | None = None,
+    select: AbstractSet[str] = frozenset(),
+    ignore: AbstractSet[str] = frozenset(),
+    extend_select: AbstractSet[str] = frozenset(),
+    extend_ignore: AbstractSet[str] = frozenset(),
+    subdir: str = "",
+    show: Show = "all",
+    check_cache: bool = True,
+    ref: str = "",
+    store: ResultStore | None = None,
+    monorepo: bool = False,
+) -> Iterator[RepoReview]:
+    """
+    Reviews each path with :func:`review`, using ``workers`` processes (one
+    per CPU by default). Reviews are yielded in the order of ``paths``, each
+    as soon as it and those before it are done. With a ``store``, stored
+    reviews of the same commit are reused, and new ones are added to it.
+    With ``monorepo``, each path is reviewed with :func:`review_monorepo`
+    instead, giving a review per package.
+    """
+    names = [os.fspath(p) for p in paths]
+    if monorepo:
+        if store is not None or subdir:
+            msg = "monorepo reviews find the packages, so can't use a store or subdir"
+            raise ValueError(msg)
+        packages = functools.partial(
+            review_monorepo,
+            select=select,
+            ignore=ignore,
+            extend_select=extend_select,
+            extend_ignore=extend_ignore,
+            show=show,
+            check_cache=check_cache,
+            ref=ref,
+        )
+        for reviews in _run(packages, names, workers):
+            yield from reviews
+        return
+
+    task = functools.partial(
+        review,
+        select=select,
+        ignore=ignore,
+        extend_select=extend_select,
+        extend_ignore=extend_ignore,
+        subdir=subdir,
+        show=show,
+        check_cache=check_cache,
+        ref=ref,
+    )
+
+    if store is None:
+        yield from _run(task, names, workers)
+        return
+
+    from .store import revisions  # noqa: PLC0415
+
+    settings = {
+        "select": select,
+        "ignore": ignore,
+        "extend_select": extend_select,
+        "extend_ignore": extend_ignore,
+        "subdir": subdir,
+        "show": show,
+        "ref": ref,
+    }
+    keys = [store.key(name, settings) for name in names]
+    commits = revisions(names, ref=ref)
+    previous = [
+        store.get(key, commit, name)
+        for key, commit, name in zip(keys, commits, names, strict=True)
+    ]
+    fresh = _run(
+        task, [n for n, r in zip(names, previous, strict=True) if r is None], workers
+    )
+    try:
+        for key, commit, stored in zip(keys, commits, previous, strict=True):
+            if stored is not None:
+                yield stored
+                continue
+            result = next(fresh)
+            store.put(key, commit, result)
+            yield result
+    finally:
+        fresh.close()
+
+
+def _run(
+    task: Callable[[str], T], paths: list[str], workers: int | None
+) -> Generator[T, None, None]:
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(paths))
+    if workers <= 1 or sys.platform == "emscripten":
+        yield from map(task, paths)
+        return
+
+    pool = concurrent.futures.ProcessPoolExecutor(workers, initializer=_init_worker)
+    try:
+        yield from pool.map(task, paths)
+    finally:
+        # Don't keep reviewing if the caller stopped early
+        pool.shutdown(cancel_futures=True)
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+__lazy_modules__ = ["argparse", "contextlib", "json", "sys"]
+
+import argparse
+import contextlib
+import json
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from . import jsonl, review_many
+from .shard import Shard
+from .store import ResultStore
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+    from typing import TextIO
+
+    from . import RepoReview
+
+
+def _write_json(reviews: Iterable[RepoReview], output: TextIO) -> Iterator[RepoReview]:
+    """
+    Same layout as repo-review's JSON output for multiple packages. Each entry
+    is written as its review finishes; the comma goes before the next one.
+    """
+    print("{", file=output)
+    written = False
+    for review in reviews:
+        entry = json.dumps({review.path: review.as_dict()}, indent=2)[2:-2]
+        print(",\n" if written else "", entry, sep="", end="", file=output, flush=True)
+        written = True
+        yield review
+    print("\n}" if written else "}", file=output)
+
+
+def _write_jsonl(
+    reviews: Iterable[RepoReview],
+    output: TextIO,
+    *,
+    has_header: bool,
+    shard: Mapping[str, int] | None,
+) -> Iterator[RepoReview]:
+    if not has_header:
+        jsonl.write_header(output, shard=shard)
+    for review in reviews:
+        jsonl.write_review(output, review)
+        yield review
+
+
+def _split(value: str) -> frozenset[str]:
+    return frozenset(x.strip() for x in value.split(",") if x.strip())
+
+
+def _shard(value: str) -> Shard:
+    try:
+        return Shard.parse(value)
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(str(err)) from None
+
+
+def main(args: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Review many local repositories, loading plugins only once"
+    )
+    parser.add_argument("paths", nargs="*", type=Path, help="Repositories to review")
+    parser.add_argument(
+        "--paths-from",
+        type=argparse.FileType("r", encoding="utf-8"),
+        help="File with one repository per line ('-' for stdin)",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: one per CPU)",
+    )
+    parser.add_argument("--select", default="", help="Checks to run")
+    parser.add_argument("--ignore", default="", help="Checks to skip")
+    parser.add_argument("--extend-select", default="", help="Checks to run in addition")
+    parser.add_argument(
+        "--extend-ignore", default="", help="Checks to skip in addition"
+    )
+    parser.add_argument(
+        "--package-dir", default="", help="Path to the package in each repository"
+    )
+    parser.add_argument(
+        "--monorepo",
+        action="store_true",
+        help="Review every package (directory with a pyproject.toml) in each "
+        "repository, reading the repository-level files once for all of them",
+    )
+    parser.add_argument(
+        "--ref",
+        default="",
+        help="Review this git ref of each repository, without checking it out "
+        "(bare repositories are reviewed at HEAD by default)",
+    )
+    parser.add_argument(
+        "--shard",
+        type=_shard,
+        help="Only review shard i of N (like 2/4), picked by a hash of each "
+        "repository's path; combine the outputs with sp-repo-review-batch-merge",
+    )
+    parser.add_argument(
+        "--show",
+        choices=["all", "err", "errskip"],
+        default="all",
+        help="Show all (default), or just errors, or errors and skips",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        default="json",
+        help="JSON like sp-repo-review (default), or JSON Lines, one repository per line",
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="Write to a file instead of stdout"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Append to the --output JSON Lines file, skipping repositories already in it",
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        help="JSON Lines file of earlier reviews: repositories whose commit is "
+        "unchanged are not reviewed again, and new reviews are added as they finish",
+    )
+    parser.add_argument(
+        "--no-check-cache",
+        action="store_true",
+        help="Run every check, even if a repository with the same inputs was reviewed",
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Print check cache (and result store) hits and misses to stderr when done",
+    )
+    parsed = parser.parse_args(args)
+    if parsed.resume and (parsed.format != "jsonl" or not parsed.output):
+        parser.error("--resume needs --format jsonl and --output")
+    if parsed.monorepo and (
+        parsed.package_dir or parsed.store or parsed.resume or parsed.shard
+    ):
+        parser.error(
+            "--monorepo reports packages, not repositories, so can't be used with "
+            "--package-dir, --store, --resume, or --shard"
+        )
+
+    paths: list[Path] = parsed.paths
+    if parsed.paths_from:
+        with parsed.paths_from as f:
+            paths += [Path(line.strip()) for line in f if line.strip()]
+    if not paths:
+        parser.error("no repositories given")
+
+    shard = None
+    if parsed.shard:
+        paths = [p for p in paths if str(p) in parsed.shard]
+        shard = parsed.shard.header(len({str(p) for p in paths}))
+
+    has_header, done = (
+        jsonl.resume(parsed.output) if parsed.resume else (False, set[str]())
+    )
+    paths = [p for p in paths if str(p) not in done]
+
+    store = ResultStore(parsed.store) if parsed.store else None
+    reviews = review_many(
+        paths,
+        workers=parsed.workers,
+        select=_split(parsed.select),
+        ignore=_split(parsed.ignore),
+        extend_select=_split(parsed.extend_select),
+        extend_ignore=_split(parsed.extend_ignore),
+        subdir=parsed.package_dir,
+        show=parsed.show,
+        check_cache=not parsed.no_check_cache,
+        ref=parsed.ref,
+        store=store,
+        monorepo=parsed.monorepo,
+    )
+
+    output: TextIO
+    with (
+        contextlib.closing(store) if store is not None else contextlib.nullcontext(),
+        parsed.output.open("a" if parsed.resume else "w", encoding="utf-8")
+        if parsed.output
+        else contextlib.nullcontext(sys.stdout) as output,
+    ):
+        written = (
+            _write_jsonl(reviews, output, has_header=has_header, shard=shard)
+            if parsed.format == "jsonl"
+            else _write_json(reviews, output)
+        )
+        result = hits = misses = 0
+        for review in written:
+            result |= review.exit_code
+            hits += review.cache_hits
+            misses += review.cache_misses
+
+    if parsed.cache_stats:
+        print(f"check cache: {hits} hits, {misses} misses", file=sys.stderr)
+        if store is not None:
+            print(
+                f"result store: {store.hits} hits, {store.misses} misses",
+                file=sys.stderr,
+            )
+
+    if result:
+        raise SystemExit(result)
+
+
+if __name__ == "__main__":
+    main()
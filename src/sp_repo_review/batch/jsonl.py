@@ -0,0 +1,151 @@
+"""
+JSON Lines output for batch reviews.
+
+The first line is a header with the check and family metadata, written once;
+every following line is one repository, written as soon as its review
+finishes. Nothing is kept in memory between lines, and a file can be
+appended to: :func:`resume` returns the repositories already recorded so an
+interrupted scan can pick up where it stopped.
+
+Header::
+
+    {"type": "header", "version": ..., "families": {...}, "checks": {...}}
+
+A shard of a split scan (``--shard``) adds
+``"shard": {"index": ..., "count": ..., "repos": ...}`` to the header.
+
+Review::
+
+    {"type": "review", "path": ..., "status": ..., "duration": ...,
+     "descriptions": {...}, "checks": [{"id", "family", "result", "err_msg",
+     "skip_reason"}, ...]}
+
+Failed reviews have an ``"error"`` message instead of ``"checks"``.
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = ["json", "repo_review.checks"]
+
+import json
+from typing import TYPE_CHECKING, Any
+
+from repo_review.checks import get_check_description, get_check_url
+from repo_review.families import sort_family_keys
+
+from .. import __version__
+from . import get_registry
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+    from typing import TextIO
+
+    from . import RepoReview
+
+__all__ = ["header", "record", "resume", "write_header", "write_review"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+def header(*, shard: Mapping[str, int] | None = None) -> dict[str, Any]:
+    """
+    The metadata for every installed check and family, and the ``shard`` (see
+    :meth:`sp_repo_review.batch.shard.Shard.header`) if the scan is split.
+    """
+    _, checks, families = get_registry().collect()
+    result: dict[str, Any] = {
+        "type": "header",
+        "version": __version__,
+        "families": {
+            key: {
+                "name": families[key].get("name", key),
+                "order": families[key].get("order", 0),
+            }
+            for key in sort_family_keys(families)
+        },
+        "checks": {
+            name: {
+                "family": check.family,
+                "url": get_check_url(name, check),
+                "description": get_check_description(name, check),
+            }
+            for name, check in checks.items()
+        },
+    }
+    if shard:
+        result["shard"] = dict(shard)
+    return result
+
+
+def record(review: RepoReview) -> dict[str, Any]:
+    "The line for one repository."
+    result: dict[str, Any] = {
+        "type": "review",
+        "path": review.path,
+        "status": review.status,
+        "duration": round(review.duration, 6),
+    }
+    if review.error:
+        result["error"] = review.error
+        return result
+
+    result["descriptions"] = {
+        key: description
+        for key, family in review.families.items()
+        if (description := family.get("description", ""))
+    }
+    result["checks"] = [
+        {
+            "id": r.name,
+            "family": r.family,
+            "result": r.result,
+            "err_msg": r.err_msg,
+            "skip_reason": r.skip_reason,
+        }
+        for r in review.results
+    ]
+    return result
+
+
+def _write(stream: TextIO, value: dict[str, Any]) -> None:
+    stream.write(json.dumps(value, separators=(",", ":")) + "\n")
+    stream.flush()
+
+
+def write_header(stream: TextIO, *, shard: Mapping[str, int] | None = None) -> None:
+    _write(stream, header(shard=shard))
+
+
+def write_review(stream: TextIO, review: RepoReview) -> None:
+    _write(stream, record(review))
+
+
+def resume(path: Path) -> tuple[bool, set[str]]:
+    """
+    Prepares an existing output file for appending. Returns whether it
+    already has a header and the paths already reviewed. A partial last line,
+    left by an interrupted run, is removed.
+    """
+    if not path.exists():
+        return False, set()
+
+    has_header = False
+    done = set()
+    with path.open("rb+") as f:
+        end = 0
+        for line in f:
+            if not line.endswith(b"\n"):
+                f.truncate(end)
+                break
+            end += len(line)
+            if not line.strip():
+                continue
+            value = json.loads(line)
+            if value.get("type") == "header":
+                has_header = True
+            elif value.get("type") == "review":
+                done.add(value["path"])
+    return has_header, done
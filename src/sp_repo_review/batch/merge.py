@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+__lazy_modules__ = ["argparse", "contextlib", "json", "sys"]
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .shard import merge
+
+if TYPE_CHECKING:
+    from typing import TextIO
+
+
+def main(args: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Combine the JSON Lines outputs of sp-repo-review-batch --shard "
+        "into one scan"
+    )
+    parser.add_argument("files", nargs="+", type=Path, help="Shard outputs")
+    parser.add_argument(
+        "-o", "--output", type=Path, help="Write to a file instead of stdout"
+    )
+    parser.add_argument(
+        "--warehouse",
+        type=Path,
+        help="Add the scan to this sp-repo-review-warehouse database instead",
+    )
+    parser.add_argument(
+        "--partial",
+        action="store_true",
+        help="Merge even if shards are missing, incomplete, or don't match",
+    )
+    parsed = parser.parse_args(args)
+
+    try:
+        merged = merge(parsed.files)
+    except (OSError, ValueError) as err:
+        parser.error(str(err))
+
+    for problem in merged.problems:
+        print(f"{'warning' if parsed.partial else 'error'}: {problem}", file=sys.stderr)
+    if merged.problems and not parsed.partial:
+        raise SystemExit(1)
+    print(
+        f"{len(merged.reviews)} repositories from {len(parsed.files)} files"
+        f" ({merged.duplicates} duplicate reviews dropped)",
+        file=sys.stderr,
+    )
+
+    if parsed.warehouse:
+        from ..warehouse import Warehouse  # noqa: PLC0415
+
+        warehouse = Warehouse(parsed.warehouse)
+        try:
+            warehouse.add_scan(
+                merged.reviews,
+                header=merged.header,
+                source=", ".join(map(os.fspath, parsed.files)),
+            )
+        finally:
+            warehouse.close()
+        if not parsed.output:
+            return
+
+    output: TextIO
+    with (
+        parsed.output.open("w", encoding="utf-8")
+        if parsed.output
+        else contextlib.nullcontext(sys.stdout) as output
+    ):
+        for line in (merged.header, *merged.reviews):
+            output.write(json.dumps(line, separators=(",", ":")) + "\n")
+
+
+if __name__ == "__main__":
+    main()
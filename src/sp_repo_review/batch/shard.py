@@ -0,0 +1,170 @@
+"""
+Splitting a fleet scan across machines, and merging the pieces.
+
+Each repository goes to shard ``sha256(path) % count``, where ``path`` is the
+repository as listed (and as reported in the review), so a repository stays
+in the same shard as others come and go. Given the same list, every machine
+agrees on the split without talking to the others. The JSON Lines header of
+a shard records which shard it is and how many repositories it has, so
+:func:`merge` can tell when shards are missing or incomplete.
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = ["hashlib", "json"]
+
+import dataclasses
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Sequence
+
+__all__ = ["Merged", "Shard", "merge", "shard_of"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+def shard_of(path: str, count: int) -> int:
+    "The shard (from 1 to ``count``) that the repository ``path`` belongs to."
+    digest = hashlib.sha256(path.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class Shard:
+    "Shard ``index`` of ``count``, counting from one."
+
+    index: int
+    count: int
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.index <= self.count:
+            msg = f"shard must be between 1/{self.count} and {self.count}/{self.count}, not {self}"
+            raise ValueError(msg)
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    @classmethod
+    def parse(cls, value: str) -> Shard:
+        "From ``i/N``."
+        index, sep, count = value.partition("/")
+        if not sep or not index.strip().isdigit() or not count.strip().isdigit():
+            msg = f"shard must look like i/N, not {value!r}"
+            raise ValueError(msg)
+        return cls(index=int(index), count=int(count))
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, str) and shard_of(path, self.count) == self.index
+
+    def header(self, repos: int) -> dict[str, int]:
+        "The ``shard`` entry of the JSON Lines header, for ``repos`` repositories."
+        return {"index": self.index, "count": self.count, "repos": repos}
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class Merged:
+    "Shard outputs combined by :func:`merge`."
+
+    #: The JSON Lines header, without the shard.
+    header: dict[str, Any]
+
+    #: The review lines, one per repository, sorted by path.
+    reviews: list[dict[str, Any]]
+
+    #: Everything that keeps this from being a complete scan.
+    problems: list[str]
+
+    #: Reviews of a repository that was already seen, which were dropped.
+    duplicates: int = 0
+
+
+def _read(path: str | os.PathLike[str]) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    header: dict[str, Any] | None = None
+    reviews = []
+    with open(path, encoding="utf-8") as f:  # noqa: PTH123
+        for line in f:
+            if not line.strip():
+                continue
+            value = json.loads(line)
+            if value.get("type") == "header":
+                header = value
+            elif value.get("type") == "review":
+                reviews.append(value)
+    if header is None:
+        msg = f"{path} is not sp-repo-review-batch --format jsonl output"
+        raise ValueError(msg)
+    return header, reviews
+
+
+def merge(paths: Sequence[str | os.PathLike[str]]) -> Merged:
+    """
+    Combines the JSON Lines outputs of the shards of one scan. A repository
+    reviewed more than once (a shard rerun, or a file given twice) keeps its
+    last review. Missing or incomplete shards, shards from different versions
+    or check sets, and repositories in the wrong shard are listed in
+    :attr:`Merged.problems`.
+    """
+    problems: list[str] = []
+    header: dict[str, Any] = {}
+    reviews: dict[str, dict[str, Any]] = {}
+    expected: dict[tuple[int, int], int] = {}
+    seen: dict[tuple[int, int], set[str]] = {}
+    duplicates = 0
+
+    for path in paths:
+        file_header, file_reviews = _read(path)
+        shard = file_header.pop("shard", None) or {"index": 1, "count": 1}
+        if not header:
+            header = file_header
+        elif file_header != header:
+            problems.append(
+                f"{path} is from a different sp-repo-review version or set of checks"
+            )
+
+        index, count = shard["index"], shard["count"]
+        if "repos" in shard:
+            expected[index, count] = shard["repos"]
+        names = seen.setdefault((index, count), set())
+        wrong = 0
+        for review in file_reviews:
+            name = review["path"]
+            wrong += shard_of(name, count) != index
+            names.add(name)
+            duplicates += name in reviews
+            reviews[name] = review
+        if wrong:
+            problems.append(
+                f"{path}: {wrong} repositories belong to another shard than {index}/{count}"
+            )
+
+    counts = sorted({count for _, count in seen})
+    if len(counts) > 1:
+        problems.append(
+            "shards were split different ways: "
+            + ", ".join(f"into {count}" for count in counts)
+        )
+    elif counts:
+        (count,) = counts
+        indices = set(range(1, count + 1)) - {index for index, _ in seen}
+        if indices:
+            problems.append(
+                "missing shards " + ", ".join(f"{i}/{count}" for i in sorted(indices))
+            )
+    problems += [
+        f"shard {index}/{count} has {len(seen[index, count])} of {repos} repositories"
+        for (index, count), repos in sorted(expected.items())
+        if len(seen[index, count]) < repos
+    ]
+
+    return Merged(
+        header=header,
+        reviews=[reviews[name] for name in sorted(reviews)],
+        problems=problems,
+        duplicates=duplicates,
+    )
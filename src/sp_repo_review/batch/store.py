@@ -0,0 +1,238 @@
+"""
+A local store of batch review results, so a scan only reviews the
+repositories that changed since the last one.
+
+Each review is stored under a key made from the repository (its resolved
+path and the ref reviewed), the sp-repo-review and repo-review versions, the
+installed plugins (their entry points and versions), the size limit (see
+:func:`~sp_repo_review.cache.max_file_size`), and the review settings
+(selection, package directory, and ``show``), along with the commit it
+reviewed (see :func:`revision`). A later scan reuses it if the commit is the
+same. Repositories without a known commit (archives, plain directories, and
+checkouts with uncommitted changes) are always reviewed, and failed reviews
+are never stored.
+
+The store is a JSON Lines file that is only appended to, one line as soon
+as each review finishes, so it is also the journal of a scan: if the scan is
+killed, running it again reuses everything finished so far. A partial last
+line is dropped, and superseded lines are compacted away when it is opened.
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = ["concurrent", "concurrent.futures", "hashlib", "json", "subprocess"]
+
+import concurrent.futures
+import dataclasses
+import functools
+import hashlib
+import importlib.metadata
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from repo_review.processor import Result
+
+from .. import __version__
+from ..cache import max_file_size
+from ..gitpath import is_bare_repository
+from . import RepoReview
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from typing import TextIO
+
+__all__ = ["ResultStore", "revision", "revisions"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+def _git(path: str | os.PathLike[str], *args: str) -> str | None:
+    try:
+        return subprocess.run(  # noqa: S603
+            ["git", "-C", os.fspath(path), *args],  # noqa: S607
+            check=True,
+            capture_output=True,
+            encoding="utf-8",
+            errors="surrogateescape",
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def revision(path: str | os.PathLike[str], *, ref: str = "") -> str | None:
+    """
+    The commit a review of ``path`` sees: ``ref`` (or ``HEAD`` of a bare
+    repository), or the ``HEAD`` of a checkout if it has no changes
+    (untracked files included). None if it isn't known.
+    """
+    root = Path(path)
+    if root.name == "pyproject.toml" and root.is_file():
+        root = root.parent
+    if ref.startswith("-"):
+        return None
+    if ref or is_bare_repository(root):
+        commit = _git(
+            root, "rev-parse", "--verify", "--quiet", f"{ref or 'HEAD'}^{{commit}}"
+        )
+        return commit.strip() if commit else None
+    if not root.is_dir():
+        return None
+
+    status = _git(root, "status", "--porcelain=v2", "--branch")
+    if status is None:
+        return None
+    commit = None
+    for line in status.splitlines():
+        if line.startswith("# branch.oid "):
+            commit = line.split()[2]
+        elif not line.startswith("#"):
+            return None
+    return None if commit == "(initial)" else commit
+
+
+def revisions(
+    paths: Sequence[str | os.PathLike[str]], *, ref: str = ""
+) -> list[str | None]:
+    "The :func:`revision` of each path, asking git about several at once."
+    if not paths:
+        return []
+    with concurrent.futures.ThreadPoolExecutor(min(32, len(paths))) as pool:
+        return list(pool.map(lambda p: revision(p, ref=ref), paths))
+
+
+@functools.cache
+def _plugins() -> str:
+    "Every fixture, check, and family entry point, with its distribution."
+    lines = []
+    for group in ("repo_review.fixtures", "repo_review.checks", "repo_review.families"):
+        for ep in importlib.metadata.entry_points(group=group):
+            dist = f"{ep.dist.name} {ep.dist.version}" if ep.dist else ""
+            lines.append(f"{group} {ep.name} = {ep.value} ({dist})")
+    return "\n".join(sorted(lines))
+
+
+def _dump(review: RepoReview) -> dict[str, Any]:
+    return {
+        "status": review.status,
+        "families": review.families,
+        "results": [dataclasses.asdict(r) for r in review.results],
+        "duration": review.duration,
+    }
+
+
+def _line(key: str, commit: str, value: Mapping[str, Any]) -> str:
+    entry = {"key": key, "revision": commit, "review": value}
+    return json.dumps(entry, separators=(",", ":")) + "\n"
+
+
+def _load(path: str, value: Mapping[str, Any]) -> RepoReview:
+    return RepoReview(
+        path=path,
+        status=value["status"],
+        families=value["families"],
+        results=[Result(**r) for r in value["results"]],
+        duration=value["duration"],
+        stored=True,
+    )
+
+
+class ResultStore:
+    """
+    Reviews by repository and settings, kept in the JSON Lines file at
+    ``path`` (created when first stored to). Call :meth:`close` when done.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        #: Reviews reused by :meth:`get`.
+        self.hits = 0
+        #: Lookups that found nothing for the commit.
+        self.misses = 0
+
+        self._entries: dict[str, tuple[str, dict[str, Any]]] = {}
+        self._file: TextIO | None = None
+        lines = 0
+        if self.path.exists():
+            with self.path.open("rb+") as f:
+                end = 0
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Cut short when the last scan was killed
+                        f.truncate(end)
+                        break
+                    end += len(line)
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = (
+                            entry["revision"],
+                            entry["review"],
+                        )
+                        lines += 1
+        if lines > 2 * len(self._entries):
+            self.compact()
+
+    @staticmethod
+    def key(path: str | os.PathLike[str], settings: Mapping[str, Any]) -> str:
+        """
+        The key for reviews of ``path`` with ``settings`` (the review
+        options, which must be JSON serializable), with the plugins installed
+        and the size limit set in this process.
+        """
+        hasher = hashlib.sha256()
+        for part in (
+            __version__,
+            importlib.metadata.version("repo-review"),
+            _plugins(),
+            str(max_file_size()),
+            os.path.realpath(path),
+            json.dumps(settings, sort_keys=True, default=sorted),
+        ):
+            hasher.update(part.encode())
+            hasher.update(b"\0")
+        return hasher.hexdigest()
+
+    def get(self, key: str, commit: str | None, path: str) -> RepoReview | None:
+        """
+        The stored review for ``key`` if it was of ``commit``, reported for
+        ``path``, or None.
+        """
+        entry = self._entries.get(key)
+        if commit is None or entry is None or entry[0] != commit:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _load(path, entry[1])
+
+    def put(self, key: str, commit: str | None, review: RepoReview) -> None:
+        "Stores a successful review of ``commit``, and writes it out."
+        if commit is None or review.error:
+            return
+        value = _dump(review)
+        self._entries[key] = (commit, value)
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+        self._file.write(_line(key, commit, value))
+        self._file.flush()
+
+    def compact(self) -> None:
+        "Rewrites the file with only the latest review of each key."
+        self.close()
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            for key, (commit, value) in self._entries.items():
+                f.write(_line(key, commit, value))
+        tmp.replace(self.path)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,484 @@
+"""
+Caches for parsed fixture inputs and check results.
+
+:class:`CheckCache` remembers check results in memory, keyed by the fixture
+values each check reads; see its docstring. :class:`MemoryCache` keeps
+parsed fixture inputs in memory for long-running processes, such as
+:mod:`sp_repo_review.daemon`. The rest of this module is an opt-in, on-disk
+cache of parsed fixture inputs.
+
+Set ``SP_REPO_REVIEW_CACHE=1`` to cache under
+``$XDG_CACHE_HOME/sp-repo-review`` (``~/.cache/sp-repo-review`` by default),
+or set it to a directory to use that instead. Entries are keyed by the file
+contents, the parser, the Python version, and the sp-repo-review version, so
+a changed file or upgrade is never served a stale value. When the cache grows
+past ``SP_REPO_REVIEW_CACHE_SIZE`` bytes (64 MiB by default), it is trimmed
+to three quarters of that, least recently used entries first.
+
+Entries are pickles, so only point the cache at a directory you trust.
+
+Files are read through :func:`read`, which refuses files over
+``SP_REPO_REVIEW_MAX_FILE_SIZE`` bytes (no limit by default) with
+:class:`FileTooLarge`, so a huge generated file can't exhaust memory.
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = [
+    "ast",
+    "configparser",
+    "hashlib",
+    "os",
+    "pathlib",
+    "pickle",
+    "sys",
+    "time",
+]
+
+import ast
+import configparser
+import contextlib
+import copy
+import dataclasses
+import enum
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ClassVar, TypeVar
+
+from . import __version__, lazy
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from repo_review.checks import Check
+
+    from ._compat.importlib.resources.abc import Traversable
+
+__all__ = [
+    "CACHE_ENV",
+    "CACHE_SIZE_ENV",
+    "MAX_FILE_SIZE_ENV",
+    "CheckCache",
+    "FileTooLarge",
+    "MemoryCache",
+    "ParseCache",
+    "get_cache",
+    "load",
+    "max_file_size",
+    "parse",
+    "parse_all",
+    "read",
+]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+T = TypeVar("T")
+
+CACHE_ENV = "SP_REPO_REVIEW_CACHE"
+CACHE_SIZE_ENV = "SP_REPO_REVIEW_CACHE_SIZE"
+MAX_FILE_SIZE_ENV = "SP_REPO_REVIEW_MAX_FILE_SIZE"
+DEFAULT_SIZE = 64 * 1024 * 1024
+
+
+class ParseCache:
+    """
+    A directory of pickled parse results with size-bounded LRU eviction. The
+    modification time of an entry is its last use, to within
+    :attr:`TOUCH_INTERVAL`, so most hits don't write. The size of the
+    directory is counted as entries are written and only scanned again when
+    it may be over the limit, which trims it to :attr:`LOW_WATER` of the
+    limit so the next scan is many writes away. Other processes' writes are
+    only seen at a scan, so several writing at once can overshoot a little.
+    """
+
+    #: Seconds before a hit marks an entry as used again.
+    TOUCH_INTERVAL = 3600
+
+    #: The fraction of the size limit that eviction trims down to.
+    LOW_WATER = 0.75
+
+    def __init__(self, path: Path, max_size: int = DEFAULT_SIZE) -> None:
+        self.path = path
+        self.max_size = max_size
+        # Bytes in the directory as of the last scan, plus those written
+        # since; None until the first write scans it
+        self._size: int | None = None
+
+    @staticmethod
+    def key(content: bytes, parser: Callable[[bytes], object]) -> str:
+        hasher = hashlib.sha256()
+        for part in (
+            __version__,
+            sys.implementation.cache_tag or "",
+            f"{parser.__module__}.{parser.__qualname__}",
+        ):
+            hasher.update(part.encode())
+            hasher.update(b"\0")
+        hasher.update(content)
+        return hasher.hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.path / f"{key}.pickle"
+
+    def get(self, key: str) -> tuple[bool, object]:
+        """
+        Returns ``(True, value)`` on a hit or ``(False, None)`` on a miss.
+        Unreadable entries count as misses.
+        """
+        entry = self._entry(key)
+        try:
+            with entry.open("rb") as f:
+                value = pickle.load(f)  # noqa: S301
+                used = os.fstat(f.fileno()).st_mtime
+            if time.time() - used > self.TOUCH_INTERVAL:
+                os.utime(entry)
+        except Exception:  # noqa: BLE001
+            return False, None
+        return True, value
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Stores a value, then evicts old entries if the cache may be too
+        large. Values that can't be pickled and unwritable caches are ignored.
+        """
+        entry = self._entry(key)
+        tmp = entry.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            with tmp.open("wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+            tmp.replace(entry)
+        except Exception:  # noqa: BLE001
+            with contextlib.suppress(OSError):
+                tmp.unlink()
+            return
+        if self._size is None or self._size + size > self.max_size:
+            self.evict()
+        else:
+            self._size += size
+
+    def evict(self) -> None:
+        """
+        Scans the directory, and if it is over :attr:`LOW_WATER` of the size
+        limit, removes the least recently used entries until it isn't.
+        """
+        entries = []
+        for entry in self.path.glob("*.pickle"):
+            with contextlib.suppress(OSError):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_size * self.LOW_WATER:
+                break
+            with contextlib.suppress(OSError):
+                entry.unlink()
+            total -= size
+        self._size = total
+
+
+class MemoryCache:
+    """
+    Parse results kept in this process, with the same keys and size-bounded
+    LRU eviction as :class:`ParseCache`. Values are stored pickled, so each
+    use gets its own copy, as from disk. Enable it with :meth:`enable`; it is
+    checked before the on-disk cache.
+    """
+
+    #: The cache :func:`parse_all` uses, if enabled.
+    current: ClassVar[MemoryCache | None] = None
+
+    def __init__(self, max_size: int = DEFAULT_SIZE) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+
+    @classmethod
+    def enable(cls, max_size: int = DEFAULT_SIZE) -> MemoryCache:
+        "Makes a new cache the current one, and returns it."
+        cls.current = cls(max_size)
+        return cls.current
+
+    def get(self, key: str) -> tuple[bool, object]:
+        "Returns ``(True, value)`` on a hit or ``(False, None)`` on a miss."
+        if key not in self._entries:
+            return False, None
+        self._entries.move_to_end(key)
+        return True, pickle.loads(self._entries[key])  # noqa: S301
+
+    def put(self, key: str, value: object) -> None:
+        "Stores a value, evicting old ones if needed. Unpicklable values are ignored."
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:  # noqa: BLE001
+            return
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key))
+        self._entries[key] = data
+        self._size += len(data)
+        while self._size > self.max_size and self._entries:
+            _, old = self._entries.popitem(last=False)
+            self._size -= len(old)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def get_cache() -> ParseCache | None:
+    """
+    Returns the cache configured by ``SP_REPO_REVIEW_CACHE``, or None if
+    caching is off (the default). A ``SP_REPO_REVIEW_CACHE_SIZE`` that isn't a
+    positive integer is ignored.
+    """
+    value = os.environ.get(CACHE_ENV, "")
+    if value in {"", "0"}:
+        return None
+    if value == "1":
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        path = Path(base) / "sp-repo-review"
+    else:
+        path = Path(value)
+    try:
+        max_size = int(os.environ.get(CACHE_SIZE_ENV) or DEFAULT_SIZE)
+    except ValueError:
+        max_size = DEFAULT_SIZE
+    return _open_cache(path, max_size if max_size > 0 else DEFAULT_SIZE)
+
+
+@functools.cache
+def _open_cache(path: Path, max_size: int) -> ParseCache:
+    "One instance per directory, so its running size is kept between calls."
+    return ParseCache(path, max_size)
+
+
+def parse_all(
+    contents: Sequence[bytes],
+    parser: Callable[[bytes], T],
+    *,
+    bulk: Callable[[list[bytes]], list[T]] | None = None,
+) -> list[T]:
+    """
+    Parses each item in ``contents`` with ``parser``, through the cache if it
+    is enabled. Misses are handed to ``bulk`` together (one at a time with
+    ``parser`` if not given), so they can be parsed in parallel.
+    """
+    if bulk is None:
+        bulk = lambda items: [parser(item) for item in items]  # noqa: E731
+
+    caches = [c for c in (MemoryCache.current, get_cache()) if c is not None]
+    if not caches:
+        return bulk(list(contents))
+
+    keys = [ParseCache.key(content, parser) for content in contents]
+    results: dict[int, T] = {}
+    for n, key in enumerate(keys):
+        for level, cache in enumerate(caches):
+            hit, value = cache.get(key)
+            if hit:
+                results[n] = value  # type: ignore[assignment]
+                # Keep it in memory for next time
+                for faster in caches[:level]:
+                    faster.put(key, value)
+                break
+
+    missing = [n for n in range(len(contents)) if n not in results]
+    for n, value in zip(missing, bulk([contents[n] for n in missing]), strict=True):
+        for cache in caches:
+            cache.put(keys[n], value)
+        results[n] = value
+
+    return [results[n] for n in range(len(contents))]
+
+
+def parse(content: bytes, parser: Callable[[bytes], T]) -> T:
+    "Parses ``content`` with ``parser``, through the cache if it is enabled."
+    (result,) = parse_all([content], parser)
+    return result
+
+
+class FileTooLarge(Exception):
+    "A file is over the ``SP_REPO_REVIEW_MAX_FILE_SIZE`` limit."
+
+    def __init__(self, path: Traversable | str, limit: int) -> None:
+        super().__init__(
+            f"`{path}` is larger than {limit:,} bytes, the limit set by "
+            f"`{MAX_FILE_SIZE_ENV}`, so it was not checked."
+        )
+        self.path = path
+        self.limit = limit
+
+
+def max_file_size() -> int:
+    """
+    The ``SP_REPO_REVIEW_MAX_FILE_SIZE`` limit in bytes, or 0 for no limit
+    (the default, also used if the value isn't a positive integer).
+    """
+    try:
+        return max(int(os.environ.get(MAX_FILE_SIZE_ENV) or 0), 0)
+    except ValueError:
+        return 0
+
+
+def read(path: Traversable) -> bytes:
+    """
+    Returns the contents of ``path``. Raises :class:`FileTooLarge` instead if
+    it is over the :func:`max_file_size` limit, without reading more than
+    that.
+    """
+    limit = max_file_size()
+    with path.open("rb") as f:
+        if not limit:
+            return f.read()
+        content = f.read(limit + 1)
+    if len(content) > limit:
+        raise FileTooLarge(path, limit)
+    return content
+
+
+def load(path: Traversable, parser: Callable[[bytes], T]) -> T:
+    "Reads ``path`` and parses it with ``parser``, through the cache."
+    return parse(read(path), parser)
+
+
+class _Unkeyable(Exception):
+    "A fixture value that can't be summarized by its content."
+
+
+def _feed(hasher: Any, value: object) -> None:  # noqa: ANN401
+    """
+    Adds a canonical form of a fixture value to ``hasher``. Containers are
+    walked, so equal content gives the same digest in any process; sets are
+    ordered by the digests of their items, as their iteration order depends
+    on string hashing.
+    """
+    value = lazy.force(value)
+    hasher.update(type(value).__qualname__.encode())
+    match value:
+        case None | bool() | int() | float() | str() | bytes() | enum.Enum():
+            hasher.update(repr(value).encode())
+        case Mapping():
+            hasher.update(b"{")
+            for key, item in value.items():
+                _feed(hasher, key)
+                _feed(hasher, item)
+            hasher.update(b"}")
+        case list() | tuple():
+            hasher.update(b"".join(_digest(item) for item in value))
+        case set() | frozenset():
+            hasher.update(b"".join(sorted(_digest(item) for item in value)))
+        case ast.AST():
+            # Much faster than ast.dump, and equal bytes mean equal trees
+            hasher.update(pickle.dumps(value, protocol=5))
+        case configparser.RawConfigParser():
+            sections = {s: dict(value.items(s, raw=True)) for s in value.sections()}
+            _feed(hasher, [value.defaults(), sections])
+        case _ if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            for field in dataclasses.fields(value):
+                _feed(hasher, field.name)
+                _feed(hasher, getattr(value, field.name))
+        case _:
+            # Traversables and the like: the content isn't known
+            raise _Unkeyable(type(value).__qualname__)
+    hasher.update(b"\0")
+
+
+def _digest(value: object) -> bytes:
+    hasher = hashlib.sha256()
+    _feed(hasher, value)
+    return hasher.digest()
+
+
+class CheckCache:
+    """
+    Check results, keyed by the check name, its class, the sp-repo-review
+    version, and a digest of the fixture values the check takes. Two
+    repositories with the same configuration compute each check once, which
+    is common when reviewing many repositories from the same template.
+
+    Checks that take a fixture without a content digest (such as ``root`` or
+    ``package``) are always run. Results are kept in memory only (the
+    ``max_entries`` most recently used, if given): a check is quicker to run
+    again than a file of its own is to write. :attr:`hits` and
+    :attr:`misses` count lookups.
+    """
+
+    def __init__(self, *, max_entries: int | None = None) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict[str, bool | str | None] = OrderedDict()
+
+    @staticmethod
+    def key(name: str, check: Check, kwargs: Mapping[str, Any]) -> str | None:
+        "The key for a check call, or None if an argument can't be keyed."
+        hasher = hashlib.sha256()
+        cls = type(check)
+        for part in (__version__, name, f"{cls.__module__}.{cls.__qualname__}"):
+            hasher.update(part.encode())
+            hasher.update(b"\0")
+        try:
+            for arg in sorted(kwargs):
+                _feed(hasher, arg)
+                # Parsed fixtures are digested once, without forcing copies
+                hasher.update(lazy.digest(kwargs[arg], _digest))
+        except _Unkeyable:
+            return None
+        return hasher.hexdigest()
+
+    def _get(self, key: str) -> tuple[bool, bool | str | None]:
+        if key in self._results:
+            self._results.move_to_end(key)
+            return True, self._results[key]
+        return False, None
+
+    def _put(self, key: str, value: bool | str | None) -> None:
+        self._results[key] = value
+        if self.max_entries is not None and len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def wrap(self, name: str, check: Check) -> Check:
+        """
+        Returns a copy of ``check`` whose ``check`` method goes through the
+        cache. The signature is unchanged, so repo-review passes it the same
+        fixtures.
+        """
+        func = check.check
+
+        @functools.wraps(func)
+        def cached(**kwargs: Any) -> Any:  # noqa: ANN401
+            key = self.key(name, check, kwargs)
+            if key is None:
+                return func(**kwargs)
+            hit, value = self._get(key)
+            if hit:
+                self.hits += 1
+                return value
+            self.misses += 1
+            value = func(**kwargs)
+            if value is None or isinstance(value, bool | str):
+                self._put(key, value)
+            return value
+
+        wrapped = copy.copy(check)
+        wrapped.check = cached  # type: ignore[method-assign]
+        return wrapped
+
+    def wrap_all(self, checks: Mapping[str, Check]) -> dict[str, Check]:
+        return {name: self.wrap(name, check) for name, check in checks.items()}
+
+    def clear(self) -> None:
+        "Forgets the in-memory results and resets the counters."
+        self._results.clear()
+        self.hits = 0
+        self.misses = 0
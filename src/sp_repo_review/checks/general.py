@@ -1,16 +1,96 @@
 from __future__ import annotations
 
+__lazy_modules__ = ["os", "pathlib"]
+
+import dataclasses
+import os
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from .. import files
 from . import mk_url
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from .._compat.importlib.resources.abc import Traversable
 
 # PY: Python Project
 ## 0xx: File existence
 
 
+def _scan(path: Traversable) -> Iterator[tuple[str, bool, bool]]:
+    """
+    Yields ``(name, is_dir, is_file)`` for each entry in a directory. Local
+    directories are read with :func:`os.scandir`, which usually knows the
+    entry types without a ``stat`` per entry.
+    """
+    if isinstance(path, Path):
+        with os.scandir(path) as entries:
+            for entry in entries:
+                yield entry.name, entry.is_dir(), entry.is_file()
+    else:
+        for child in path.iterdir():
+            yield child.name, child.is_dir(), child.is_file()
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
+class DirectoryTree:
+    """
+    A snapshot of the top level of a directory and of ``src/*`` one level
+    deep, as ``/`` separated relative paths. Listing once here saves a
+    round-trip per probe for remote repos.
+    """
+
+    files: frozenset[str] = frozenset()
+    dirs: frozenset[str] = frozenset()
+
+    @classmethod
+    def scan(cls, base: Traversable) -> DirectoryTree:
+        files: set[str] = set()
+        dirs: set[str] = set()
+        pending = [("", base)]
+        while pending:
+            prefix, path = pending.pop()
+            for name, is_dir, is_file in _scan(path):
+                rel = f"{prefix}{name}"
+                if is_file:
+                    files.add(rel)
+                if is_dir:
+                    dirs.add(rel)
+                    # Descend into src/ and each directory in it
+                    if rel == "src" or (prefix == "src/" and rel.count("/") == 1):
+                        pending.append((f"{rel}/", path.joinpath(name)))
+        return cls(files=frozenset(files), dirs=frozenset(dirs))
+
+    def is_file(self, path: str) -> bool:
+        return path in self.files
+
+    def is_dir(self, path: str) -> bool:
+        return path in self.dirs
+
+    def listdir(self, path: str = "") -> Iterator[str]:
+        "Yields the names in a directory (only directories inside the snapshot)."
+        prefix = f"{path}/" if path else ""
+        for entry in self.files | self.dirs:
+            if entry.startswith(prefix) and "/" not in entry[len(prefix) :]:
+                yield entry[len(prefix) :]
+
+
+@files.lists(root=["", "src", "src/*"])
+def root_tree(root: Traversable) -> DirectoryTree:
+    return DirectoryTree.scan(root)
+
+
+@files.lists(package=["", "src", "src/*"])
+def package_tree(
+    package: Traversable, root: Traversable, root_tree: DirectoryTree
+) -> DirectoryTree:
+    if package == root:
+        return root_tree
+    return DirectoryTree.scan(package)
+
+
 class General:
     family = "general"
 
@@ -21,12 +101,12 @@ class PY001(General):
     url = mk_url("packaging-simple")
 
     @staticmethod
-    def check(package: Traversable) -> bool:
+    def check(package_tree: DirectoryTree) -> bool:
         """
         All projects should have a `pyproject.toml` file to support a modern
         build system and support wheel installs properly.
         """
-        return package.joinpath("pyproject.toml").is_file()
+        return package_tree.is_file("pyproject.toml")
 
 
 class PY002(General):
@@ -35,12 +115,9 @@ class PY002(General):
     url = mk_url("packaging-simple")
 
     @staticmethod
-    def check(root: Traversable) -> bool:
+    def check(root_tree: DirectoryTree) -> bool:
         "Projects must have a readme file"
-        return (
-            root.joinpath("README.md").is_file()
-            or root.joinpath("README.rst").is_file()
-        )
+        return root_tree.is_file("README.md") or root_tree.is_file("README.rst")
 
 
 class PY003(General):
@@ -49,14 +126,10 @@ class PY003(General):
     url = mk_url("packaging-simple")
 
     @staticmethod
-    def check(package: Traversable) -> bool:
+    def check(package_tree: DirectoryTree) -> bool:
         "Projects must have a license"
         spellings = ("LICENSE", "LICENCE", "COPYING")
-        return any(
-            p.name.startswith(spelling)
-            for p in package.iterdir()
-            for spelling in spellings
-        )
+        return any(name.startswith(spellings) for name in package_tree.listdir())
 
 
 class PY004(General):
@@ -65,11 +138,9 @@ class PY004(General):
     url = mk_url("packaging-simple")
 
     @staticmethod
-    def check(package: Traversable) -> bool:
+    def check(package_tree: DirectoryTree) -> bool:
         "Projects must have documentation in a folder called docs (disable if not applicable)"
-        return (
-            len([p for p in package.iterdir() if p.is_dir() and p.name == "docs"]) > 0
-        )
+        return package_tree.is_dir("docs")
 
 
 class PY005(General):
@@ -78,38 +149,21 @@ class PY005(General):
     url = mk_url("packaging-simple")
 
     @staticmethod
-    def check(package: Traversable) -> bool:
+    def check(package_tree: DirectoryTree) -> bool:
         "Projects must have a folder called `test*` or `src/*/test*`"
         # Out-of-source tests
-        if (
-            len(
-                [
-                    p
-                    for p in package.iterdir()
-                    if p.is_dir() and p.name.startswith("test")
-                ]
-            )
-            > 0
+        if any(
+            name.startswith("test") and package_tree.is_dir(name)
+            for name in package_tree.listdir()
         ):
             return True
 
         # In-source tests
-        src = package.joinpath("src")
-        if src.is_dir():
-            for pkg in src.iterdir():
-                if (
-                    pkg.is_dir()
-                    and len(
-                        [
-                            p
-                            for p in pkg.iterdir()
-                            if p.is_dir() and p.name.startswith("test")
-                        ]
-                    )
-                    > 0
-                ):
-                    return True
-        return False
+        return any(
+            name.startswith("test") and package_tree.is_dir(f"src/{pkg}/{name}")
+            for pkg in package_tree.listdir("src")
+            for name in package_tree.listdir(f"src/{pkg}")
+        )
 
 
 class PY006(General):
@@ -118,9 +172,9 @@ class PY006(General):
     url = mk_url("style")
 
     @staticmethod
-    def check(root: Traversable) -> bool:
+    def check(root_tree: DirectoryTree) -> bool:
         "Projects must have a `.pre-commit-config.yaml` file"
-        return root.joinpath(".pre-commit-config.yaml").is_file()
+        return root_tree.is_file(".pre-commit-config.yaml")
 
 
 PY007_VALID_RUNNER_CONFS = frozenset(["noxfile.py", "tox.ini", "tox.toml", "pixi.toml"])
@@ -132,13 +186,13 @@ class PY007(General):
     url = mk_url("tasks")
 
     @staticmethod
-    def check(root: Traversable, pyproject: dict[str, Any]) -> bool:
+    def check(root_tree: DirectoryTree, pyproject: dict[str, Any]) -> bool:
         """
         Projects must have a `noxfile.py`, `tox.ini`, `tox.toml`, `pixi.toml` or
         `tool.hatch.envs`/`tool.spin`/`tool.tox` in `pyproject.toml` to encourage new
         contributors.
         """
-        if any(root.joinpath(fn).is_file() for fn in PY007_VALID_RUNNER_CONFS):
+        if not root_tree.files.isdisjoint(PY007_VALID_RUNNER_CONFS):
             return True
         match pyproject.get("tool", {}):
             case {"hatch": {"envs": object()}}:
@@ -165,9 +219,9 @@ class PY008(General):
     url = mk_url("packaging-simple")
 
     @staticmethod
-    def check(root: Traversable) -> bool:
+    def check(root_tree: DirectoryTree) -> bool:
         "Projects must have a `.gitignore` file"
-        return root.joinpath(".gitignore").is_file()
+        return root_tree.is_file(".gitignore")
 
 
 def repo_review_checks() -> dict[str, General]:
@@ -3,31 +3,191 @@
 
 from __future__ import annotations
 
-__lazy_modules__ = ["pathlib", "yaml"]
-
+__lazy_modules__ = [
+    f"{__spec__.parent.rsplit('.', 1)[0]}._compat",  # type: ignore[union-attr]
+    f"{__spec__.parent.rsplit('.', 1)[0]}.cache",  # type: ignore[union-attr]
+    f"{__spec__.parent.rsplit('.', 1)[0]}.lazy",  # type: ignore[union-attr]
+    "concurrent",
+    "concurrent.futures",
+    "os",
+    "pathlib",
+]
+
+import concurrent.futures
+import dataclasses
+import functools
+import os
+import sys
+import typing
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-import yaml
-
+from .. import cache, files, lazy
+from .._compat import yaml
 from . import mk_url
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from .._compat.importlib.resources.abc import Traversable
 
 
+WORKERS_ENV = "SP_REPO_REVIEW_WORKERS"
+
+
+def get_workers() -> int:
+    """
+    The number of worker processes used to parse workflow files, from the
+    ``SP_REPO_REVIEW_WORKERS`` environment variable. Unset, ``1``, or a value
+    that isn't a positive number parses serially, and ``0`` uses one worker
+    per CPU. Always serial in WebAssembly, and in the worker processes of
+    :func:`sp_repo_review.batch.review_many`, which are parallel already.
+    """
+    if sys.platform == "emscripten":
+        return 1
+    try:
+        workers = int(os.environ.get(WORKERS_ENV) or "1")
+    except ValueError:
+        return 1
+    if workers == 0:
+        return os.cpu_count() or 1
+    return max(workers, 1)
+
+
+def _load_yaml_all(contents: list[bytes], workers: int) -> list[Any]:
+    if workers < 2 or len(contents) < 2:
+        return [yaml.safe_load(content) for content in contents]
+
+    workers = min(workers, len(contents))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        # map keeps the input order, so the result does not depend on timing
+        return list(
+            executor.map(
+                yaml.safe_load, contents, chunksize=-(-len(contents) // workers)
+            )
+        )
+
+
+@files.reads(root=[".github/workflows/*.yml", ".github/workflows/*.yaml"])
 def workflows(root: Traversable) -> dict[str, Any]:
+    """
+    Returns all ``.github/workflows`` files, keyed by name without suffix and
+    sorted by filename. Parsing runs in parallel if :func:`get_workers` is
+    more than one; the result is identical either way. The files are read
+    and parsed when the result is first used.
+    """
     workflows_base_path = root.joinpath(".github/workflows")
-    workflows_dict: dict[str, Any] = {}
-    if workflows_base_path.is_dir():
-        for workflow_path in workflows_base_path.iterdir():
-            if workflow_path.name.endswith((".yml", ".yaml")):
-                with workflow_path.open("rb") as f:
-                    workflows_dict[Path(workflow_path.name).stem] = yaml.safe_load(f)
+    if not workflows_base_path.is_dir():
+        return {}
+
+    workflow_paths = sorted(
+        (
+            p
+            for p in workflows_base_path.iterdir()
+            if p.name.endswith((".yml", ".yaml"))
+        ),
+        key=lambda p: p.name,
+    )
+    if not workflow_paths:
+        return {}
+
+    def load() -> dict[str, Any]:
+        contents = [cache.read(workflow_path) for workflow_path in workflow_paths]
+
+        parsed = cache.parse_all(
+            contents,
+            yaml.safe_load,
+            bulk=functools.partial(_load_yaml_all, workers=get_workers()),
+        )
+        return {
+            Path(workflow_path.name).stem: workflow
+            for workflow_path, workflow in zip(workflow_paths, parsed, strict=True)
+        }
+
+    return lazy.lazy_mapping(load)
+
+
+class WorkflowStep(typing.NamedTuple):
+    workflow: str
+    job: str
+    step: int
+    action: str
+    ref: str
+    inputs: dict[str, Any]
+
+
+def _action_key(action: str) -> str:
+    "The ``owner/repo`` part of an action, used to bucket steps."
+    return "/".join(action.split("/", 2)[:2])
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
+class WorkflowSteps:
+    """
+    Every step that ``uses:`` an action, across all workflows, flattened once
+    in workflow/job/step order and bucketed by the action's ``owner/repo``.
+    """
+
+    steps: tuple[WorkflowStep, ...]
+    by_action: dict[str, tuple[WorkflowStep, ...]]
+
+    @classmethod
+    def from_workflows(cls, workflows: Mapping[str, Any]) -> WorkflowSteps:
+        steps = []
+        for wname, workflow in workflows.items():
+            if not isinstance(workflow, dict):
+                continue
+            for jname, job in (workflow.get("jobs") or {}).items():
+                if not isinstance(job, dict):
+                    continue
+                for n, step in enumerate(job.get("steps") or []):
+                    if not isinstance(step, dict) or not isinstance(
+                        step.get("uses"), str
+                    ):
+                        continue
+                    action, _, ref = step["uses"].partition("@")
+                    steps.append(
+                        WorkflowStep(
+                            workflow=wname,
+                            job=jname,
+                            step=n,
+                            action=action,
+                            ref=ref,
+                            inputs=dict(step.get("with") or {}),
+                        )
+                    )
 
-    return workflows_dict
+        by_action: dict[str, list[WorkflowStep]] = {}
+        for row in steps:
+            by_action.setdefault(_action_key(row.action), []).append(row)
+        return cls(
+            steps=tuple(steps),
+            by_action={key: tuple(value) for key, value in by_action.items()},
+        )
 
+    def find(self, prefix: str) -> list[WorkflowStep]:
+        """
+        Steps whose action starts with ``prefix``, in workflow order. A prefix
+        naming a full ``owner/repo`` is a single bucket lookup.
+        """
+        key = _action_key(prefix)
+        candidates = (
+            self.by_action.get(key, ())
+            if key.count("/") == 1 and key[-1] != "/"
+            else self.steps
+        )
+        return [step for step in candidates if step.action.startswith(prefix)]
+
+
+def workflow_steps(workflows: dict[str, Any]) -> WorkflowSteps:
+    """
+    Returns the ``uses:`` steps of all workflows as a flat table, so checks can
+    look up actions without walking every workflow, job, and step.
+    """
+    return lazy.lazy(lambda: WorkflowSteps.from_workflows(workflows))
 
+
+@files.reads(root=[".github/dependabot.yml", ".github/dependabot.yaml"])
 def dependabot(root: Traversable) -> dict[str, Any]:
     dependabot_paths = [
         root.joinpath(".github/dependabot.yml"),
@@ -36,9 +196,9 @@ def dependabot(root: Traversable) -> dict[str, Any]:
 
     for dependabot_path in dependabot_paths:
         if dependabot_path.is_file():
-            with dependabot_path.open("rb") as f:
-                result: dict[str, Any] = yaml.safe_load(f)
-                return result
+            return lazy.lazy_mapping(
+                functools.partial(cache.load, dependabot_path, yaml.safe_load)
+            )
 
     return {}
 
@@ -142,26 +302,27 @@ class GH104(GitHub):
     url = mk_url("gha-wheels")
 
     @staticmethod
-    def check(workflows: dict[str, Any]) -> str:
+    def check(workflows: dict[str, Any], workflow_steps: WorkflowSteps) -> str:
+        uploads: dict[tuple[str, str], list[str]] = {}
+        for step in workflow_steps.find("actions/upload-artifact"):
+            uploads.setdefault((step.workflow, step.job), []).append(
+                step.inputs.get("name", "")
+            )
+
         errors = []
-        for wname, workflow in workflows.items():
-            for jname, job in workflow.get("jobs", {}).items():
-                names = [
-                    step.get("with", {}).get("name", "")
-                    for step in job.get("steps", [])
-                    if step.get("uses", "").startswith("actions/upload-artifact")
-                ]
-                if "matrix" in job.get("strategy", {}) and not all(
-                    "${{" in n for n in names
-                ):
-                    errors.append(
-                        f"* No variable substitutions were detected in `{wname}.yml:{jname}`."
-                    )
-                names = [n for n in names if "${{" not in n]
-                if len(names) != len(set(names)):
-                    errors.append(
-                        f"* Multiple matching upload artifact names detected in `{wname}.yml:{jname}`."
-                    )
+        for (wname, jname), names in uploads.items():
+            job = workflows[wname]["jobs"][jname]
+            if "matrix" in job.get("strategy", {}) and not all(
+                "${{" in n for n in names
+            ):
+                errors.append(
+                    f"* No variable substitutions were detected in `{wname}.yml:{jname}`."
+                )
+            static_names = [n for n in names if "${{" not in n]
+            if len(static_names) != len(set(static_names)):
+                errors.append(
+                    f"* Multiple matching upload artifact names detected in `{wname}.yml:{jname}`."
+                )
         if errors:
             return GH104_ERROR_MSG + "\n\n".join(errors)
         return ""
@@ -174,21 +335,12 @@ class GH105(GitHub):
     url = mk_url("gha-basic")
 
     @staticmethod
-    def check(workflows: dict[str, Any]) -> str:
-        errors = []
-        for wname, workflow in workflows.items():
-            for jname, job in workflow.get("jobs", {}).items():
-                for step in job.get("steps", []):
-                    uses = step.get("uses", "")
-                    publish_with = step.get("with", {})
-                    if (
-                        uses.startswith("pypa/gh-action-pypi-publish")
-                        and "password" in publish_with
-                    ):
-                        errors.append(
-                            f"* Token-based publishing detected in `{wname}.yml:{jname}`. Trusted Publishing is recommended."
-                        )
-                        continue
+    def check(workflow_steps: WorkflowSteps) -> str:
+        errors = [
+            f"* Token-based publishing detected in `{step.workflow}.yml:{step.job}`. Trusted Publishing is recommended."
+            for step in workflow_steps.find("pypa/gh-action-pypi-publish")
+            if "password" in step.inputs
+        ]
         return "\n".join(errors)
 
 
@@ -4,13 +4,19 @@
 
 from __future__ import annotations
 
-__lazy_modules__ = ["ast", f"{__spec__.parent.rsplit('.', 1)[0]}._compat"]  # type: ignore[union-attr]
+__lazy_modules__ = [
+    "ast",
+    f"{__spec__.parent.rsplit('.', 1)[0]}._compat",  # type: ignore[union-attr]
+    f"{__spec__.parent.rsplit('.', 1)[0]}.cache",  # type: ignore[union-attr]
+    f"{__spec__.parent.rsplit('.', 1)[0]}.lazy",  # type: ignore[union-attr]
+]
 
 import ast
 import dataclasses
 import re
 from typing import TYPE_CHECKING, Any
 
+from .. import cache, files, lazy
 from .._compat import tomllib
 from . import mk_url
 
@@ -30,6 +36,10 @@ class Noxfile:
 
     __hash__ = None  # type: ignore[assignment]
 
+    @classmethod
+    def from_bytes(cls, content: bytes) -> Noxfile:
+        return cls.from_str(content.decode("utf-8"))
+
     @classmethod
     def from_str(cls, content: str) -> Noxfile:
         module = ast.parse(content, filename="noxfile.py")
@@ -68,6 +78,7 @@ def _load_script_block(content: str, /) -> dict[str, Any]:
     return tomllib.loads(content)
 
 
+@files.reads(root=["noxfile.py"])
 def noxfile(root: Traversable) -> Noxfile | None:
     """
     Returns the shebang line (or empty string if missing), the noxfile script block, and the AST of the noxfile.py.
@@ -78,8 +89,7 @@ def noxfile(root: Traversable) -> Noxfile | None:
     if not noxfile_path.is_file():
         return None
 
-    with noxfile_path.open("r", encoding="utf-8") as f:
-        return Noxfile.from_str(f.read())
+    return lazy.lazy(lambda: cache.load(noxfile_path, Noxfile.from_bytes))
 
 
 class Nox:
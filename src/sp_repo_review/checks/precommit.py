@@ -3,36 +3,121 @@
 
 from __future__ import annotations
 
-__lazy_modules__ = ["yaml"]
-
-from typing import TYPE_CHECKING, Any, ClassVar
-
-import yaml
-
+__lazy_modules__ = [
+    f"{__spec__.parent.rsplit('.', 1)[0]}._compat",  # type: ignore[union-attr]
+    f"{__spec__.parent.rsplit('.', 1)[0]}.cache",  # type: ignore[union-attr]
+    f"{__spec__.parent.rsplit('.', 1)[0]}.lazy",  # type: ignore[union-attr]
+]
+
+import dataclasses
+import functools
+from typing import TYPE_CHECKING, Any, ClassVar, TypeVar
+
+from .. import cache, files, lazy
+from .._compat import yaml
 from . import mk_url
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from .._compat.importlib.resources.abc import Traversable
+    from .general import DirectoryTree
+
+T = TypeVar("T")
 
 
+@files.reads(root=[".pre-commit-config.yaml"])
 def precommit(root: Traversable) -> dict[str, Any]:
     precommit_path = root.joinpath(".pre-commit-config.yaml")
     if precommit_path.is_file():
-        with precommit_path.open("rb") as f:
-            return yaml.safe_load(f)  # type: ignore[no-any-return]
+        return lazy.lazy_mapping(
+            functools.partial(cache.load, precommit_path, yaml.safe_load)
+        )
 
     return {}
 
 
-def _formats_markdown(hook: dict[str, Any]) -> bool:
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
+class PreCommitHook:
+    id: str
+    args: tuple[str, ...] = ()
+    types_or: tuple[str, ...] | None = None
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
+class PreCommitRepo:
+    position: int
+    hooks: tuple[PreCommitHook, ...]
+    ids: frozenset[str]
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
+class PreCommitIndex:
+    """
+    The pre-commit config, normalized once: lowercased repo URL to the hooks
+    it provides (in file order), plus the ``ci:`` block. Repos listed more than
+    once are merged, keeping the position of the first listing.
+    """
+
+    repos: dict[str, PreCommitRepo]
+    ci: dict[str, Any]
+
+    @classmethod
+    def from_config(cls, precommit: Mapping[str, Any] | None) -> PreCommitIndex:
+        hooks: dict[str, list[PreCommitHook]] = {}
+        for repo_item in (precommit or {}).get("repos") or []:
+            repo = repo_item.get("repo", "").lower()
+            if not repo:
+                continue
+            hooks.setdefault(repo, []).extend(
+                PreCommitHook(
+                    id=hook.get("id") or "",
+                    args=tuple(hook.get("args") or ()),
+                    # `types_or:` with no value is the same as leaving it out
+                    types_or=None
+                    if (types := hook.get("types_or")) is None
+                    else tuple(types),
+                )
+                for hook in repo_item.get("hooks") or []
+            )
+        repos = {
+            repo: PreCommitRepo(
+                position=position,
+                hooks=tuple(repo_hooks),
+                ids=frozenset(hook.id for hook in repo_hooks),
+            )
+            for position, (repo, repo_hooks) in enumerate(hooks.items())
+        }
+        return cls(repos=repos, ci=dict((precommit or {}).get("ci") or {}))
+
+    def first(self, candidates: Mapping[str, T]) -> T | None:
+        """
+        Returns the value for the candidate repo listed first in the config,
+        or None if none of the candidates are present.
+        """
+        present = [repo for repo in candidates if repo in self.repos]
+        if not present:
+            return None
+        return candidates[min(present, key=lambda repo: self.repos[repo].position)]
+
+
+def precommit_index(precommit: dict[str, Any]) -> PreCommitIndex:
+    """
+    Returns the pre-commit config indexed by lowercased repo URL, so checks
+    can look up repos and hooks without rescanning the config.
+    """
+    return lazy.lazy(lambda: PreCommitIndex.from_config(precommit))
+
+
+def _formats_markdown(hook: PreCommitHook) -> bool:
     "A `ruff-format` hook that Markdown files can reach."
     match hook:
-        case {"id": "ruff-format", "types_or": types}:
-            return "markdown" in types
         # No `types_or` means Ruff's own default, which will include
         # Markdown in a future release.
-        case {"id": "ruff-format"}:
+        case PreCommitHook(id="ruff-format", types_or=None):
             return True
+        case PreCommitHook(id="ruff-format", types_or=tuple() as types):
+            return "markdown" in types
         case _:
             return False
 
@@ -58,28 +143,24 @@ class PreCommit:
         return "one of " + ", ".join(msgs)
 
     @classmethod
-    def check(cls, precommit: dict[str, Any]) -> bool | str | None:
+    def check(cls, precommit_index: PreCommitIndex) -> bool | str | None:
         "Must have {self.describe} in `.pre-commit-config.yaml`"
         assert cls.repos, f"{cls.__name__} must have a repo, invalid class definition"
-        for repo_item in precommit.get("repos", {}):
-            repo = repo_item.get("repo", "").lower()
-            if not repo:
-                continue
-            if repo in cls.repos:
-                if cls.ids and repo in cls.ids:
-                    if any(
-                        hook.get("id", "") in cls.ids[repo]
-                        for hook in repo_item.get("hooks", {})
-                    ):
-                        return True
-                else:
-                    return True
-            if cls.renamed and repo in cls.renamed:
-                rename = cls.renamed[repo]
-                return (
-                    f"Use `{rename}` instead of `{repo}` in `.pre-commit-config.yaml`"
-                )
-        return False
+        candidates: dict[str, bool | str] = {
+            repo: True
+            for repo in cls.repos
+            if repo in precommit_index.repos
+            and (
+                repo not in cls.ids
+                or not cls.ids[repo].isdisjoint(precommit_index.repos[repo].ids)
+            )
+        }
+        candidates |= {
+            repo: f"Use `{rename}` instead of `{repo}` in `.pre-commit-config.yaml`"
+            for repo, rename in cls.renamed.items()
+        }
+        result = precommit_index.first(candidates)
+        return False if result is None else result
 
 
 class PC100(PreCommit):
@@ -114,27 +195,27 @@ class PC111(PreCommit):
     }
 
     @classmethod
-    def check(cls, precommit: dict[str, Any]) -> bool | str | None:
+    def check(cls, precommit_index: PreCommitIndex) -> bool | str | None:
         """
         Add `blacken-docs`, or (Ruff 0.16+) let Markdown files reach the
         `ruff-format` hook in `.pre-commit-config.yaml`. Until the hook formats
         Markdown by default, that means `types_or: [python, pyi, jupyter,
         markdown, pyproject]`.
         """
-        for repo_item in precommit.get("repos", {}):
-            match repo_item.get("repo", "").lower(), repo_item.get("hooks", []):
-                case "https://github.com/adamchainz/blacken-docs", _:
-                    return True
-                case "https://github.com/astral-sh/ruff-pre-commit", hooks if any(
-                    _formats_markdown(hook) for hook in hooks
-                ):
-                    return True
-                case repo, _ if repo in cls.renamed:
-                    return (
-                        f"Use `{cls.renamed[repo]}` instead of `{repo}` in "
-                        "`.pre-commit-config.yaml`"
-                    )
-        return False
+        candidates: dict[str, bool | str] = {
+            repo: f"Use `{rename}` instead of `{repo}` in `.pre-commit-config.yaml`"
+            for repo, rename in cls.renamed.items()
+        }
+        candidates["https://github.com/adamchainz/blacken-docs"] = True
+        ruff_repo = precommit_index.repos.get(
+            "https://github.com/astral-sh/ruff-pre-commit"
+        )
+        if ruff_repo is not None and any(
+            _formats_markdown(hook) for hook in ruff_repo.hooks
+        ):
+            candidates["https://github.com/astral-sh/ruff-pre-commit"] = True
+        result = precommit_index.first(candidates)
+        return False if result is None else result
 
 
 class PC190(PreCommit):
@@ -204,23 +285,20 @@ class PC191(PreCommit):
     @classmethod
     def check(  # type: ignore[override]
         cls,
-        precommit: dict[str, Any],
+        precommit_index: PreCommitIndex,
         ruff: dict[str, Any] | None,
     ) -> bool | None:
         """
         If `--fix` is present, `--show-fixes` must be too.
         """
-        for repo in precommit.get("repos", {}):
-            if "repo" in repo and repo["repo"].lower() in cls.repos:
-                for hook in repo["hooks"]:
-                    if (
-                        hook["id"] in {"ruff", "ruff-check"}
-                        and "args" in hook
-                        and "--fix" in hook["args"]
-                    ):
-                        return "--show-fixes" in hook["args"] or (
-                            ruff is not None and "show-fixes" in ruff
-                        )
+        for repo in cls.repos:
+            if repo not in precommit_index.repos:
+                continue
+            for hook in precommit_index.repos[repo].hooks:
+                if hook.id in {"ruff", "ruff-check"} and "--fix" in hook.args:
+                    return "--show-fixes" in hook.args or (
+                        ruff is not None and "show-fixes" in ruff
+                    )
         return None
 
 
@@ -231,24 +309,21 @@ class PC192(PreCommit):
     repos = {"https://github.com/astral-sh/ruff-pre-commit"}
 
     @classmethod
-    def check(cls, precommit: dict[str, Any]) -> bool | None:
+    def check(cls, precommit_index: PreCommitIndex) -> bool | None:
         """
         Use `ruff-check` instead of `ruff` (legacy).
         """
-        for repo in precommit.get("repos", {}):
-            if (
-                "repo" in repo
-                and repo["repo"].lower() in cls.repos
-                and any(hook["id"] == "ruff" for hook in repo["hooks"])
-            ):
-                return False
-        for repo in precommit.get("repos", {}):
-            if (
-                "repo" in repo
-                and repo["repo"].lower() in cls.repos
-                and any(hook["id"] == "ruff-check" for hook in repo["hooks"])
-            ):
-                return True
+        ids = frozenset[str]().union(
+            *(
+                precommit_index.repos[repo].ids
+                for repo in cls.repos
+                if repo in precommit_index.repos
+            )
+        )
+        if "ruff" in ids:
+            return False
+        if "ruff-check" in ids:
+            return True
         return None
 
 
@@ -256,7 +331,9 @@ class PC901(PreCommit):
     "Custom pre-commit CI update message"
 
     @staticmethod
-    def check(precommit: dict[str, Any], dependabot: dict[str, Any]) -> bool | None:  # type: ignore[override]
+    def check(  # type: ignore[override]
+        precommit_index: PreCommitIndex, dependabot: dict[str, Any]
+    ) -> bool | None:
         """
         Should have something like this in `.pre-commit-config.yaml`:
 
@@ -271,14 +348,16 @@ class PC901(PreCommit):
         ):
             return None
 
-        return "autoupdate_commit_msg" in precommit.get("ci", {})
+        return "autoupdate_commit_msg" in precommit_index.ci
 
 
 class PC902(PreCommit):
     "Custom pre-commit CI autofix message"
 
     @staticmethod
-    def check(precommit: dict[str, Any], dependabot: dict[str, Any]) -> bool | None:  # type: ignore[override]
+    def check(  # type: ignore[override]
+        precommit_index: PreCommitIndex, dependabot: dict[str, Any]
+    ) -> bool | None:
         """
         Should have something like this in `.pre-commit-config.yaml`:
 
@@ -293,14 +372,16 @@ class PC902(PreCommit):
         ):
             return None
 
-        return "autofix_commit_msg" in precommit.get("ci", {})
+        return "autofix_commit_msg" in precommit_index.ci
 
 
 class PC903(PreCommit):
     "Specified pre-commit CI schedule"
 
     @staticmethod
-    def check(precommit: dict[str, Any], dependabot: dict[str, Any]) -> bool | None:  # type: ignore[override]
+    def check(  # type: ignore[override]
+        precommit_index: PreCommitIndex, dependabot: dict[str, Any]
+    ) -> bool | None:
         """
         Should set some schedule: `weekly` (default), `monthly`, or `quarterly`.
 
@@ -315,17 +396,19 @@ class PC903(PreCommit):
         ):
             return None
 
-        return "autoupdate_schedule" in precommit.get("ci", {})
+        return "autoupdate_schedule" in precommit_index.ci
 
 
 def repo_review_checks(
     list_all: bool = True,
-    root: Traversable | None = None,
+    root_tree: DirectoryTree | None = None,
 ) -> dict[str, PreCommit]:
-    if root and not list_all:
-        precommit_path = root.joinpath(".pre-commit-config.yaml")
-        lefthook_path = root.joinpath("lefthook.yml")
-        if not precommit_path.is_file() and lefthook_path.is_file():
-            return {}
+    if (
+        root_tree
+        and not list_all
+        and not root_tree.is_file(".pre-commit-config.yaml")
+        and root_tree.is_file("lefthook.yml")
+    ):
+        return {}
 
     return {p.__name__: p() for p in PreCommit.__subclasses__()}
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-__lazy_modules__ = [f"{__spec__.parent.rsplit('.', 1)[0]}._compat"]  # type: ignore[union-attr]
+__lazy_modules__ = [
+    f"{__spec__.parent.rsplit('.', 1)[0]}._compat",  # type: ignore[union-attr]
+    f"{__spec__.parent.rsplit('.', 1)[0]}.cache",  # type: ignore[union-attr]
+    f"{__spec__.parent.rsplit('.', 1)[0]}.lazy",  # type: ignore[union-attr]
+]
 
 import enum
+import functools
 from typing import TYPE_CHECKING, Any
 
+from .. import cache, files, lazy
 from .._compat import tomllib
 from . import mk_url
 
@@ -14,6 +20,23 @@ if TYPE_CHECKING:
     from .._compat.importlib.resources.abc import Traversable
 
 
+def parse_toml(content: bytes) -> dict[str, Any]:
+    return tomllib.loads(content.decode("utf-8"))
+
+
+@files.reads(package=["pyproject.toml"])
+def pyproject(package: Traversable) -> dict[str, Any]:
+    """
+    Returns the ``pyproject.toml`` structure from the package, or an empty
+    dict if there isn't one. Replaces repo-review's built-in fixture so the
+    parse can be cached.
+    """
+    pyproject_path = package.joinpath("pyproject.toml")
+    if pyproject_path.is_file():
+        return cache.load(pyproject_path, parse_toml)
+    return {}
+
+
 class PytestFile(enum.Enum):
     PYTEST_TOML = enum.auto()
     MODERN_PYPROJECT = enum.auto()
@@ -21,6 +44,12 @@ class PytestFile(enum.Enum):
     NONE = enum.auto()
 
 
+def _load_pytest(path: Traversable) -> dict[str, Any]:
+    config: dict[str, Any] = cache.load(path, parse_toml).get("pytest", {})
+    return config
+
+
+@files.reads(root=["pytest.toml", ".pytest.toml"])
 def pytest(
     pyproject: dict[str, Any], root: Traversable
 ) -> tuple[PytestFile, dict[str, Any]]:
@@ -32,9 +61,10 @@ def pytest(
     paths = [root.joinpath("pytest.toml"), root.joinpath(".pytest.toml")]
     for path in paths:
         if path.is_file():
-            with path.open("rb") as f:
-                contents = tomllib.load(f)
-            return (PytestFile.PYTEST_TOML, contents.get("pytest", {}))
+            return (
+                PytestFile.PYTEST_TOML,
+                lazy.lazy_mapping(functools.partial(_load_pytest, path)),
+            )
 
     match pyproject:
         case {"tool": {"pytest": {"ini_options": config}}}:
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
-__lazy_modules__ = ["yaml"]
+__lazy_modules__ = [
+    f"{__spec__.parent.rsplit('.', 1)[0]}._compat",  # type: ignore[union-attr]
+    f"{__spec__.parent.rsplit('.', 1)[0]}.cache",  # type: ignore[union-attr]
+    f"{__spec__.parent.rsplit('.', 1)[0]}.lazy",  # type: ignore[union-attr]
+]
 
+import functools
 from typing import TYPE_CHECKING, Any
 
-import yaml
-
+from .. import cache, files, lazy
+from .._compat import yaml
 from . import mk_url
 
 if TYPE_CHECKING:
     from .._compat.importlib.resources.abc import Traversable
+    from .general import DirectoryTree
 
 
 class ReadTheDocs:
@@ -21,15 +27,14 @@ class RTD100(ReadTheDocs):
     "Uses ReadTheDocs (pyproject config)"
 
     @staticmethod
-    def check(root: Traversable) -> bool:
+    def check(root_tree: DirectoryTree) -> bool:
         """
         Should have a `.readthedocs.yaml` file in the root of the repository.
         Modern ReadTheDocs requires this file.
         """
 
-        return (
-            root.joinpath(".readthedocs.yaml").is_file()
-            or root.joinpath(".readthedocs.yml").is_file()
+        return root_tree.is_file(".readthedocs.yaml") or root_tree.is_file(
+            ".readthedocs.yml"
         )
 
 
@@ -140,19 +145,28 @@ class RTD104(ReadTheDocs):
                 return False
 
 
+def _load(path: Traversable) -> dict[str, Any]:
+    # An empty or comment-only file is None
+    return cache.load(path, yaml.safe_load) or {}
+
+
+@files.reads(root=[".readthedocs.yml", ".readthedocs.yaml"])
 def readthedocs(root: Traversable) -> dict[str, Any]:
     for path in (".readthedocs.yaml", ".readthedocs.yml"):
         readthedocs_path = root.joinpath(path)
         if readthedocs_path.is_file():
-            with readthedocs_path.open("rb") as f:
-                result: dict[str, Any] = yaml.safe_load(f)
-                return result
+            return lazy.lazy_mapping(functools.partial(_load, readthedocs_path))
     return {}
 
 
 def repo_review_checks(
-    list_all: bool = True, readthedocs: dict[str, Any] | None = None
+    list_all: bool = True, root_tree: DirectoryTree | None = None
 ) -> dict[str, ReadTheDocs]:
-    if not list_all and not readthedocs:
+    if (
+        root_tree
+        and not list_all
+        and not root_tree.is_file(".readthedocs.yaml")
+        and not root_tree.is_file(".readthedocs.yml")
+    ):
         return {}
     return {p.__name__: p() for p in ReadTheDocs.__subclasses__()}
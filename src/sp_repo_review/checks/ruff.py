@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-__lazy_modules__ = [f"{__spec__.parent.rsplit('.', 1)[0]}._compat"]  # type: ignore[union-attr]
+__lazy_modules__ = [
+    f"{__spec__.parent.rsplit('.', 1)[0]}.cache",  # type: ignore[union-attr]
+    f"{__spec__.parent.rsplit('.', 1)[0]}.lazy",  # type: ignore[union-attr]
+    f"{__spec__.parent}.pyproject",
+]
 
+import functools
 from typing import TYPE_CHECKING, Any, ClassVar, Literal, Protocol
 
-from .._compat import tomllib
+from .. import cache, files, lazy
 from . import mk_url
+from .pyproject import parse_toml
 
 if TYPE_CHECKING:
     from collections.abc import Generator
@@ -46,6 +52,15 @@ def merge(start: dict[str, Any], add: dict[str, Any]) -> dict[str, Any]:
     return merged
 
 
+def _load_ruff(path: Traversable, pyproject: dict[str, Any]) -> dict[str, Any]:
+    contents = cache.load(path, parse_toml)
+    if contents.get("extend", "") == "pyproject.toml":
+        extend = pyproject.get("tool", {}).get("ruff", {})
+        return merge(extend, contents)
+    return contents
+
+
+@files.reads(root=["ruff.toml", ".ruff.toml"])
 def ruff(pyproject: dict[str, Any], root: Traversable) -> dict[str, Any] | None:
     """
     Returns the ruff configuration, or None if the configuration doesn't exist.
@@ -55,12 +70,7 @@ def ruff(pyproject: dict[str, Any], root: Traversable) -> dict[str, Any] | None:
     paths = [root.joinpath(".ruff.toml"), root.joinpath("ruff.toml")]
     for path in paths:
         if path.is_file():
-            with path.open("rb") as f:
-                contents = tomllib.load(f)
-            if contents.get("extend", "") == "pyproject.toml":
-                extend = pyproject.get("tool", {}).get("ruff", {})
-                return merge(extend, contents)
-            return contents
+            return lazy.lazy_mapping(functools.partial(_load_ruff, path, pyproject))
 
     return pyproject.get("tool", {}).get("ruff", None)  # type: ignore[no-any-return]
 
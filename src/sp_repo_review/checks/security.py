@@ -3,10 +3,14 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING
 
 from . import mk_url
 
+if TYPE_CHECKING:
+    from .github import WorkflowSteps
+    from .precommit import PreCommitIndex
+
 
 class Security:
     family = "security"
@@ -19,7 +23,7 @@ class SEC001(Security):
     url = mk_url("security")
 
     @staticmethod
-    def check(precommit: dict[str, Any], workflows: dict[str, Any]) -> bool:
+    def check(precommit_index: PreCommitIndex, workflow_steps: WorkflowSteps) -> bool:
         """
         Projects with GitHub Actions should statically analyze their workflows
         with [zizmor](https://docs.zizmor.sh), which catches common security
@@ -35,20 +39,9 @@ class SEC001(Security):
 
         You can also run it as the `zizmorcore/zizmor-action` GitHub Action.
         """
-        for repo_item in precommit.get("repos", []):
-            if (
-                repo_item.get("repo", "").lower()
-                == "https://github.com/zizmorcore/zizmor-pre-commit"
-            ):
-                return True
-        for workflow in workflows.values():
-            for job in workflow.get("jobs", {}).values():
-                if not isinstance(job, dict):
-                    continue
-                for step in job.get("steps", []):
-                    if step.get("uses", "").startswith("zizmorcore/zizmor-action"):
-                        return True
-        return False
+        if "https://github.com/zizmorcore/zizmor-pre-commit" in precommit_index.repos:
+            return True
+        return bool(workflow_steps.find("zizmorcore/zizmor-action"))
 
 
 def repo_review_checks() -> dict[str, Security]:
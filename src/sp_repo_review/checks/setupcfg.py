@@ -3,24 +3,33 @@
 
 from __future__ import annotations
 
-__lazy_modules__ = ["configparser"]
+__lazy_modules__ = [
+    "configparser",
+    f"{__spec__.parent.rsplit('.', 1)[0]}.cache",  # type: ignore[union-attr]
+    f"{__spec__.parent.rsplit('.', 1)[0]}.lazy",  # type: ignore[union-attr]
+]
 
 import configparser
 from typing import TYPE_CHECKING
 
+from .. import cache, files, lazy
 from . import mk_url
 
 if TYPE_CHECKING:
     from .._compat.importlib.resources.abc import Traversable
 
 
+def parse_setupcfg(content: bytes) -> configparser.ConfigParser:
+    config = configparser.ConfigParser()
+    config.read_string(content.decode("utf-8"), source="setup.cfg")
+    return config
+
+
+@files.reads(root=["setup.cfg"])
 def setupcfg(root: Traversable) -> configparser.ConfigParser | None:
     setupcfg_path = root.joinpath("setup.cfg")
     if setupcfg_path.is_file():
-        config = configparser.ConfigParser()
-        with setupcfg_path.open("r") as f:
-            config.read_file(f)
-        return config
+        return lazy.lazy(lambda: cache.load(setupcfg_path, parse_setupcfg))
     return None
 
 
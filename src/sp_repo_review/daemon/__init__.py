@@ -0,0 +1,70 @@
+"""
+A long-running review server, and a client that uses it.
+
+``sp-repo-review-daemon`` loads the plugins once and keeps parsed files and
+check results in memory (keyed by file contents, so nothing is ever served
+stale), then answers reviews over a Unix socket. ``sp-repo-review-client``
+takes the same arguments as ``sp-repo-review`` and prints the same output,
+but only pays for starting the interpreter. If no daemon is running, or it
+can't handle a request (such as a ``gh:`` path), the client runs
+``sp-repo-review`` in-process instead, so it is safe to use in hooks
+unconditionally.
+
+The protocol is one JSON line each way per connection. The request has the
+client ``version``, its ``cwd``, the command line ``args``, the forwarded
+``env``, and whether its stdout and stderr are terminals (``stdout_tty``,
+``stderr_tty``). The reply has ``stdout``, ``stderr``, and ``exit_code``, or
+``fallback`` with a reason if the client should run the review itself.
+Requests with a ``command`` of ``"status"`` or ``"stop"`` manage the daemon.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+__all__ = ["FORWARDED_ENV", "SOCKET_ENV", "owned_by_user", "socket_path"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+SOCKET_ENV = "SP_REPO_REVIEW_SOCKET"
+
+#: Environment variables that change the output, passed from the client.
+FORWARDED_ENV = (
+    "COLORTERM",
+    "COLUMNS",
+    "FORCE_COLOR",
+    "LINES",
+    "NO_COLOR",
+    "TERM",
+    "TTY_COMPATIBLE",
+)
+
+
+def socket_path() -> str:
+    """
+    The socket to use: ``SP_REPO_REVIEW_SOCKET`` if set, otherwise in a
+    per-user directory (that only the user can access, created by the daemon)
+    in ``$XDG_RUNTIME_DIR`` or the temporary directory.
+    """
+    if value := os.environ.get(SOCKET_ENV):
+        return value
+    base = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"  # noqa: S108
+    uid = os.getuid() if sys.platform != "win32" else 0
+    return os.path.join(base, f"sp-repo-review-{uid}", "daemon.sock")  # noqa: PTH118
+
+
+def owned_by_user(path: str) -> bool:
+    """
+    Whether ``path`` (not following symlinks) exists and belongs to this user,
+    so a socket someone else planted isn't trusted with reviews.
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    try:
+        return os.lstat(path).st_uid == os.getuid()
+    except OSError:
+        return False
@@ -0,0 +1,110 @@
+"""
+``sp-repo-review-client``: a drop-in for ``sp-repo-review`` that asks a
+running :mod:`sp_repo_review.daemon` to do the review. Only light standard
+library modules are imported unless it has to fall back to reviewing
+in-process.
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = ["json", "socket", "struct"]
+
+import json
+import os
+import socket
+import struct
+import sys
+from typing import Any
+
+from .. import __version__
+from . import FORWARDED_ENV, owned_by_user, socket_path
+
+__all__ = ["main", "request"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+#: Seconds to wait for a review before giving up on the daemon.
+TIMEOUT = 60.0
+
+
+def _isatty(stream: Any) -> bool:  # noqa: ANN401
+    try:
+        return bool(stream.isatty())
+    except (AttributeError, ValueError):
+        return False
+
+
+def _peer_is_user(sock: socket.socket) -> bool:
+    "Whether the process on the other end runs as this user, where known."
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True
+    ucred = struct.Struct("3i")
+    _pid, uid, _gid = ucred.unpack(
+        sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, ucred.size)
+    )
+    return bool(uid == os.getuid())
+
+
+def request(message: dict[str, Any], path: str | None = None) -> dict[str, Any] | None:
+    """
+    Sends ``message`` to the daemon and returns its reply, or None if there is
+    no daemon listening at ``path`` (the default :func:`socket_path`). A socket
+    or a daemon belonging to another user counts as no daemon.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    path = path or socket_path()
+    if not owned_by_user(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(TIMEOUT)
+            sock.connect(path)
+            if not _peer_is_user(sock):
+                return None
+            sock.sendall(json.dumps(message).encode() + b"\n")
+            sock.shutdown(socket.SHUT_WR)
+            with sock.makefile("rb") as f:
+                line = f.readline()
+    except OSError:
+        return None
+    if not line:
+        return None
+    reply: dict[str, Any] = json.loads(line)
+    return reply
+
+
+def main(args: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if args is None else args
+    reply = request(
+        {
+            "version": __version__,
+            "cwd": os.getcwd(),  # noqa: PTH109
+            "args": argv,
+            "env": {k: os.environ[k] for k in FORWARDED_ENV if k in os.environ},
+            "stdout_tty": _isatty(sys.stdout),
+            "stderr_tty": _isatty(sys.stderr),
+        }
+    )
+
+    if reply is None or "fallback" in reply:
+        from ..__main__ import main as sp_repo_review_main  # noqa: PLC0415
+
+        sp_repo_review_main(argv)
+        return
+
+    for stream, text in ((sys.stdout, reply["stdout"]), (sys.stderr, reply["stderr"])):
+        if hasattr(stream, "reconfigure") and stream.encoding != "utf-8":
+            stream.reconfigure(encoding="utf-8")
+        stream.write(text)
+        stream.flush()
+
+    if reply["exit_code"]:
+        raise SystemExit(reply["exit_code"])
+
+
+if __name__ == "__main__":
+    main()
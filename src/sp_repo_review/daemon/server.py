@@ -0,0 +1,260 @@
+"""
+``sp-repo-review-daemon``: serves reviews for
+:mod:`sp_repo_review.daemon.client` over a Unix socket.
+
+Requests are handled one at a time, in this process: reviews are short once
+everything is warm, and the output is rendered by redirecting the standard
+streams, which can't be shared between threads.
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = ["json"]
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import socketserver
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .. import __version__
+from ..__main__ import parser as sp_repo_review_parser
+from ..__main__ import review_packages
+from ..batch import get_check_cache, get_registry
+from ..cache import MemoryCache
+from . import FORWARDED_ENV, SOCKET_ENV, owned_by_user, socket_path
+from .client import request
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+__all__ = ["DaemonServer", "main", "serve"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+class _Fallback(Exception):
+    "The client should run this review itself."
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    def error(self, message: str) -> Any:  # noqa: ANN401
+        raise _Fallback(message)
+
+    def exit(self, status: int = 0, message: str | None = None) -> Any:  # noqa: ANN401, ARG002
+        raise _Fallback(message or "exit")
+
+
+class _Output(io.StringIO):
+    "Captured output, reporting whether the client's stream is a terminal."
+
+    def __init__(self, *, tty: bool) -> None:
+        super().__init__()
+        self._tty = tty
+
+    def isatty(self) -> bool:
+        return self._tty
+
+
+@contextlib.contextmanager
+def _environ(env: Mapping[str, str]) -> Iterator[None]:
+    "Sets the forwarded variables to the client's values while rendering."
+    saved = {key: os.environ.get(key) for key in FORWARDED_ENV}
+    for key in FORWARDED_ENV:
+        os.environ.pop(key, None)
+    os.environ.update({k: v for k, v in env.items() if k in FORWARDED_ENV})
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def run(message: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Reviews like ``sp-repo-review`` with the request's arguments, returning
+    the output and exit code.
+    """
+    if message.get("version") != __version__:
+        msg = f"daemon is version {__version__}"
+        raise _Fallback(msg)
+
+    stdout = _Output(tty=message.get("stdout_tty", False))
+    stderr = _Output(tty=message.get("stderr_tty", False))
+    with (
+        _environ(message.get("env", {})),
+        contextlib.redirect_stdout(stdout),
+        contextlib.redirect_stderr(stderr),
+    ):
+        # Parsed while capturing, so ``--help`` isn't printed by the daemon
+        parsed = sp_repo_review_parser(_ArgumentParser).parse_args(message["args"])
+        if parsed.versions or parsed.list_all or parsed.log_level:
+            msg = "listing and logging are done by the client"
+            raise _Fallback(msg)
+        if any(p.startswith("gh:") for p in parsed.packages):
+            msg = "remote repositories are reviewed by the client"
+            raise _Fallback(msg)
+        exit_code = review_packages(parsed, cwd=Path(message["cwd"]))
+
+    return {
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "exit_code": exit_code,
+    }
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: DaemonServer
+
+    def handle(self) -> None:
+        self.server.requests += 1
+        try:
+            message = json.loads(self.rfile.readline())
+            match message.get("command"):
+                case "status":
+                    reply = self.server.status()
+                case "stop":
+                    self.server.stopping = True
+                    reply = {"stopping": True}
+                case _:
+                    reply = run(message)
+        except _Fallback as err:
+            reply = {"fallback": str(err)}
+        except Exception as err:  # noqa: BLE001
+            reply = {"fallback": f"{type(err).__name__}: {err}"}
+        self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """
+    Serves one request at a time until stopped, or until no request has come
+    in for ``idle_timeout`` seconds.
+    """
+
+    def __init__(self, path: str, *, idle_timeout: float | None = None) -> None:
+        # Only this user may connect
+        umask = os.umask(0o177)
+        try:
+            super().__init__(path, _Handler)
+        finally:
+            os.umask(umask)
+        self.timeout = idle_timeout
+        self.requests = 0
+        self.stopping = False
+        self.started = time.time()
+
+    def handle_timeout(self) -> None:
+        self.stopping = True
+
+    def status(self) -> dict[str, Any]:
+        check_cache = get_check_cache()
+        return {
+            "version": __version__,
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started,
+            "requests": self.requests,
+            "parse_cache_entries": len(MemoryCache.current or ()),
+            "check_cache_hits": check_cache.hits,
+            "check_cache_misses": check_cache.misses,
+        }
+
+    def serve_until_stopped(self) -> None:
+        while not self.stopping:
+            self.handle_request()
+
+
+def _private_directory(path: Path) -> None:
+    "Creates ``path`` for this user only, or checks that it already is."
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    info = path.lstat()
+    if not owned_by_user(str(path)) or info.st_mode & 0o077:
+        msg = f"{path} must be a directory only this user can access"
+        raise RuntimeError(msg)
+
+
+def serve(path: str | None = None, *, idle_timeout: float | None = None) -> None:
+    """
+    Loads the plugins, then serves reviews on ``path`` (the default
+    :func:`~sp_repo_review.daemon.socket_path`) until stopped. A stale socket
+    left by a daemon that died is replaced; a live one, or one belonging to
+    another user, is an error.
+    """
+    if path is None:
+        path = socket_path()
+        if not os.environ.get(SOCKET_ENV) and hasattr(os, "getuid"):
+            _private_directory(Path(path).parent)
+    if os.path.lexists(path):
+        if not owned_by_user(path):
+            msg = f"{path} belongs to another user; not replacing it"
+            raise RuntimeError(msg)
+        if request({"command": "status"}, path) is not None:
+            msg = f"A daemon is already listening on {path}"
+            raise RuntimeError(msg)
+        Path(path).unlink()
+
+    get_registry()
+    get_check_cache()
+    if MemoryCache.current is None:
+        MemoryCache.enable()
+
+    with DaemonServer(path, idle_timeout=idle_timeout) as server:
+        try:
+            server.serve_until_stopped()
+        finally:
+            Path(path).unlink(missing_ok=True)
+
+
+def main(args: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve reviews to sp-repo-review-client from a warm process"
+    )
+    parser.add_argument(
+        "--socket", default=None, help="Socket path (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=None,
+        help="Exit after this many seconds without a request",
+    )
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--status", action="store_true", help="Show the running daemon's status"
+    )
+    group.add_argument("--stop", action="store_true", help="Stop the running daemon")
+    parsed = parser.parse_args(args)
+
+    if not hasattr(socketserver, "UnixStreamServer"):
+        parser.error("Unix sockets are not supported on this platform")
+
+    if parsed.status or parsed.stop:
+        reply = request(
+            {"command": "status" if parsed.status else "stop"}, parsed.socket
+        )
+        if reply is None:
+            print("No daemon running", file=sys.stderr)
+            raise SystemExit(1)
+        print(json.dumps(reply, indent=2))
+        return
+
+    try:
+        serve(parsed.socket, idle_timeout=parsed.idle_timeout)
+    except RuntimeError as err:
+        print(err, file=sys.stderr)
+        raise SystemExit(1) from None
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
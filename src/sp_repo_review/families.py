@@ -6,9 +6,10 @@ import typing
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Callable, Generator
     from configparser import ConfigParser
 
+from .cache import FileTooLarge
 from .checks.pyproject import get_requires_python
 from .checks.ruff import get_rule_selection
 
@@ -96,6 +97,14 @@ def ruff_description(ruff: dict[str, Any]) -> str:
     return ""
 
 
+def _describe(func: Callable[[], str]) -> str:
+    "The description from ``func``, or why the file it needs wasn't read."
+    try:
+        return func()
+    except FileTooLarge as err:
+        return str(err)
+
+
 def get_families(
     pyproject: dict[str, Any],
     ruff: dict[str, Any],
@@ -105,7 +114,9 @@ def get_families(
         "general": Family(
             name="General",
             order=-3,
-            description="\n".join(general_description(pyproject, setupcfg)),
+            description=_describe(
+                lambda: "\n".join(general_description(pyproject, setupcfg))
+            ),
         ),
         "pyproject": Family(
             name="PyProject",
@@ -126,7 +137,7 @@ def get_families(
         ),
         "ruff": Family(
             name="Ruff",
-            description=ruff_description(ruff),
+            description=_describe(lambda: ruff_description(ruff)),
         ),
         "rtd": Family(
             name="ReadTheDocs",
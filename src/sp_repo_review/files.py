@@ -1,5 +1,120 @@
+"""
+Files read by the fixtures in :mod:`sp_repo_review.checks`.
+
+Each fixture that opens files declares them with :func:`reads`, relative to
+the repository root or to the package directory. The ``prefetch_files``
+entry-points are generated from these declarations, so a new input only
+needs to be listed next to the code that reads it. Files that are only
+checked for existence don't need to be listed; that comes from the
+directory listing, which is fetched up front. Fixtures that list
+directories declare them with :func:`lists` instead, so that
+:mod:`sp_repo_review.incremental` knows which added or removed files they
+can see.
+"""
+
 from __future__ import annotations
 
+__lazy_modules__ = ["fnmatch", "importlib", "pkgutil"]
+
+import dataclasses
+import fnmatch
+import importlib
+import pkgutil
+from typing import TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+__all__ = [
+    "MANIFEST",
+    "FixtureFiles",
+    "lists",
+    "manifest",
+    "matches",
+    "prefetch_package",
+    "prefetch_root",
+    "reads",
+]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+F = TypeVar("F", bound="Callable[..., object]")
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
+class FixtureFiles:
+    #: Paths and globs relative to the repository root.
+    root: frozenset[str] = frozenset()
+
+    #: Paths and globs relative to the package directory.
+    package: frozenset[str] = frozenset()
+
+    #: Directories listed, relative to the repository root (``""`` is the root).
+    root_dirs: frozenset[str] = frozenset()
+
+    #: Directories listed, relative to the package directory.
+    package_dirs: frozenset[str] = frozenset()
+
+
+#: The files read by each fixture, by fixture name. Filled in by :func:`reads`
+#: when the checks modules are imported; see :func:`manifest`.
+MANIFEST: dict[str, FixtureFiles] = {}
+
+
+def reads(*, root: Iterable[str] = (), package: Iterable[str] = ()) -> Callable[[F], F]:
+    """
+    Decorator for a fixture, declaring the files it may open. Globs are
+    allowed, matched like :meth:`pathlib.Path.glob`.
+    """
+
+    def register(func: F) -> F:
+        _declare(func.__name__, root=frozenset(root), package=frozenset(package))
+        return func
+
+    return register
+
+
+def lists(*, root: Iterable[str] = (), package: Iterable[str] = ()) -> Callable[[F], F]:
+    """
+    Decorator for a fixture, declaring the directories it lists. Globs are
+    allowed; ``""`` is the root (or package) directory itself.
+    """
+
+    def register(func: F) -> F:
+        _declare(
+            func.__name__, root_dirs=frozenset(root), package_dirs=frozenset(package)
+        )
+        return func
+
+    return register
+
+
+def _declare(name: str, **kwargs: frozenset[str]) -> None:
+    MANIFEST[name] = dataclasses.replace(MANIFEST.get(name, FixtureFiles()), **kwargs)
+
+
+def matches(path: str, pattern: str) -> bool:
+    """
+    True if the ``/`` separated relative ``path`` matches ``pattern``, like
+    :meth:`pathlib.PurePath.full_match` without ``**`` support.
+    """
+    parts, pattern_parts = path.split("/"), pattern.split("/")
+    return len(parts) == len(pattern_parts) and all(
+        fnmatch.fnmatchcase(part, pat)
+        for part, pat in zip(parts, pattern_parts, strict=True)
+    )
+
+
+def manifest() -> dict[str, FixtureFiles]:
+    "Imports all the checks modules, then returns the complete manifest."
+    checks = importlib.import_module(f"{__spec__.parent}.checks")
+    for module in pkgutil.iter_modules(checks.__path__):
+        importlib.import_module(f"{checks.__name__}.{module.name}")
+    return MANIFEST
+
 
 def prefetch_root() -> set[str]:
     """
@@ -7,9 +122,7 @@ def prefetch_root() -> set[str]:
     for async loading.
     """
 
-    return {
-        "setup.cfg",
-    }
+    return {path for files in manifest().values() for path in files.root}
 
 
 def prefetch_package() -> set[str]:
@@ -18,14 +131,4 @@ def prefetch_package() -> set[str]:
     for async loading.
     """
 
-    return {
-        ".github/dependabot.yml",
-        ".github/dependabot.yaml",
-        ".github/workflows/*.yml",
-        ".github/workflows/*.yaml",
-        ".pre-commit-config.yaml",
-        ".readthedocs.yml",
-        "noxfile.py",
-        "ruff.toml",
-        ".ruff.toml",
-    }
+    return {path for files in manifest().values() for path in files.package}
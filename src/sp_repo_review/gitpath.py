@@ -0,0 +1,252 @@
+"""
+Review a commit in a local git repository, such as a bare mirror, without
+checking it out.
+
+:func:`open_ref` reads the trees of a ref through one persistent
+``git cat-file --batch`` process and returns a
+:class:`~sp_repo_review.memorypath.MemoryPath` whose files are a
+:class:`GitFiles` mapping: a blob is only read when a fixture opens it.
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = ["subprocess", "threading"]
+
+import contextlib
+import os
+import subprocess
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .cache import FileTooLarge, max_file_size
+from .memorypath import MemoryPath
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+__all__ = ["GitFiles", "GitObjects", "is_bare_repository", "open_ref"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+# Object names sent in one go; the replies are read after each batch, so the
+# requests must fit in the pipe without git blocking on its output
+_BATCH_BYTES = 16_384
+
+
+def is_bare_repository(path: str | os.PathLike[str]) -> bool:
+    "True if ``path`` looks like a bare git repository (no working tree)."
+    root = Path(path)
+    return (
+        root.joinpath("HEAD").is_file()
+        and root.joinpath("objects").is_dir()
+        and root.joinpath("refs").is_dir()
+    )
+
+
+def _check_names(names: Sequence[str]) -> None:
+    if any(not name or name.isspace() or "\n" in name for name in names):
+        msg = f"Not an object name: {names!r}"
+        raise ValueError(msg)
+
+
+class GitObjects:
+    """
+    Reads objects from the git repository at ``repo`` (bare or not) through a
+    ``git cat-file --batch`` process, which stays open until :meth:`close`
+    (with a ``--batch-check`` one for :meth:`sizes`, started when first
+    needed). Reads from several threads are serialized.
+    """
+
+    def __init__(self, repo: str | os.PathLike[str]) -> None:
+        self.repo = os.fspath(repo)
+        self._lock = threading.Lock()
+        self._process = self._start("--batch")
+        self._check: subprocess.Popen[bytes] | None = None
+
+    def _start(self, mode: str) -> subprocess.Popen[bytes]:
+        return subprocess.Popen(  # noqa: S603
+            ["git", "-C", self.repo, "cat-file", mode],  # noqa: S607
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def sizes(self, names: Sequence[str]) -> list[int | None]:
+        """
+        The size in bytes of each object, without reading it, or None if it
+        doesn't exist.
+        """
+        _check_names(names)
+        with self._lock:
+            if self._check is None:
+                self._check = self._start("--batch-check")
+            assert self._check.stdin is not None
+            assert self._check.stdout is not None
+            sizes: list[int | None] = []
+            # One at a time: each reply line is short, but the requests could
+            # fill the pipe before git's replies are read
+            for name in names:
+                with contextlib.suppress(BrokenPipeError):
+                    self._check.stdin.write(f"{name}\n".encode())
+                    self._check.stdin.flush()
+                line = self._check.stdout.readline()
+                if not line:
+                    msg = f"git cat-file failed; is {self.repo} a git repository?"
+                    raise OSError(msg)
+                header = line.split()
+                sizes.append(int(header[2]) if len(header) == 3 else None)
+        return sizes
+
+    def read(self, names: Sequence[str]) -> list[tuple[str, str, bytes] | None]:
+        """
+        The ``(name, type, content)`` of each object, by any name git
+        understands (such as ``main^{tree}``), or None if it doesn't exist.
+        """
+        _check_names(names)
+        assert self._process.stdin is not None
+        assert self._process.stdout is not None
+
+        objects: list[tuple[str, str, bytes] | None] = []
+        with self._lock:
+            start = 0
+            while start < len(names):
+                end, size = start, 0
+                while end < len(names) and (end == start or size < _BATCH_BYTES):
+                    size += len(names[end]) + 1
+                    end += 1
+                request = "".join(f"{name}\n" for name in names[start:end])
+                # If git has exited, the read below says so
+                with contextlib.suppress(BrokenPipeError):
+                    self._process.stdin.write(request.encode())
+                    self._process.stdin.flush()
+                for _ in range(start, end):
+                    line = self._process.stdout.readline()
+                    if not line:
+                        msg = f"git cat-file failed; is {self.repo} a git repository?"
+                        raise OSError(msg)
+                    header = line.split()
+                    if len(header) != 3:
+                        # "<name> missing" or "<name> ambiguous"
+                        objects.append(None)
+                        continue
+                    content = self._process.stdout.read(int(header[2]))
+                    self._process.stdout.read(1)
+                    objects.append((header[0].decode(), header[1].decode(), content))
+                start = end
+        return objects
+
+    def close(self) -> None:
+        for process in (self._process, self._check):
+            if process is None:
+                continue
+            if process.stdin is not None:
+                with contextlib.suppress(BrokenPipeError):
+                    process.stdin.close()
+            if process.stdout is not None:
+                process.stdout.close()
+            process.wait()
+
+
+def _tree_entries(tree: bytes, hash_size: int) -> Iterator[tuple[bytes, str, str]]:
+    "The ``(mode, name, object)`` of each entry in a raw tree object."
+    pos = 0
+    while pos < len(tree):
+        space = tree.index(b" ", pos)
+        nul = tree.index(b"\0", space)
+        end = nul + 1 + hash_size
+        yield (
+            tree[pos:space],
+            tree[space + 1 : nul].decode("utf-8", "surrogateescape"),
+            tree[nul + 1 : end].hex(),
+        )
+        pos = end
+
+
+class GitFiles(Mapping[str, bytes]):
+    """
+    The regular files in the tree of ``ref``, by path, read on demand. Every
+    tree is read up front, one level at a time; blobs are read when used. A
+    blob over the :func:`~sp_repo_review.cache.max_file_size` limit raises
+    :class:`~sp_repo_review.cache.FileTooLarge` without being read. Symlinks
+    are left out, and submodules are empty directories.
+    """
+
+    def __init__(self, objects: GitObjects, ref: str = "HEAD") -> None:
+        self.objects = objects
+        self.ref = ref
+
+        #: The paths that were read, in order.
+        self.read: list[str] = []
+
+        (root,) = objects.read([f"{ref}^{{tree}}"])
+        if root is None:
+            msg = f"{ref!r} is not a commit or tree in {objects.repo}"
+            raise ValueError(msg)
+        hash_size = len(root[0]) // 2
+
+        self._blobs: dict[str, str] = {}
+        directories: set[str] = set()
+        level: list[tuple[str, bytes]] = [("", root[2])]
+        while level:
+            subtrees: list[tuple[str, str]] = []
+            for prefix, tree in level:
+                for mode, name, sha in _tree_entries(tree, hash_size):
+                    path = f"{prefix}{name}"
+                    if mode == b"40000":
+                        directories.add(path)
+                        subtrees.append((f"{path}/", sha))
+                    elif mode == b"160000":
+                        directories.add(path)
+                    elif mode.startswith(b"100"):
+                        self._blobs[path] = sha
+            found = objects.read([sha for _, sha in subtrees])
+            level = [
+                (prefix, obj[2])
+                for (prefix, _), obj in zip(subtrees, found, strict=True)
+                if obj is not None
+            ]
+
+        #: Every directory in the tree, including submodules.
+        self.directories = frozenset(directories)
+
+    def __getitem__(self, key: str) -> bytes:
+        sha = self._blobs[key]
+        if limit := max_file_size():
+            (size,) = self.objects.sizes([sha])
+            if size is not None and size > limit:
+                raise FileTooLarge(key, limit)
+        (blob,) = self.objects.read([sha])
+        if blob is None:
+            raise KeyError(key)
+        self.read.append(key)
+        return blob[2]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._blobs)
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._blobs
+
+
+@contextlib.contextmanager
+def open_ref(repo: str | os.PathLike[str], ref: str = "HEAD") -> Iterator[MemoryPath]:
+    """
+    Opens ``ref`` (a branch, tag, or commit) in the git repository at
+    ``repo`` for reviewing, as the root of a
+    :class:`~sp_repo_review.memorypath.MemoryPath`. Blobs are read when used,
+    until the ``with`` block ends.
+    """
+    objects = GitObjects(repo)
+    try:
+        files = GitFiles(objects, ref)
+        yield MemoryPath(files=files, directories=files.directories)
+    finally:
+        objects.close()
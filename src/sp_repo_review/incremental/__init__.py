@@ -0,0 +1,311 @@
+"""
+Review a repository again after some files changed, reusing earlier results.
+
+Fixtures declare the files they read and the directories they list (see
+:mod:`sp_repo_review.files`), so changed paths map to the fixtures that can
+see them, and from there, through the fixture and check signatures, to the
+checks that could now give a different answer. :func:`review` runs only
+those, and the checks that ``require`` them if they changed between passing
+and failing; every other check gives its result from the previous review.
+Checks that read the repository directly, or that have no usable previous
+result, always run.
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = ["subprocess"]
+
+import dataclasses
+import inspect
+import subprocess
+import typing
+from pathlib import PurePath
+from typing import TYPE_CHECKING, Any
+
+from .. import files
+from ..processor import Registry, process
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+    from collections.abc import Set as AbstractSet
+
+    from repo_review.checks import Check
+    from repo_review.families import Family
+    from repo_review.processor import Result, ResultDict
+
+    from .._compat.importlib.resources.abc import Traversable
+
+__all__ = [
+    "Changes",
+    "IncrementalReturn",
+    "affected_checks",
+    "affected_fixtures",
+    "dependents",
+    "review",
+]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+#: Fixtures that are the repository itself; anything taking these directly
+#: without declaring its files may read anything.
+BASE_FIXTURES = frozenset({"root", "package"})
+
+
+def _normalize(path: str) -> str:
+    posix = PurePath(path).as_posix()
+    return "" if posix == "." else posix
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
+class Changes:
+    "Changed files, as ``/`` separated paths relative to the repository root."
+
+    #: Files whose contents changed.
+    modified: frozenset[str] = frozenset()
+
+    #: Files that were added or removed (both names, for a rename). Their
+    #: contents count as changed too.
+    added_or_removed: frozenset[str] = frozenset()
+
+    @classmethod
+    def from_paths(cls, paths: Iterable[str]) -> Changes:
+        "Paths changed in an unknown way, so each might also be new or gone."
+        normalized = frozenset(_normalize(p) for p in paths)
+        return cls(modified=normalized, added_or_removed=normalized)
+
+    @classmethod
+    def from_git(cls, root: str | PurePath, revision: str) -> Changes:
+        """
+        The changes ``git diff`` reports in ``root``, for a range like
+        ``main...HEAD``, or between a single revision and the working tree
+        (untracked files included).
+        """
+        if revision.startswith("-"):
+            msg = f"Not a revision: {revision!r}"
+            raise ValueError(msg)
+        git = ["git", "-C", str(root)]
+        diff = subprocess.run(  # noqa: S603
+            [*git, "diff", "--relative", "--name-status", "-z", revision, "--"],
+            check=True,
+            capture_output=True,
+            encoding="utf-8",
+            errors="surrogateescape",
+        ).stdout
+        modified = set()
+        added_or_removed = set()
+        tokens = iter(diff.split("\0"))
+        for status in tokens:
+            match status[:1]:
+                case "":
+                    continue
+                case "R":
+                    added_or_removed |= {next(tokens), next(tokens)}
+                case "C":
+                    next(tokens)
+                    added_or_removed.add(next(tokens))
+                case "A" | "D":
+                    added_or_removed.add(next(tokens))
+                case _:
+                    modified.add(next(tokens))
+
+        if ".." not in revision:
+            untracked = subprocess.run(  # noqa: S603
+                [*git, "ls-files", "--others", "--exclude-standard", "-z"],
+                check=True,
+                capture_output=True,
+                encoding="utf-8",
+                errors="surrogateescape",
+            ).stdout
+            added_or_removed |= {p for p in untracked.split("\0") if p}
+
+        return cls(
+            modified=frozenset(modified), added_or_removed=frozenset(added_or_removed)
+        )
+
+    @property
+    def directories(self) -> frozenset[str]:
+        "Directories whose listing may have changed (```` is the root)."
+        return frozenset(
+            _normalize(str(parent))
+            for path in self.added_or_removed
+            for parent in PurePath(path).parents
+        )
+
+
+def _relative(path: str, subdir: str) -> str | None:
+    "``path`` relative to ``subdir``, or None if it is outside of it."
+    subdir = _normalize(subdir)
+    if not subdir:
+        return path
+    if path == subdir:
+        return ""
+    if path.startswith(f"{subdir}/"):
+        return path[len(subdir) + 1 :]
+    return None
+
+
+def _sees(declared: files.FixtureFiles, changes: Changes, subdir: str) -> bool:
+    paths = changes.modified | changes.added_or_removed
+    package_paths = {p for p in (_relative(p, subdir) for p in paths) if p}
+    dirs = changes.directories
+    package_dirs = {d for d in (_relative(d, subdir) for d in dirs) if d is not None}
+    return any(
+        files.matches(path, pattern)
+        for candidates, patterns in (
+            (paths, declared.root),
+            (package_paths, declared.package),
+            (dirs, declared.root_dirs),
+            (package_dirs, declared.package_dirs),
+        )
+        for path in candidates
+        for pattern in patterns
+    )
+
+
+def _parameters(func: Callable[..., Any]) -> frozenset[str]:
+    return frozenset(inspect.signature(func).parameters)
+
+
+def affected_fixtures(
+    changes: Changes,
+    fixtures: Mapping[str, Callable[..., Any]],
+    *,
+    subdir: str = "",
+) -> set[str]:
+    """
+    The fixtures whose value may differ after ``changes``: those reading or
+    listing a changed path, those that take the repository without declaring
+    what they read, and those computed from any of these.
+    """
+    declared = files.manifest()
+    parameters = {name: _parameters(func) for name, func in fixtures.items()}
+    affected = {
+        name
+        for name in fixtures
+        if name not in BASE_FIXTURES
+        and (
+            _sees(declared[name], changes, subdir)
+            if name in declared
+            else parameters[name] & BASE_FIXTURES
+        )
+    }
+
+    pending = True
+    while pending:
+        pending = False
+        for name, params in parameters.items():
+            if name not in affected and params & affected:
+                affected.add(name)
+                pending = True
+    return affected
+
+
+def affected_checks(
+    checks: Mapping[str, Check], fixtures: AbstractSet[str]
+) -> set[str]:
+    "The checks that take one of ``fixtures`` or the repository itself."
+    inputs = fixtures | BASE_FIXTURES
+    return {name for name, check in checks.items() if _parameters(check.check) & inputs}
+
+
+def dependents(checks: Mapping[str, Check], names: AbstractSet[str]) -> set[str]:
+    "The checks that require one of ``names``, directly or through others."
+    found: set[str] = set()
+    pending = True
+    while pending:
+        pending = False
+        for name, check in checks.items():
+            if name not in found and getattr(check, "requires", set()) & (
+                names | found
+            ):
+                found.add(name)
+                pending = True
+    return found
+
+
+class IncrementalReturn(typing.NamedTuple):
+    families: dict[str, Family]
+    results: list[Result]
+
+    #: The checks that were run, rather than taken from the previous results.
+    rerun: frozenset[str]
+
+
+def _stored(result: ResultDict) -> bool | str | None:
+    "The check return value that reproduces a stored result."
+    if result["result"] is False:
+        return result["err_msg"] or "Check failed"
+    return result["result"]
+
+
+def review(
+    root: Traversable,
+    previous: Mapping[str, ResultDict],
+    changes: Changes,
+    *,
+    select: AbstractSet[str] = frozenset(),
+    ignore: AbstractSet[str] = frozenset(),
+    extend_select: AbstractSet[str] = frozenset(),
+    extend_ignore: AbstractSet[str] = frozenset(),
+    subdir: str = "",
+    registry: Registry | None = None,
+) -> IncrementalReturn:
+    """
+    Reviews ``root`` like :func:`sp_repo_review.processor.process`, running
+    only the checks ``changes`` can affect. ``previous`` holds the results of
+    the last review, as in the ``"checks"`` of the JSON output. The results
+    are the same as for a full review, provided ``previous`` was a review of
+    the repository before ``changes``.
+    """
+    if registry is None:
+        registry = Registry.load()
+    collected = registry.collect(root, subdir)
+
+    rerun = affected_checks(
+        collected.checks,
+        affected_fixtures(changes, registry.fixtures, subdir=subdir),
+    )
+    # Ignored checks with a reason don't have a real result stored
+    rerun |= {
+        name
+        for name in collected.checks
+        if name not in previous or previous[name].get("skip_reason")
+    }
+
+    # A check that requires a rerun check only needs to run again if that one
+    # changed between passing and not passing, which is rare.
+    while True:
+        replay = {
+            name: _stored(previous[name])
+            for name in collected.checks
+            if name not in rerun
+        }
+        families, results = process(
+            root,
+            select=select,
+            ignore=ignore,
+            extend_select=extend_select,
+            extend_ignore=extend_ignore,
+            subdir=subdir,
+            registry=registry,
+            collected=collected,
+            replay=replay,
+        )
+        passed = {r.name: r.result is True for r in results}
+        changed = {
+            name
+            for name in rerun
+            if name not in passed
+            or name not in previous
+            or passed[name] != (previous[name]["result"] is True)
+        }
+        new = dependents(collected.checks, changed) - rerun
+        if not new:
+            break
+        rerun |= new
+
+    ran = frozenset(r.name for r in results if r.name not in replay)
+    return IncrementalReturn(families, results, ran)
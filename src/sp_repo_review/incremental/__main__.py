@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+__lazy_modules__ = ["argparse", "contextlib", "json", "sys"]
+
+import argparse
+import contextlib
+import json
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ..batch import RepoReview
+from . import Changes, review
+
+if TYPE_CHECKING:
+    from typing import TextIO
+
+
+def _split(value: str) -> frozenset[str]:
+    return frozenset(x.strip() for x in value.split(",") if x.strip())
+
+
+def main(args: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Review a repository again, only rerunning the checks that changed files can affect"
+    )
+    parser.add_argument(
+        "path", nargs="?", type=Path, default=Path(), help="Repository to review"
+    )
+    parser.add_argument(
+        "--previous",
+        type=Path,
+        required=True,
+        help="JSON output of the last review (from sp-repo-review --format json or this command)",
+    )
+    changed = parser.add_mutually_exclusive_group(required=True)
+    changed.add_argument(
+        "--changed",
+        nargs="+",
+        metavar="FILE",
+        help="Changed files, relative to the repository",
+    )
+    changed.add_argument(
+        "--changed-from",
+        type=argparse.FileType("r", encoding="utf-8"),
+        help="File with one changed file per line ('-' for stdin)",
+    )
+    changed.add_argument(
+        "--since",
+        metavar="REVISION",
+        help="Use the files git reports as changed since a revision (or in a range like main...HEAD)",
+    )
+    parser.add_argument("--select", default="", help="Checks to run")
+    parser.add_argument("--ignore", default="", help="Checks to skip")
+    parser.add_argument("--extend-select", default="", help="Checks to run in addition")
+    parser.add_argument(
+        "--extend-ignore", default="", help="Checks to skip in addition"
+    )
+    parser.add_argument(
+        "--package-dir", default="", help="Path to the package in the repository"
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="Write to a file instead of stdout"
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print how many checks were rerun to stderr",
+    )
+    parsed = parser.parse_args(args)
+
+    with parsed.previous.open(encoding="utf-8") as f:
+        previous = json.load(f)["checks"]
+
+    if parsed.since:
+        changes = Changes.from_git(parsed.path, parsed.since)
+    elif parsed.changed_from:
+        with parsed.changed_from as f:
+            changes = Changes.from_paths(line.strip() for line in f if line.strip())
+    else:
+        changes = Changes.from_paths(parsed.changed)
+
+    families, results, rerun = review(
+        parsed.path,
+        previous,
+        changes,
+        select=_split(parsed.select),
+        ignore=_split(parsed.ignore),
+        extend_select=_split(parsed.extend_select),
+        extend_ignore=_split(parsed.extend_ignore),
+        subdir=parsed.package_dir,
+    )
+    result = RepoReview.from_results(str(parsed.path), families, results)
+
+    output: TextIO
+    with (
+        parsed.output.open("w", encoding="utf-8")
+        if parsed.output
+        else contextlib.nullcontext(sys.stdout)
+    ) as output:
+        print(json.dumps(result.as_dict(), indent=2), file=output)
+
+    if parsed.stats:
+        print(f"reran {len(rerun)} of {len(results)} checks", file=sys.stderr)
+
+    if result.exit_code:
+        raise SystemExit(result.exit_code)
+
+
+if __name__ == "__main__":
+    main()
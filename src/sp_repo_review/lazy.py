@@ -0,0 +1,216 @@
+"""
+Deferred fixture values.
+
+Fixtures that parse files return proxies from here, so the parsing only
+happens once a check actually reads the value. :class:`LazyMapping` stands in
+for a ``dict`` and :class:`LazyObject` forwards attribute access to any other
+object. Deep copies share the parse with the original and, until they are
+read, compare equal to it without triggering it or comparing the values, so
+repo-review's mutation guard doesn't force every fixture.
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = ["copy"]
+
+import copy
+import functools
+from collections.abc import Iterator, Mapping
+from typing import TYPE_CHECKING, Any, Generic, TypeVar, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, ItemsView, Iterable, KeysView, ValuesView
+
+__all__ = [
+    "LazyMapping",
+    "LazyObject",
+    "digest",
+    "force",
+    "is_evaluated",
+    "lazy",
+    "lazy_mapping",
+    "wrap",
+]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+T = TypeVar("T")
+K = TypeVar("K")
+V = TypeVar("V")
+
+_UNSET: Any = object()
+
+
+class _Thunk(Generic[T]):
+    "Calls a function once, on first use, shared between copies."
+
+    __slots__ = ("_digests", "_func", "_value")
+
+    def __init__(self, func: Callable[[], T]) -> None:
+        self._func = func
+        self._value: T = _UNSET
+        self._digests: dict[Callable[[Any], bytes], bytes] = {}
+
+    def digest(self, func: Callable[[T], bytes]) -> bytes:
+        if func not in self._digests:
+            self._digests[func] = func(self())
+        return self._digests[func]
+
+    def __call__(self) -> T:
+        if self._value is _UNSET:
+            self._value = self._func()
+        return self._value
+
+
+class _Lazy(Generic[T]):
+    __slots__ = ("_copy", "_thunk", "_value")
+
+    def __init__(
+        self, thunk: _Thunk[T], *, copy: bool = False, value: T = _UNSET
+    ) -> None:
+        self._thunk = thunk
+        # Copies get their own deep copy of the value when first read, so a
+        # check mutating its copy can't change what others see.
+        self._copy = copy
+        self._value = value
+
+    def _get(self) -> T:
+        if self._value is _UNSET:
+            value = self._thunk()
+            self._value = copy.deepcopy(value) if self._copy else value
+        return self._value
+
+    @property
+    def _pristine(self) -> bool:
+        return not self._copy or self._value is _UNSET
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> _Lazy[T]:
+        if self._pristine:
+            return type(self)(self._thunk, copy=True)
+        return type(self)(
+            self._thunk, copy=True, value=copy.deepcopy(self._value, memo)
+        )
+
+    def __eq__(self, other: object) -> bool:
+        # Originals and unread copies both hold the value as computed
+        if (
+            isinstance(other, _Lazy)
+            and other._thunk is self._thunk
+            and self._pristine
+            and other._pristine
+        ):
+            return True
+        return bool(self._get() == force(other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._get()!r})"
+
+
+class LazyMapping(_Lazy[Mapping[K, V]], Mapping[K, V]):
+    "A read-only mapping that is computed on first access."
+
+    __slots__ = ()
+
+    def __getitem__(self, key: K) -> V:
+        return self._get()[key]
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._get())
+
+    def __len__(self) -> int:
+        return len(self._get())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._get()
+
+    def get(self, key: K, default: Any = None) -> Any:  # noqa: ANN401
+        return self._get().get(key, default)
+
+    def keys(self) -> KeysView[K]:
+        return self._get().keys()
+
+    def items(self) -> ItemsView[K, V]:
+        return self._get().items()
+
+    def values(self) -> ValuesView[V]:
+        return self._get().values()
+
+
+class LazyObject(_Lazy[T]):
+    "Forwards attribute access to an object that is computed on first access."
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        return getattr(self._get(), name)
+
+    def __bool__(self) -> bool:
+        return bool(self._get())
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._get()  # type: ignore[operator]
+
+    def __getitem__(self, key: Any) -> Any:  # noqa: ANN401
+        return self._get()[key]  # type: ignore[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(cast("Iterable[Any]", self._get()))
+
+
+def _as_mapping(func: Callable[[], object]) -> Mapping[Any, Any]:
+    value = func()
+    return value if isinstance(value, Mapping) else {}
+
+
+def lazy_mapping(func: Callable[[], Mapping[K, V]]) -> dict[K, V]:
+    """
+    Returns a :class:`LazyMapping` computed by ``func`` on first access, typed
+    as a ``dict`` for the fixture signatures. A value that isn't a mapping,
+    like the ``None`` of an empty YAML file, reads as an empty mapping.
+    """
+    return cast("dict[K, V]", LazyMapping(_Thunk(functools.partial(_as_mapping, func))))
+
+
+def lazy(func: Callable[[], T]) -> T:
+    "Returns a :class:`LazyObject` computed by ``func`` on first access."
+    return cast("T", LazyObject(_Thunk(func)))
+
+
+def is_evaluated(value: object) -> bool:
+    "True unless ``value`` is a proxy that hasn't been computed yet."
+    return not isinstance(value, _Lazy) or value._value is not _UNSET  # noqa: SLF001
+
+
+def force(value: T) -> T:
+    "Returns the real value behind a proxy, or ``value`` if it isn't one."
+    if isinstance(value, _Lazy):
+        return cast("T", value._get())  # noqa: SLF001
+    return value
+
+
+def digest(value: object, func: Callable[[Any], bytes]) -> bytes:
+    """
+    Returns ``func`` applied to the real value. For a proxy whose value hasn't
+    been copied out and possibly changed, it is computed once per parse and
+    shared between copies, and the copy isn't read. ``func`` must not modify
+    its argument.
+    """
+    if isinstance(value, _Lazy) and value._pristine:  # noqa: SLF001
+        return value._thunk.digest(func)  # noqa: SLF001
+    return func(force(value))
+
+
+def wrap(
+    value: object, decorator: Callable[[Callable[[], Any]], Callable[[], Any]]
+) -> None:
+    """
+    Replaces the function computing a proxy's value with ``decorator`` applied
+    to it, if it hasn't run yet. Other values are left alone.
+    """
+    if isinstance(value, _Lazy) and value._thunk._value is _UNSET:  # noqa: SLF001
+        value._thunk._func = decorator(value._thunk._func)  # noqa: SLF001
@@ -0,0 +1,218 @@
+"""
+A repository held in memory.
+
+:class:`MemoryPath` is a :class:`~importlib.resources.abc.Traversable` over a
+mapping of ``/`` separated paths to file contents, so a whole review can run
+without touching the disk, such as on files already fetched by a service, or
+in tests. :meth:`MemoryPath.from_directory` snapshots a real directory.
+"""
+
+# pylint: disable=arguments-differ
+
+from __future__ import annotations
+
+__lazy_modules__ = ["fnmatch", "io", "os", "posixpath"]
+
+import dataclasses
+import fnmatch
+import io
+import os
+import posixpath
+import typing
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from ._compat.importlib.resources.abc import Traversable
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+__all__ = ["MemoryPath"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+def _normalize(path: str) -> str:
+    """A ``/`` separated path relative to the root, ``""`` for the root."""
+    normalized = posixpath.normpath(f"/{path}").lstrip("/")
+    return "" if normalized == "." else normalized
+
+
+def _glob_match(pattern_parts: list[str], path_parts: list[str]) -> bool:
+    "Like :meth:`pathlib.Path.glob`; ``**`` matches zero or more components."
+    if not pattern_parts:
+        return not path_parts
+    head, *rest = pattern_parts
+    if head == "**":
+        return any(
+            _glob_match(rest, path_parts[i:]) for i in range(len(path_parts) + 1)
+        )
+    return bool(
+        path_parts
+        and fnmatch.fnmatchcase(path_parts[0], head)
+        and _glob_match(rest, path_parts[1:])
+    )
+
+
+def _index(
+    files: Iterable[str], directories: Iterable[str]
+) -> dict[str, tuple[str, ...]]:
+    "The sorted entry names of every directory, by path."
+    tree: dict[str, set[str]] = {"": set()}
+    for directory in directories:
+        tree.setdefault(directory, set())
+    for path in [*files, *directories]:
+        child = path
+        while child:
+            parent, _, name = child.rpartition("/")
+            tree.setdefault(parent, set()).add(name)
+            child = parent
+    return {directory: tuple(sorted(names)) for directory, names in tree.items()}
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class MemoryPath(Traversable):
+    """
+    A path in a repository held in memory. Directories are implied by the
+    files in them; empty ones can be given in ``directories``. Paths made
+    from this one share the contents.
+
+    :param files: The file contents, by ``/`` separated path from the root.
+    :param directories: Any empty directories, by path.
+    :param path: This path, relative to the root (``""`` is the root).
+    """
+
+    #: The file contents, by ``/`` separated path from the root.
+    files: Mapping[str, bytes] = dataclasses.field(hash=False, repr=False)
+
+    #: Empty directories, by path.
+    directories: frozenset[str] = dataclasses.field(
+        default=frozenset(), hash=False, repr=False
+    )
+
+    #: This path, relative to the root.
+    path: str = ""
+
+    # The entries of each directory, shared between paths
+    _tree: dict[str, tuple[str, ...]] = dataclasses.field(
+        default_factory=dict, hash=False, compare=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if not self._tree:
+            # Only the keys are touched, as the values may be read on demand
+            files = self.files
+            if any(_normalize(k) != k for k in files):
+                files = {_normalize(k): files[k] for k in files}
+            directories = frozenset(_normalize(d) for d in self.directories)
+            object.__setattr__(self, "files", files)
+            object.__setattr__(self, "directories", directories)
+            object.__setattr__(self, "path", _normalize(self.path))
+            object.__setattr__(self, "_tree", _index(files, directories))
+
+    @classmethod
+    def from_directory(
+        cls,
+        root: str | os.PathLike[str],
+        *,
+        exclude: Iterable[str] = (".git",),
+    ) -> MemoryPath:
+        """
+        Reads every file under ``root``. Directories named in ``exclude`` are
+        kept, but empty, so listings still match the original.
+        """
+        skip = frozenset(exclude)
+        base = Path(root)
+        files = {}
+        directories = set()
+        for dirpath, dirnames, filenames in os.walk(base):
+            relative = Path(dirpath).relative_to(base).as_posix()
+            prefix = "" if relative == "." else f"{relative}/"
+            for name in [d for d in dirnames if d in skip]:
+                dirnames.remove(name)
+                directories.add(f"{prefix}{name}")
+            if not dirnames and not filenames and prefix:
+                directories.add(relative)
+            for name in filenames:
+                path = Path(dirpath, name)
+                if path.is_file():
+                    files[f"{prefix}{name}"] = path.read_bytes()
+        return cls(files=files, directories=frozenset(directories))
+
+    def __str__(self) -> str:
+        return self.path or "."
+
+    def __copy__(self) -> MemoryPath:
+        return self
+
+    def __deepcopy__(self, memo: dict[int, object]) -> MemoryPath:
+        # Immutable, so repo-review's mutation guard doesn't need to copy the
+        # files (which may not even be copyable, such as an open archive)
+        return self
+
+    @property
+    def name(self) -> str:
+        """The final component of the path, ``""`` for the root."""
+        return self.path.rpartition("/")[2]
+
+    def _with_path(self, path: str) -> MemoryPath:
+        return dataclasses.replace(self, path=_normalize(path))
+
+    def joinpath(self, *descendants: str) -> MemoryPath:
+        return self._with_path(posixpath.join(self.path, *descendants))
+
+    def __truediv__(self, child: str) -> MemoryPath:
+        return self.joinpath(child)
+
+    def is_dir(self) -> bool:
+        return self.path in self._tree
+
+    def is_file(self) -> bool:
+        return self.path in self.files
+
+    def iterdir(self) -> Iterator[MemoryPath]:
+        if self.path not in self._tree:
+            raise (NotADirectoryError if self.is_file() else FileNotFoundError)(
+                self.path
+            )
+        prefix = f"{self.path}/" if self.path else ""
+        for name in self._tree[self.path]:
+            yield self._with_path(f"{prefix}{name}")
+
+    def glob(self, pattern: str) -> Iterator[MemoryPath]:
+        """
+        Paths under this one matching ``pattern``, like
+        :meth:`pathlib.Path.glob` (``**`` matches any number of directories).
+        """
+        prefix = f"{self.path}/" if self.path else ""
+        pattern_parts = pattern.split("/")
+        for path in sorted(self.files.keys() | self._tree.keys()):
+            if path and path.startswith(prefix):
+                relative = path[len(prefix) :]
+                if _glob_match(pattern_parts, relative.split("/")):
+                    yield self._with_path(path)
+
+    @typing.overload  # type: ignore[override]
+    def open(self, mode: Literal["r"], encoding: str | None = ...) -> io.StringIO: ...
+
+    @typing.overload
+    def open(self, mode: Literal["rb"]) -> io.BytesIO: ...
+
+    def open(
+        self, mode: Literal["r", "rb"] = "r", encoding: str | None = "utf-8"
+    ) -> io.IOBase:
+        """Opens the file for reading, as text or (with ``"rb"``) binary."""
+        if self.path not in self.files:
+            raise (IsADirectoryError if self.is_dir() else FileNotFoundError)(self.path)
+        content = self.files[self.path]
+        if mode == "rb":
+            return io.BytesIO(content)
+        return io.StringIO(content.decode(encoding or "utf-8"))
+
+    def read_bytes(self) -> bytes:
+        return self.open("rb").read()
+
+    def read_text(self, encoding: str | None = "utf-8") -> str:
+        return self.open("r", encoding=encoding).read()
@@ -0,0 +1,378 @@
+"""
+Run only the checks that a selection needs.
+
+:func:`repo_review.processor.process` runs every collected check and filters
+the results afterwards, which would read every lazy fixture (see
+:mod:`sp_repo_review.lazy`). :func:`process` drops the checks that are not
+selected, keeping anything a selected check ``requires``, before handing off
+to it. The results are the same; only the unused work is skipped.
+
+:class:`Registry` holds the plugin entry-points, so reviewing many
+repositories only looks them up once, and a
+:class:`~sp_repo_review.cache.CheckCache` can be passed to reuse check
+results between repositories. The packages of a monorepo can share the
+fixtures that only read the repository root (see :func:`root_fixtures`). A
+:class:`~sp_repo_review.profile.Profiler` times the fixtures and checks. A
+check whose input is over the size limit (see
+:func:`sp_repo_review.cache.read`) fails with a message saying so, even if
+the file is read while computing the fixtures or families; an oversized
+``pyproject.toml`` is taken to have no ``[tool.repo-review]`` configuration,
+and fails every check computed from it.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import dataclasses
+import functools
+import graphlib
+import importlib.metadata
+import inspect
+from typing import TYPE_CHECKING, Any
+
+from repo_review.checks import is_allowed, name_matches
+from repo_review.families import Family
+from repo_review.fixtures import apply_fixtures, collect_fixtures, compute_fixtures
+from repo_review.fixtures import pyproject as builtin_pyproject
+from repo_review.ghpath import EmptyTraversable
+from repo_review.processor import CollectionReturn
+from repo_review.processor import process as _process
+
+from . import lazy
+from .cache import FileTooLarge
+from .checks.pyproject import pyproject
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+    from collections.abc import Set as AbstractSet
+
+    from repo_review.checks import Check
+    from repo_review.processor import ProcessReturn
+
+    from ._compat.importlib.resources.abc import Traversable
+    from .cache import CheckCache
+    from .profile import Profiler
+
+__all__ = [
+    "Registry",
+    "guarded",
+    "needed_checks",
+    "process",
+    "replayed",
+    "root_fixtures",
+]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+def _load_group(group: str) -> tuple[Callable[..., Any], ...]:
+    return tuple(ep.load() for ep in importlib.metadata.entry_points(group=group))
+
+
+def _value(value: Any) -> Any:  # noqa: ANN401
+    return value
+
+
+def _raise(err: Exception) -> Any:  # noqa: ANN401
+    raise err
+
+
+def _deferred(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Returns a copy of the fixture ``func`` that, if a file it reads is too
+    large, gives a mapping raising :class:`~sp_repo_review.cache.FileTooLarge`
+    when read instead, so only the checks using it fail.
+    """
+
+    @functools.wraps(func)
+    def compute(**kwargs: Any) -> Any:  # noqa: ANN401
+        try:
+            return func(**kwargs)
+        except FileTooLarge as err:
+            return lazy.lazy_mapping(functools.partial(_raise, err))
+
+    return compute
+
+
+def root_fixtures(fixtures: Mapping[str, Callable[..., Any]]) -> frozenset[str]:
+    """
+    The names of the ``fixtures`` that only depend on ``root`` (directly or
+    through other fixtures), so are the same for every package in a repository.
+    """
+    graph = {
+        name: inspect.signature(func).parameters.keys()
+        for name, func in fixtures.items()
+    }
+    found = {"root"}
+    for name in graphlib.TopologicalSorter(graph).static_order():
+        if name in graph and graph[name] <= found:
+            found.add(name)
+    return frozenset(found - {"root"})
+
+
+def _dependent_fixtures(
+    fixtures: Mapping[str, Callable[..., Any]], name: str
+) -> frozenset[str]:
+    """
+    ``name`` and the names of the ``fixtures`` computed from it, directly or
+    through other fixtures.
+    """
+    graph = {
+        fixture: inspect.signature(func).parameters.keys()
+        for fixture, func in fixtures.items()
+    }
+    found = {name}
+    for fixture in graphlib.TopologicalSorter(graph).static_order():
+        if fixture in graph and graph[fixture] & found:
+            found.add(fixture)
+    return frozenset(found)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class Registry:
+    """
+    The fixture, check, and family functions from all installed plugins.
+    :meth:`collect` is :func:`repo_review.processor.collect_all` without the
+    entry-point lookups.
+    """
+
+    fixtures: Mapping[str, Callable[..., Any]]
+    checks: tuple[Callable[..., Any], ...]
+    families: tuple[Callable[..., Any], ...]
+
+    @classmethod
+    def load(cls) -> Registry:
+        fixtures = collect_fixtures()
+        # Not an entry point, as it would share the name of repo-review's
+        # built-in fixture: this one parses through the cache, size limited
+        if fixtures["pyproject"] is builtin_pyproject:
+            fixtures["pyproject"] = pyproject
+        return cls(
+            fixtures=fixtures,
+            checks=_load_group("repo_review.checks"),
+            families=_load_group("repo_review.families"),
+        )
+
+    def collect(
+        self,
+        root: Traversable | None = None,
+        subdir: str = "",
+        *,
+        profiler: Profiler | None = None,
+        shared: Mapping[str, Any] | None = None,
+    ) -> CollectionReturn:
+        """
+        Pass a ``profiler`` to time the fixtures. Fixtures in ``shared`` are
+        not computed; they take the value there, such as the
+        :func:`root_fixtures` of another package in the same repository.
+        """
+        if root is None:
+            root = EmptyTraversable()
+        package = root.joinpath(subdir) if subdir else root
+
+        funcs = profiler.wrap_fixtures(self.fixtures) if profiler else self.fixtures
+        if shared:
+            funcs = {
+                name: functools.partial(_value, shared[name])
+                if name in shared
+                else func
+                for name, func in funcs.items()
+            }
+        funcs = {name: _deferred(func) for name, func in funcs.items()}
+        fixtures = compute_fixtures(root, package, funcs)
+        checks: dict[str, Check] = {
+            k: v
+            for func in self.checks
+            for k, v in apply_fixtures(fixtures, func).items()
+        }
+        families: dict[str, Family] = {}
+        for func in self.families:
+            # Families whose details need an oversized file get the defaults
+            with contextlib.suppress(FileTooLarge):
+                families.update(apply_fixtures(fixtures, func))
+        for name in {c.family for c in checks.values()}:
+            families.setdefault(name, Family())
+
+        # Same order as repo-review
+        checks = dict(
+            sorted(
+                checks.items(),
+                key=lambda x: (
+                    families[x[1].family].get("order", 0),
+                    x[1].family,
+                    x[0],
+                ),
+            )
+        )
+        return CollectionReturn(fixtures, checks, families)
+
+
+def needed_checks(
+    checks: Mapping[str, Check],
+    *,
+    select: AbstractSet[str] = frozenset(),
+    ignore: AbstractSet[str] = frozenset(),
+    keep: AbstractSet[str] = frozenset(),
+) -> dict[str, Check]:
+    """
+    Returns the checks allowed by ``select``/``ignore``, plus everything they
+    require (transitively). Checks matching ``keep`` are kept too, as they
+    are still reported (such as ignores with a reason).
+    """
+    pending = [
+        name
+        for name in checks
+        if is_allowed(select, ignore, name) or name_matches(name, keep)
+    ]
+    needed: set[str] = set()
+    while pending:
+        name = pending.pop()
+        if name in needed or name not in checks:
+            continue
+        needed.add(name)
+        pending.extend(getattr(checks[name], "requires", ()))
+    return {name: check for name, check in checks.items() if name in needed}
+
+
+def replayed(check: Check, result: bool | str | None) -> Check:
+    """
+    Returns a copy of ``check`` that returns ``result`` instead of running.
+    A string result is a failure with that message, as for a real check.
+    """
+    wrapped = copy.copy(check)
+    wrapped.check = lambda: result  # type: ignore[method-assign]
+    return wrapped
+
+
+def guarded(check: Check) -> Check:
+    """
+    Returns a copy of ``check`` that fails with the message of
+    :class:`~sp_repo_review.cache.FileTooLarge` if one of its inputs is too
+    large, instead of raising it.
+    """
+    func = check.check
+
+    @functools.wraps(func)
+    def run(**kwargs: Any) -> Any:  # noqa: ANN401
+        try:
+            return func(**kwargs)
+        except FileTooLarge as err:
+            return str(err)
+
+    wrapped = copy.copy(check)
+    wrapped.check = run  # type: ignore[method-assign]
+    return wrapped
+
+
+def process(
+    root: Traversable,
+    *,
+    select: AbstractSet[str] = frozenset(),
+    ignore: AbstractSet[str] = frozenset(),
+    extend_select: AbstractSet[str] = frozenset(),
+    extend_ignore: AbstractSet[str] = frozenset(),
+    subdir: str = "",
+    registry: Registry | None = None,
+    check_cache: CheckCache | None = None,
+    collected: CollectionReturn | None = None,
+    replay: Mapping[str, bool | str | None] | None = None,
+    profiler: Profiler | None = None,
+) -> ProcessReturn:
+    """
+    Like :func:`repo_review.processor.process`, but skips the checks (and so
+    the fixture parsing) that the selection doesn't need. Pass a
+    :class:`Registry` to reuse loaded plugins (the one ``collected`` came
+    from, if given), and a ``check_cache`` to reuse results of checks that
+    have seen the same inputs before. Checks in ``replay`` are not run; they
+    give the result stored there (see :func:`replayed`). A ``profiler``
+    records the time taken by the whole review, each fixture, and each check.
+    """
+    with profiler.span("review", "review") if profiler else contextlib.nullcontext():
+        if collected is None:
+            registry = registry or Registry.load()
+            collected = registry.collect(root, subdir, profiler=profiler)
+        return _process_collected(
+            root,
+            collected,
+            registry=registry,
+            select=select,
+            ignore=ignore,
+            extend_select=extend_select,
+            extend_ignore=extend_ignore,
+            subdir=subdir,
+            check_cache=check_cache,
+            replay=replay,
+            profiler=profiler,
+        )
+
+
+def _process_collected(
+    root: Traversable,
+    collected: CollectionReturn,
+    *,
+    registry: Registry | None,
+    select: AbstractSet[str],
+    ignore: AbstractSet[str],
+    extend_select: AbstractSet[str],
+    extend_ignore: AbstractSet[str],
+    subdir: str,
+    check_cache: CheckCache | None,
+    replay: Mapping[str, bool | str | None] | None,
+    profiler: Profiler | None,
+) -> ProcessReturn:
+    fixtures, checks, families = collected
+
+    # Same rules as repo-review, including [tool.repo-review] config
+    too_large = None
+    try:
+        config = fixtures["pyproject"].get("tool", {}).get("repo-review", {})
+    except FileTooLarge as err:
+        # repo-review reads the configuration too; checks depending on the
+        # pyproject fixture are failed below instead of seeing it empty
+        too_large = err
+        config = {}
+        fixtures = {**fixtures, "pyproject": {}}
+    ignore_config = config.get("ignore", [])
+    select_checks = (select or frozenset(config.get("select", ()))) | extend_select
+    skip_checks = (ignore or frozenset(ignore_config)) | extend_ignore
+    skip_reasons = ignore_config if isinstance(ignore_config, dict) else {}
+
+    needed = needed_checks(
+        checks,
+        select=select_checks,
+        ignore=skip_checks,
+        keep={k for k, v in skip_reasons.items() if v},
+    )
+    if check_cache is not None:
+        needed = check_cache.wrap_all(needed)
+    if replay:
+        needed = {
+            name: replayed(check, replay[name]) if name in replay else check
+            for name, check in needed.items()
+        }
+    if too_large is not None:
+        # Fixtures computed from it, such as ruff's, can't be trusted either
+        unreadable = _dependent_fixtures(
+            (registry or Registry.load()).fixtures, "pyproject"
+        )
+        needed = {
+            name: replayed(check, str(too_large))
+            if inspect.signature(check.check).parameters.keys() & unreadable
+            else check
+            for name, check in needed.items()
+        }
+    needed = {name: guarded(check) for name, check in needed.items()}
+    if profiler is not None:
+        needed = profiler.wrap_checks(needed)
+    return _process(
+        root,
+        select=select,
+        ignore=ignore,
+        extend_select=extend_select,
+        extend_ignore=extend_ignore,
+        subdir=subdir,
+        collected=CollectionReturn(fixtures, needed, families),
+    )
@@ -0,0 +1,254 @@
+"""
+Where the time of a review goes.
+
+A :class:`Profiler` passed to :func:`sp_repo_review.processor.process` times
+every fixture, every check, and the parsing behind each lazy fixture (see
+:mod:`sp_repo_review.lazy`), which happens when a check first reads it. Each
+call is an :class:`Event`; :meth:`Profiler.summary` adds them up per name,
+and :meth:`Profiler.trace` gives them in the Chrome trace-event format, to
+load into ``chrome://tracing`` or https://ui.perfetto.dev. Profiling is off
+unless a profiler is passed.
+
+With ``memory=True``, each event also records the peak and retained bytes
+allocated while it ran, from :mod:`tracemalloc`. That slows the review down
+several times, so the times are only comparable to each other.
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = ["copy", "os", "threading", "tracemalloc"]
+
+import contextlib
+import copy
+import dataclasses
+import functools
+import os
+import threading
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any, Literal
+
+from .. import lazy
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Mapping
+
+    from repo_review.checks import Check
+
+__all__ = ["Category", "Event", "Profiler", "Stats"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+Category = Literal["review", "fixture", "parse", "check"]
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
+class Event:
+    "One timed call."
+
+    name: str
+    category: Category
+
+    #: Seconds since the profiler was created.
+    start: float
+
+    #: Seconds taken, including any events inside this one.
+    duration: float
+
+    #: Seconds taken outside of events inside this one.
+    self_time: float
+
+    thread: int
+
+    #: Most bytes allocated at once during the event, over what was allocated
+    #: when it started (0 unless tracing memory).
+    peak: int = 0
+
+    #: Bytes allocated during the event and still in use after it.
+    retained: int = 0
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
+class Stats:
+    "All calls to one name, added up."
+
+    name: str
+    category: Category
+    calls: int
+    total: float
+    self_time: float
+    max: float
+
+    #: The largest peak of a call.
+    peak: int = 0
+
+    #: Bytes retained, over all calls.
+    retained: int = 0
+
+
+@dataclasses.dataclass(kw_only=True, slots=True)
+class _Frame:
+    #: Seconds taken by events inside this one.
+    inner: float = 0.0
+
+    #: Traced memory at the start.
+    memory: int = 0
+
+    #: Highest traced memory seen so far.
+    peak: int = 0
+
+
+class Profiler:
+    """
+    Records :class:`Event` s. Use :meth:`span` to time a block, or the
+    ``wrap`` methods to time fixtures and checks. With ``memory``, starts
+    tracing allocations until :meth:`stop` is called.
+    """
+
+    def __init__(self, *, memory: bool = False) -> None:
+        self.events: list[Event] = []
+        self.memory = memory
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+        self._started_tracing = memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    def stop(self) -> None:
+        "Stops tracing allocations, if this profiler started it."
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _enter(self, stack: list[_Frame]) -> _Frame:
+        if not self.memory:
+            return _Frame()
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, peak)
+        # The peak is global, so this loses the outer peak; it was saved above
+        tracemalloc.reset_peak()
+        return _Frame(memory=current, peak=current)
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: Category) -> Iterator[None]:
+        "Times the body of the ``with`` block."
+        # One frame per event in progress, per thread
+        stack: list[_Frame] = self._local.__dict__.setdefault("stack", [])
+        frame = self._enter(stack)
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            current = frame.memory
+            if self.memory:
+                current, peak = tracemalloc.get_traced_memory()
+                frame.peak = max(frame.peak, peak)
+            if stack:
+                stack[-1].inner += duration
+                stack[-1].peak = max(stack[-1].peak, frame.peak)
+            self.events.append(
+                Event(
+                    name=name,
+                    category=category,
+                    start=start - self._origin,
+                    duration=duration,
+                    self_time=duration - frame.inner,
+                    thread=threading.get_ident(),
+                    peak=frame.peak - frame.memory,
+                    retained=current - frame.memory,
+                )
+            )
+
+    def wrap_fixture(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Times ``func``, a fixture, and the parse behind the value it returns,
+        if that is lazy. The signature is unchanged.
+        """
+
+        def timed_parse(parse: Callable[[], Any]) -> Callable[[], Any]:
+            def run() -> Any:  # noqa: ANN401
+                with self.span(name, "parse"):
+                    return parse()
+
+            return run
+
+        @functools.wraps(func)
+        def timed(**kwargs: Any) -> Any:  # noqa: ANN401
+            with self.span(name, "fixture"):
+                value = func(**kwargs)
+            lazy.wrap(value, timed_parse)
+            return value
+
+        return timed
+
+    def wrap_fixtures(
+        self, fixtures: Mapping[str, Callable[..., Any]]
+    ) -> dict[str, Callable[..., Any]]:
+        return {name: self.wrap_fixture(name, f) for name, f in fixtures.items()}
+
+    def wrap_check(self, name: str, check: Check) -> Check:
+        "Returns a copy of ``check`` whose ``check`` method is timed."
+        func = check.check
+
+        @functools.wraps(func)
+        def timed(**kwargs: Any) -> Any:  # noqa: ANN401
+            with self.span(name, "check"):
+                return func(**kwargs)
+
+        wrapped = copy.copy(check)
+        wrapped.check = timed  # type: ignore[method-assign]
+        return wrapped
+
+    def wrap_checks(self, checks: Mapping[str, Check]) -> dict[str, Check]:
+        return {name: self.wrap_check(name, c) for name, c in checks.items()}
+
+    def summary(self) -> list[Stats]:
+        "The events added up per name and category, slowest (self time) first."
+        grouped: dict[tuple[str, Category], list[Event]] = {}
+        for event in self.events:
+            grouped.setdefault((event.name, event.category), []).append(event)
+        stats = [
+            Stats(
+                name=name,
+                category=category,
+                calls=len(events),
+                total=sum(e.duration for e in events),
+                self_time=sum(e.self_time for e in events),
+                max=max(e.duration for e in events),
+                peak=max(e.peak for e in events),
+                retained=sum(e.retained for e in events),
+            )
+            for (name, category), events in grouped.items()
+        ]
+        return sorted(stats, key=lambda s: s.self_time, reverse=True)
+
+    def trace(self) -> dict[str, Any]:
+        "The events as a Chrome trace (complete events, in microseconds)."
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": event.name,
+                    "cat": event.category,
+                    "ph": "X",
+                    "ts": round(event.start * 1e6, 3),
+                    "dur": round(event.duration * 1e6, 3),
+                    "pid": pid,
+                    "tid": event.thread,
+                    **(
+                        {"args": {"peak": event.peak, "retained": event.retained}}
+                        if self.memory
+                        else {}
+                    ),
+                }
+                for event in sorted(self.events, key=lambda e: e.start)
+            ],
+            "displayTimeUnit": "ms",
+        }
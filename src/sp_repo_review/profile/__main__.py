@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+__lazy_modules__ = [
+    "argparse",
+    "json",
+    "rich",
+    "rich.console",
+    "rich.table",
+]
+
+import argparse
+import json
+from pathlib import Path
+
+import rich.console
+import rich.table
+
+from ..batch import open_root
+from ..processor import Registry, process
+from . import Profiler
+
+
+def _split(value: str) -> frozenset[str]:
+    return frozenset(x.strip() for x in value.split(",") if x.strip())
+
+
+def _table(profiler: Profiler, top: int) -> rich.table.Table:
+    columns = ["Calls", "Self (ms)", "Total (ms)", "Max (ms)"]
+    summary = profiler.summary()
+    if profiler.memory:
+        columns += ["Peak (KiB)", "Retained (KiB)"]
+        summary.sort(key=lambda s: s.peak, reverse=True)
+
+    table = rich.table.Table(
+        title=f"{'Memory and time' if profiler.memory else 'Time'} by fixture and check"
+    )
+    table.add_column("Name")
+    table.add_column("Kind")
+    for column in columns:
+        table.add_column(column, justify="right")
+    for stats in summary[: top or None]:
+        row = [
+            stats.name,
+            stats.category,
+            str(stats.calls),
+            f"{stats.self_time * 1000:.2f}",
+            f"{stats.total * 1000:.2f}",
+            f"{stats.max * 1000:.2f}",
+        ]
+        if profiler.memory:
+            row += [f"{stats.peak / 1024:,.1f}", f"{stats.retained / 1024:,.1f}"]
+        table.add_row(*row)
+    return table
+
+
+def main(args: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Review a repository and report the time taken by each fixture and check"
+    )
+    parser.add_argument(
+        "path",
+        nargs="?",
+        type=Path,
+        default=Path(),
+        help="Repository (or tar or zip archive, or bare git repository) to review",
+    )
+    parser.add_argument("--select", default="", help="Checks to run")
+    parser.add_argument("--ignore", default="", help="Checks to skip")
+    parser.add_argument("--extend-select", default="", help="Checks to run in addition")
+    parser.add_argument(
+        "--extend-ignore", default="", help="Checks to skip in addition"
+    )
+    parser.add_argument(
+        "--package-dir", default="", help="Path to the package in the repository"
+    )
+    parser.add_argument(
+        "--ref", default="", help="Review this git ref, without checking it out"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Review this many times, to average out noise (default: 1)",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        help="Write a Chrome trace-event JSON file, for chrome://tracing or ui.perfetto.dev",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Also trace the peak and retained memory of each (much slower)",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=25,
+        help="Show only the first rows (default: 25, 0 for all)",
+    )
+    parsed = parser.parse_args(args)
+
+    registry = Registry.load()
+    profiler = Profiler(memory=parsed.memory)
+    try:
+        with open_root(parsed.path, ref=parsed.ref) as root:
+            for _ in range(parsed.repeat):
+                process(
+                    root,
+                    select=_split(parsed.select),
+                    ignore=_split(parsed.ignore),
+                    extend_select=_split(parsed.extend_select),
+                    extend_ignore=_split(parsed.extend_ignore),
+                    subdir=parsed.package_dir,
+                    registry=registry,
+                    profiler=profiler,
+                )
+    finally:
+        profiler.stop()
+
+    rich.console.Console().print(_table(profiler, parsed.top))
+    if parsed.trace:
+        with parsed.trace.open("w", encoding="utf-8") as f:
+            json.dump(profiler.trace(), f)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+"""
+A SQLite warehouse of batch review results, for questions across a fleet
+and over time.
+
+Each import is a scan: the JSON Lines output of ``sp-repo-review-batch
+--format jsonl`` (see :mod:`sp_repo_review.batch.jsonl`), or reviews from
+:func:`~sp_repo_review.batch.review_many` directly. Repositories, checks,
+families, and messages are stored once each and referenced by id, so a
+result row is a few integers. A repository's organization is the name of
+the directory it is in.
+
+Reports read the ``totals`` table, the number of passed, failed, and
+skipped results of each check by scan and organization, filled in on
+import; questions about individual repositories use the index on results
+by check and result.
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = ["datetime", "json", "sqlite3"]
+
+import dataclasses
+import datetime as dt
+import json
+import os
+import sqlite3
+from pathlib import PurePath
+from typing import TYPE_CHECKING, Any
+
+from .. import __version__
+from ..batch.jsonl import record
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from ..batch import RepoReview
+
+__all__ = ["SCHEMA", "Report", "Warehouse"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    scanned_at TEXT NOT NULL,
+    version TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS orgs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS repos (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    org INTEGER NOT NULL REFERENCES orgs
+);
+CREATE TABLE IF NOT EXISTS families (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    "order" INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS checks (
+    id TEXT PRIMARY KEY,
+    family TEXT NOT NULL REFERENCES families,
+    description TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER PRIMARY KEY,
+    scan INTEGER NOT NULL REFERENCES scans,
+    repo INTEGER NOT NULL REFERENCES repos,
+    status TEXT NOT NULL,
+    duration REAL NOT NULL DEFAULT 0,
+    error TEXT NOT NULL DEFAULT '',
+    UNIQUE (scan, repo)
+);
+CREATE INDEX IF NOT EXISTS reviews_repo ON reviews (repo, scan);
+-- result: 1 passed, 0 failed, NULL skipped; message: the error or skip reason
+CREATE TABLE IF NOT EXISTS results (
+    review INTEGER NOT NULL REFERENCES reviews,
+    "check" TEXT NOT NULL REFERENCES checks,
+    result INTEGER,
+    message INTEGER REFERENCES messages,
+    PRIMARY KEY (review, "check")
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_check ON results ("check", result, review);
+CREATE TABLE IF NOT EXISTS totals (
+    scan INTEGER NOT NULL REFERENCES scans,
+    org INTEGER NOT NULL REFERENCES orgs,
+    "check" TEXT NOT NULL REFERENCES checks,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    skipped INTEGER NOT NULL,
+    PRIMARY KEY (scan, "check", org)
+) WITHOUT ROWID;
+"""
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class Report:
+    "The rows of a query, with their column names."
+
+    columns: tuple[str, ...]
+    rows: list[tuple[Any, ...]]
+
+
+def _rate(passed: int, failed: int) -> float | None:
+    return round(passed / (passed + failed), 4) if passed + failed else None
+
+
+class Warehouse:
+    "The warehouse in the SQLite database at ``path``, created if needed."
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = os.fspath(path)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def _ids(
+        self, table: str, column: str, values: Iterable[str], *, insert: bool = True
+    ) -> dict[str, int]:
+        "The ids of ``values`` in a lookup table, adding any that are new."
+        wanted = set(values)
+        if insert:
+            self.db.executemany(
+                f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)",  # noqa: S608
+                [(v,) for v in wanted],
+            )
+        found: dict[str, int] = {}
+        for value in wanted:
+            (found[value],) = self.db.execute(
+                f"SELECT id FROM {table} WHERE {column} = ?",  # noqa: S608
+                (value,),
+            ).fetchone()
+        return found
+
+    def add_scan(
+        self,
+        reviews: Iterable[Mapping[str, Any]],
+        *,
+        header: Mapping[str, Any] | None = None,
+        scanned_at: str = "",
+        source: str = "",
+    ) -> int:
+        """
+        Adds one scan from review lines in the JSON Lines format (see
+        :func:`sp_repo_review.batch.jsonl.record`), with the check and family
+        metadata from ``header`` if given. Returns the scan id.
+        """
+        with self.db:
+            scan = self.db.execute(
+                "INSERT INTO scans (scanned_at, version, source) VALUES (?, ?, ?)",
+                (
+                    scanned_at or dt.datetime.now(dt.timezone.utc).isoformat(),
+                    (header or {}).get("version", __version__),
+                    source,
+                ),
+            ).lastrowid
+            assert scan is not None
+
+            if header:
+                self.db.executemany(
+                    'INSERT INTO families (id, name, "order") VALUES (?, ?, ?) '
+                    "ON CONFLICT (id) DO UPDATE SET name = excluded.name, "
+                    '"order" = excluded."order"',
+                    [
+                        (key, family.get("name", key), family.get("order", 0))
+                        for key, family in header["families"].items()
+                    ],
+                )
+                self.db.executemany(
+                    "INSERT INTO checks (id, family, description, url) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET "
+                    "family = excluded.family, description = excluded.description, "
+                    "url = excluded.url",
+                    [
+                        (key, check["family"], check["description"], check["url"])
+                        for key, check in header["checks"].items()
+                    ],
+                )
+
+            reviews = list(reviews)
+            orgs = self._ids(
+                "orgs", "name", (PurePath(r["path"]).parent.name for r in reviews)
+            )
+            self.db.executemany(
+                "INSERT OR IGNORE INTO repos (path, org) VALUES (?, ?)",
+                [(r["path"], orgs[PurePath(r["path"]).parent.name]) for r in reviews],
+            )
+            repos = self._ids(
+                "repos", "path", (r["path"] for r in reviews), insert=False
+            )
+            messages = self._ids(
+                "messages",
+                "text",
+                (
+                    c["err_msg"] or c["skip_reason"]
+                    for r in reviews
+                    for c in r.get("checks", ())
+                    if c["err_msg"] or c["skip_reason"]
+                ),
+            )
+            # Checks not in the header, such as from reviews made directly
+            self.db.executemany(
+                "INSERT OR IGNORE INTO families (id, name) VALUES (?, ?)",
+                {
+                    (c["family"], c["family"])
+                    for r in reviews
+                    for c in r.get("checks", ())
+                },
+            )
+            self.db.executemany(
+                "INSERT OR IGNORE INTO checks (id, family) VALUES (?, ?)",
+                {(c["id"], c["family"]) for r in reviews for c in r.get("checks", ())},
+            )
+
+            for review in reviews:
+                row = self.db.execute(
+                    "INSERT INTO reviews (scan, repo, status, duration, error) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        scan,
+                        repos[review["path"]],
+                        review["status"],
+                        review.get("duration", 0.0),
+                        review.get("error", ""),
+                    ),
+                ).lastrowid
+                self.db.executemany(
+                    'INSERT INTO results (review, "check", result, message) '
+                    "VALUES (?, ?, ?, ?)",
+                    [
+                        (
+                            row,
+                            c["id"],
+                            c["result"],
+                            messages.get(c["err_msg"] or c["skip_reason"]),
+                        )
+                        for c in review.get("checks", ())
+                    ],
+                )
+
+            self.db.execute(
+                'INSERT INTO totals (scan, org, "check", passed, failed, skipped) '
+                'SELECT reviews.scan, repos.org, results."check", '
+                "count(results.result = 1 OR NULL), count(results.result = 0 OR NULL), "
+                "count(*) - count(results.result) "
+                "FROM results JOIN reviews ON reviews.id = results.review "
+                "JOIN repos ON repos.id = reviews.repo "
+                'WHERE reviews.scan = ? GROUP BY repos.org, results."check"',
+                (scan,),
+            )
+        return scan
+
+    def add_reviews(
+        self, reviews: Iterable[RepoReview], *, scanned_at: str = "", source: str = ""
+    ) -> int:
+        "Adds one scan of reviews from :mod:`sp_repo_review.batch`."
+        reviews = list(reviews)
+        header: dict[str, Any] = {"version": __version__, "families": {}, "checks": {}}
+        for review in reviews:
+            for key, family in review.families.items():
+                header["families"][key] = {
+                    "name": family.get("name", key),
+                    "order": family.get("order", 0),
+                }
+            for result in review.results:
+                header["checks"][result.name] = {
+                    "family": result.family,
+                    "description": result.description,
+                    "url": result.url,
+                }
+        return self.add_scan(
+            [record(r) for r in reviews],
+            header=header,
+            scanned_at=scanned_at,
+            source=source,
+        )
+
+    def import_jsonl(
+        self, path: str | os.PathLike[str], *, scanned_at: str = ""
+    ) -> int:
+        """
+        Adds the output of ``sp-repo-review-batch --format jsonl`` as a scan,
+        dated by the file's modification time unless ``scanned_at`` is given.
+        """
+        header = None
+        reviews = []
+        with open(path, encoding="utf-8") as f:  # noqa: PTH123
+            for line in f:
+                if not line.strip():
+                    continue
+                value = json.loads(line)
+                if value.get("type") == "header":
+                    header = value
+                elif value.get("type") == "review":
+                    reviews.append(value)
+        if not scanned_at:
+            mtime = os.stat(path).st_mtime  # noqa: PTH116
+            scanned_at = dt.datetime.fromtimestamp(mtime, dt.timezone.utc).isoformat()
+        return self.add_scan(
+            reviews, header=header, scanned_at=scanned_at, source=os.fspath(path)
+        )
+
+    def latest_scan(self) -> int | None:
+        (scan,) = self.db.execute("SELECT max(id) FROM scans").fetchone()
+        return scan  # type: ignore[no-any-return]
+
+    def query(self, sql: str, parameters: Sequence[Any] = ()) -> Report:
+        "Runs any query."
+        cursor = self.db.execute(sql, parameters)
+        columns = tuple(d[0] for d in cursor.description or ())
+        return Report(columns=columns, rows=cursor.fetchall())
+
+    def scans(self) -> Report:
+        "Every scan, with its number of repositories."
+        return self.query(
+            "SELECT scans.id AS scan, scanned_at, version, source, "
+            "(SELECT count(*) FROM reviews WHERE reviews.scan = scans.id) AS repos "
+            "FROM scans ORDER BY scans.id"
+        )
+
+    def _scan(self, scan: int | None) -> int:
+        if scan is None:
+            scan = self.latest_scan()
+        if scan is None:
+            msg = "The warehouse has no scans"
+            raise LookupError(msg)
+        return scan
+
+    def _with_rate(self, report: Report) -> Report:
+        "Adds a pass rate from the passed and failed columns."
+        passed = report.columns.index("passed")
+        failed = report.columns.index("failed")
+        return Report(
+            columns=(*report.columns, "pass_rate"),
+            rows=[(*row, _rate(row[passed], row[failed])) for row in report.rows],
+        )
+
+    def families(self, *, scan: int | None = None) -> Report:
+        "Passed, failed, and skipped results of each family in a scan (the latest)."
+        return self._with_rate(
+            self.query(
+                "SELECT checks.family, families.name, sum(passed) AS passed, "
+                "sum(failed) AS failed, sum(skipped) AS skipped "
+                'FROM totals JOIN checks ON checks.id = totals."check" '
+                "JOIN families ON families.id = checks.family "
+                'WHERE scan = ? GROUP BY checks.family ORDER BY families."order", '
+                "checks.family",
+                (self._scan(scan),),
+            )
+        )
+
+    def checks(self, *, scan: int | None = None, family: str = "") -> Report:
+        "Passed, failed, and skipped results of each check in a scan (the latest)."
+        return self._with_rate(
+            self.query(
+                'SELECT totals."check", checks.family, sum(passed) AS passed, '
+                "sum(failed) AS failed, sum(skipped) AS skipped, checks.description "
+                'FROM totals JOIN checks ON checks.id = totals."check" '
+                "JOIN families ON families.id = checks.family "
+                "WHERE scan = ? AND (? = '' OR checks.family = ?) "
+                'GROUP BY totals."check" ORDER BY families."order", checks.family, '
+                'totals."check"',
+                (self._scan(scan), family, family),
+            )
+        )
+
+    def trend(self, check: str, *, by_org: bool = False) -> Report:
+        "Results of ``check`` in every scan, optionally by organization."
+        org = "orgs.name" if by_org else "''"
+        return self._with_rate(
+            self.query(
+                f"SELECT scans.id AS scan, scans.scanned_at, {org} AS org, "  # noqa: S608
+                "sum(passed) AS passed, sum(failed) AS failed, sum(skipped) AS skipped "
+                "FROM totals JOIN scans ON scans.id = totals.scan "
+                "JOIN orgs ON orgs.id = totals.org "
+                'WHERE totals."check" = ? GROUP BY scans.id, 3 ORDER BY scans.id, 3',
+                (check,),
+            )
+        )
+
+    def repos(
+        self,
+        *,
+        failing: Iterable[str] = (),
+        passing: Iterable[str] = (),
+        skipped: Iterable[str] = (),
+        scan: int | None = None,
+    ) -> Report:
+        """
+        The repositories in a scan (the latest) that fail, pass, and skip all
+        the given checks, with the message of the first failing one.
+        """
+        conditions = [
+            *(("IS 0", c) for c in failing),
+            *(("IS 1", c) for c in passing),
+            *(("IS NULL", c) for c in skipped),
+        ]
+        if not conditions:
+            msg = "Give at least one check"
+            raise ValueError(msg)
+        joins = "".join(
+            f' JOIN results AS r{n} ON r{n}.review = r0.review AND r{n}."check" = ? '
+            f"AND r{n}.result {test}"
+            for n, (test, _) in enumerate(conditions[1:], 1)
+        )
+        test, first = conditions[0]
+        return self.query(
+            "SELECT repos.path, orgs.name AS org, messages.text AS message "  # noqa: S608
+            f"FROM results AS r0{joins} "
+            "JOIN reviews ON reviews.id = r0.review "
+            "JOIN repos ON repos.id = reviews.repo "
+            "JOIN orgs ON orgs.id = repos.org "
+            "LEFT JOIN messages ON messages.id = r0.message "
+            f'WHERE r0."check" = ? AND r0.result {test} AND reviews.scan = ? '
+            # A scan's reviews are added together, so their ids are a range
+            "AND r0.review BETWEEN (SELECT min(id) FROM reviews WHERE scan = ?) "
+            "AND (SELECT max(id) FROM reviews WHERE scan = ?) "
+            "ORDER BY repos.path",
+            [*(c for _, c in conditions[1:]), first, *[self._scan(scan)] * 3],
+        )
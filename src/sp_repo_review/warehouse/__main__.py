@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+__lazy_modules__ = [
+    "argparse",
+    "csv",
+    "rich",
+    "rich.console",
+    "rich.table",
+    "sqlite3",
+    "sys",
+]
+
+import argparse
+import csv
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import rich.console
+import rich.table
+
+from . import Report, Warehouse
+
+
+def _split(value: str) -> list[str]:
+    return [x.strip() for x in value.split(",") if x.strip()]
+
+
+def _format(column: str, value: object) -> str:
+    match value:
+        case None:
+            return ""
+        case float() if column == "pass_rate":
+            return f"{value:.1%}"
+        case _:
+            return str(value)
+
+
+def _show(report: Report, *, title: str, as_csv: bool, seconds: float) -> None:
+    if as_csv:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(report.columns)
+        writer.writerows(report.rows)
+        return
+
+    table = rich.table.Table(
+        title=title, caption=f"{len(report.rows)} rows in {seconds * 1000:.1f} ms"
+    )
+    for column in report.columns:
+        table.add_column(column)
+    for row in report.rows:
+        table.add_row(*map(_format, report.columns, row))
+    rich.console.Console().print(table)
+
+
+def main(args: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Store batch review results in SQLite and report on them"
+    )
+    parser.add_argument("database", type=Path, help="SQLite file (created if needed)")
+    parser.add_argument(
+        "--csv", action="store_true", help="Write CSV instead of a table"
+    )
+    parser.add_argument(
+        "--scan", type=int, default=None, help="Scan to report on (default: the latest)"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser(
+        "import", help="Add sp-repo-review-batch --format jsonl output as a scan"
+    )
+    add.add_argument(
+        "files", nargs="+", type=Path, help="JSON Lines files, one per scan"
+    )
+    add.add_argument(
+        "--scanned-at",
+        default="",
+        help="ISO time of the scan (default: the file's modification time)",
+    )
+
+    commands.add_parser("scans", help="List the scans")
+    commands.add_parser("families", help="Results by family")
+
+    checks = commands.add_parser("checks", help="Results by check")
+    checks.add_argument("--family", default="", help="Only this family")
+
+    trend = commands.add_parser("trend", help="Results of a check in every scan")
+    trend.add_argument("check", help="Check ID")
+    trend.add_argument("--by-org", action="store_true", help="Split by organization")
+
+    repos = commands.add_parser(
+        "repos", help="Repositories failing, passing, or skipping checks"
+    )
+    repos.add_argument("--failing", default="", help="Checks that must fail")
+    repos.add_argument("--passing", default="", help="Checks that must pass")
+    repos.add_argument("--skipped", default="", help="Checks that must be skipped")
+
+    sql = commands.add_parser("sql", help="Run a query")
+    sql.add_argument("query", help="SQL to run")
+
+    parsed = parser.parse_args(args)
+
+    warehouse = Warehouse(parsed.database)
+    try:
+        start = time.perf_counter()
+        match parsed.command:
+            case "import":
+                for path in parsed.files:
+                    warehouse.import_jsonl(path, scanned_at=parsed.scanned_at)
+                report, title = warehouse.scans(), "Scans"
+            case "scans":
+                report, title = warehouse.scans(), "Scans"
+            case "families":
+                report, title = warehouse.families(scan=parsed.scan), "Families"
+            case "checks":
+                report = warehouse.checks(scan=parsed.scan, family=parsed.family)
+                title = "Checks"
+            case "trend":
+                report = warehouse.trend(parsed.check, by_org=parsed.by_org)
+                title = f"{parsed.check} over time"
+            case "repos":
+                try:
+                    report = warehouse.repos(
+                        failing=_split(parsed.failing),
+                        passing=_split(parsed.passing),
+                        skipped=_split(parsed.skipped),
+                        scan=parsed.scan,
+                    )
+                except ValueError as err:
+                    parser.error(str(err))
+                title = "Repositories"
+            case _:
+                report, title = warehouse.query(parsed.query), ""
+        seconds = time.perf_counter() - start
+    except (LookupError, sqlite3.Error) as err:
+        parser.error(str(err))
+    finally:
+        warehouse.close()
+
+    _show(report, title=title, as_csv=parsed.csv, seconds=seconds)
+
+
+if __name__ == "__main__":
+    main()
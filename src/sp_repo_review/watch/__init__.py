@@ -0,0 +1,189 @@
+"""
+Review a repository again whenever its files change.
+
+Only the files the fixtures declare (see :mod:`sp_repo_review.files`) can
+change a result, so those are all that is watched: :func:`snapshot` stats the
+declared files and lists the declared directories, a few dozen system calls,
+cheap enough to poll several times a second. When a snapshot differs,
+:func:`watch` hands the difference to :func:`sp_repo_review.incremental.review`,
+so only the checks that can see the change run again, and reports the
+results that are different from before.
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = ["time"]
+
+import time
+import typing
+from typing import TYPE_CHECKING
+
+from repo_review.processor import as_simple_dict
+
+from .. import files
+from ..incremental import Changes, review
+from ..processor import Registry, process
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from collections.abc import Set as AbstractSet
+    from pathlib import Path
+
+    from repo_review.families import Family
+    from repo_review.processor import Result
+
+__all__ = ["Snapshot", "WatchUpdate", "diff", "snapshot", "watch"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+#: ``/`` separated paths relative to the repository root, with the
+#: modification time and size for files that are read, or None for entries
+#: that are only listed.
+Snapshot = dict[str, tuple[int, int] | None]
+
+
+def _expand(base: Path, pattern: str) -> Iterator[Path]:
+    if not pattern:
+        yield base
+    else:
+        yield from base.glob(pattern)
+
+
+def snapshot(root: Path, subdir: str = "") -> Snapshot:
+    "The state of every file and directory entry a fixture declares."
+    declared = files.manifest().values()
+    package = root.joinpath(subdir) if subdir else root
+    result: Snapshot = {}
+    for base, dirs in (
+        (root, {p for d in declared for p in d.root_dirs}),
+        (package, {p for d in declared for p in d.package_dirs}),
+    ):
+        for pattern in dirs:
+            for directory in _expand(base, pattern):
+                if directory.is_dir():
+                    for entry in directory.iterdir():
+                        result[entry.relative_to(root).as_posix()] = None
+    for base, reads in (
+        (root, {p for d in declared for p in d.root}),
+        (package, {p for d in declared for p in d.package}),
+    ):
+        for pattern in reads:
+            for path in _expand(base, pattern):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                result[path.relative_to(root).as_posix()] = (
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                )
+    return result
+
+
+def diff(old: Snapshot, new: Snapshot) -> Changes:
+    "The changes between two snapshots."
+    return Changes(
+        modified=frozenset(
+            path for path in old.keys() & new.keys() if old[path] != new[path]
+        ),
+        added_or_removed=frozenset(old.keys() ^ new.keys()),
+    )
+
+
+class WatchUpdate(typing.NamedTuple):
+    families: dict[str, Family]
+    results: list[Result]
+
+    #: The results that differ from the last update (all of them at first, or
+    #: if the checks reported changed).
+    changed: list[Result]
+
+    #: The checks that were run, rather than taken from the last update.
+    rerun: frozenset[str]
+
+    #: Seconds taken by the review.
+    duration: float
+
+    #: Why the review failed, such as a half-written file that doesn't parse;
+    #: the families and results are then the last ones that succeeded.
+    error: str | None = None
+
+
+def watch(
+    root: Path,
+    *,
+    select: AbstractSet[str] = frozenset(),
+    ignore: AbstractSet[str] = frozenset(),
+    extend_select: AbstractSet[str] = frozenset(),
+    extend_ignore: AbstractSet[str] = frozenset(),
+    subdir: str = "",
+    interval: float = 0.2,
+    registry: Registry | None = None,
+) -> Iterator[WatchUpdate]:
+    """
+    Yields a full review of ``root``, then an incremental one each time the
+    files the fixtures read change, checking every ``interval`` seconds. A
+    review that fails is reported in :attr:`WatchUpdate.error` and tried again
+    at the next change. Runs until the caller stops iterating.
+    """
+    if registry is None:
+        registry = Registry.load()
+    # The snapshot last reviewed successfully, and the latest one seen
+    state = seen = snapshot(root, subdir)
+    families: dict[str, Family] = {}
+    results: list[Result] | None = None
+
+    while True:
+        start = time.perf_counter()
+        try:
+            if results is None:
+                families, new_results = process(
+                    root,
+                    select=select,
+                    ignore=ignore,
+                    extend_select=extend_select,
+                    extend_ignore=extend_ignore,
+                    subdir=subdir,
+                    registry=registry,
+                )
+                rerun = frozenset(r.name for r in new_results)
+            else:
+                families, new_results, rerun = review(
+                    root,
+                    as_simple_dict(results),
+                    diff(state, seen),
+                    select=select,
+                    ignore=ignore,
+                    extend_select=extend_select,
+                    extend_ignore=extend_ignore,
+                    subdir=subdir,
+                    registry=registry,
+                )
+        except Exception as err:  # noqa: BLE001
+            yield WatchUpdate(
+                families,
+                results or [],
+                [],
+                frozenset(),
+                time.perf_counter() - start,
+                error=f"{type(err).__name__}: {err}",
+            )
+        else:
+            duration = time.perf_counter() - start
+            changed = new_results
+            if results is not None:
+                previous = as_simple_dict(results)
+                current = as_simple_dict(new_results)
+                if current.keys() == previous.keys():
+                    changed = [
+                        r for r in new_results if current[r.name] != previous[r.name]
+                    ]
+            results, state = new_results, seen
+            yield WatchUpdate(families, results, changed, rerun, duration)
+
+        while (new_state := snapshot(root, subdir)) == seen:
+            time.sleep(interval)
+        seen = new_state
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+__lazy_modules__ = [
+    "argparse",
+    "repo_review.__main__",
+    "rich",
+    "rich.console",
+    "rich.markup",
+]
+
+import argparse
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import rich.console
+import rich.markup
+from repo_review.__main__ import rich_printer
+
+from ..batch import RepoReview
+from ..cache import MemoryCache
+from . import watch
+
+if TYPE_CHECKING:
+    from . import WatchUpdate
+
+
+def _split(value: str) -> frozenset[str]:
+    return frozenset(x.strip() for x in value.split(",") if x.strip())
+
+
+def _show(console: rich.console.Console, update: WatchUpdate, *, first: bool) -> None:
+    stamp = time.strftime("%H:%M:%S")
+    if update.error:
+        console.print(
+            f"[dim]{stamp}[/dim] [bold red]error[/bold red]: "
+            f"{rich.markup.escape(update.error)}. [dim]Watching for changes...[/dim]"
+        )
+        return
+
+    status = RepoReview.from_results("", update.families, update.results).status
+    if first or update.changed:
+        shown = {r.family for r in update.changed}
+        families = (
+            update.families
+            if first
+            else {
+                # Just the rows, not the family descriptions again
+                k: {"name": v.get("name", k), "order": v.get("order", 0)}
+                for k, v in update.families.items()
+                if k in shown
+            }
+        )
+        rich_printer(families, update.changed, status=status)  # type: ignore[arg-type]
+
+    color = {"passed": "green", "skips": "yellow"}.get(status, "red")
+    console.print(
+        f"[dim]{stamp}[/dim] [bold {color}]{status}[/bold {color}]: "
+        f"ran {len(update.rerun)} of {len(update.results)} checks, "
+        f"{len(update.changed)} changed, in {update.duration * 1000:.0f} ms. "
+        "[dim]Watching for changes...[/dim]"
+    )
+
+
+def main(args: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Review a repository, then rerun the affected checks whenever its files change"
+    )
+    parser.add_argument(
+        "path", nargs="?", type=Path, default=Path(), help="Repository to review"
+    )
+    parser.add_argument("--select", default="", help="Checks to run")
+    parser.add_argument("--ignore", default="", help="Checks to skip")
+    parser.add_argument("--extend-select", default="", help="Checks to run in addition")
+    parser.add_argument(
+        "--extend-ignore", default="", help="Checks to skip in addition"
+    )
+    parser.add_argument(
+        "--package-dir", default="", help="Path to the package in the repository"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.2,
+        help="Seconds between looking for changes (default: 0.2)",
+    )
+    parsed = parser.parse_args(args)
+
+    MemoryCache.enable()
+    console = rich.console.Console()
+    updates = watch(
+        parsed.path,
+        select=_split(parsed.select),
+        ignore=_split(parsed.ignore),
+        extend_select=_split(parsed.extend_select),
+        extend_ignore=_split(parsed.extend_ignore),
+        subdir=parsed.package_dir,
+        interval=parsed.interval,
+    )
+    try:
+        first = True
+        for update in updates:
+            _show(console, update, first=first)
+            first = first and update.error is not None
+    except KeyboardInterrupt:
+        console.print()
+
+
+if __name__ == "__main__":
+    main()
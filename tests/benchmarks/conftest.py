@@ -0,0 +1,126 @@
+"""
+Baselines for the benchmarks. Each timing is recorded with the ``bench``
+fixture; ``--bench-save`` writes them to the baseline file, and later runs
+fail any timing that is slower than its baseline by more than the threshold.
+Baselines depend on the machine, so they are not committed; save one from
+the main branch, then run the benchmarks on a change to compare.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+DEFAULT_BASELINE = Path(__file__).parents[2] / ".benchmarks" / "baseline.json"
+
+#: Differences smaller than this are noise, whatever the ratio.
+MIN_REGRESSION = 0.002
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--bench-baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help="Baseline JSON file (default: .benchmarks/baseline.json)",
+    )
+    group.addoption(
+        "--bench-save",
+        action="store_true",
+        help="Save the timings as the new baseline instead of comparing",
+    )
+    group.addoption(
+        "--bench-threshold",
+        type=float,
+        default=0.25,
+        help="Fail timings this fraction slower than the baseline (default: 0.25)",
+    )
+    group.addoption(
+        "--bench-repeat",
+        type=int,
+        default=5,
+        help="Best of this many runs for each timing (default: 5)",
+    )
+
+
+class Bench:
+    "Records timings and compares them with the baseline."
+
+    def __init__(self, config: pytest.Config) -> None:
+        self.path: Path = config.getoption("--bench-baseline")
+        self.save: bool = config.getoption("--bench-save")
+        self.threshold: float = config.getoption("--bench-threshold")
+        self.repeat: int = config.getoption("--bench-repeat")
+        self.timings: dict[str, float] = {}
+        self.baseline: dict[str, float] = {}
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                self.baseline = json.load(f)["timings"]
+
+    def record(self, name: str, seconds: float) -> None:
+        "Records a timing, failing if it regressed past the threshold."
+        self.timings[name] = seconds
+        base = self.baseline.get(name)
+        if self.save or base is None:
+            return
+        if seconds > base * (1 + self.threshold) and seconds - base > MIN_REGRESSION:
+            pytest.fail(
+                f"{name} regressed: {seconds * 1000:.1f} ms, baseline "
+                f"{base * 1000:.1f} ms (+{seconds / base - 1:.0%})"
+            )
+
+    def report(self) -> list[str]:
+        lines = []
+        for name, seconds in self.timings.items():
+            base = self.baseline.get(name)
+            change = f" ({seconds / base - 1:+.0%})" if base else ""
+            lines.append(f"{name}: {seconds * 1000:.2f} ms{change}")
+        return lines
+
+    def write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        timings = {**self.baseline, **self.timings}
+        with self.path.open("w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "timings": dict(sorted(timings.items())),
+                },
+                f,
+                indent=2,
+            )
+            f.write("\n")
+
+
+BENCH_KEY = pytest.StashKey[Bench]()
+
+
+@pytest.fixture(scope="session")
+def bench(pytestconfig: pytest.Config) -> Iterator[Bench]:
+    recorder = Bench(pytestconfig)
+    pytestconfig.stash[BENCH_KEY] = recorder
+    yield recorder
+    if recorder.save:
+        recorder.write()
+
+
+def pytest_terminal_summary(
+    terminalreporter: pytest.TerminalReporter, config: pytest.Config
+) -> None:
+    recorder = config.stash.get(BENCH_KEY, None)
+    if recorder is None or not recorder.timings:
+        return
+    terminalreporter.section("benchmarks")
+    for line in recorder.report():
+        terminalreporter.write_line(line)
+    if recorder.save:
+        terminalreporter.write_line(f"Saved baseline to {recorder.path}")
@@ -0,0 +1,158 @@
+"""
+Benchmarks for full reviews of synthetic repositories of growing size. Each
+records the best full :func:`~sp_repo_review.processor.process` time, and the
+time of each fixture (including its parsing) from a profiled run, against the
+baseline (see ``conftest.py``).
+"""
+
+from __future__ import annotations
+
+import gc
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+from test_workflows import make_workflows
+
+from sp_repo_review.cache import CACHE_ENV
+from sp_repo_review.checks.github import WORKERS_ENV
+from sp_repo_review.processor import Registry, process
+from sp_repo_review.profile import Profiler
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from conftest import Bench
+
+PYPROJECT = """\
+[build-system]
+requires = ["hatchling"]
+build-backend = "hatchling.build"
+
+[project]
+name = "example"
+version = "0.1.0"
+requires-python = ">=3.10"
+dependencies = [
+{dependencies}]
+
+[project.optional-dependencies]
+{extras}
+
+[tool.pytest.ini_options]
+minversion = "6.0"
+addopts = ["-ra", "--strict-config", "--strict-markers"]
+xfail_strict = true
+filterwarnings = ["error"]
+log_level = "INFO"
+testpaths = ["tests"]
+
+[tool.mypy]
+strict = true
+{mypy}
+
+[tool.ruff.lint]
+extend-select = ["B", "I", "ARC", "UP", "RUF", "PT", "SIM"]
+
+[tool.ruff.lint.per-file-ignores]
+{ignores}
+"""
+
+
+def make_precommit(root: Path, hooks: int) -> None:
+    repos = "".join(
+        f"  - repo: https://github.com/example/hook{n}\n"
+        f"    rev: v1.0.{n}\n"
+        f"    hooks:\n"
+        f"      - id: hook{n}\n"
+        f'        args: ["--fix", "--config=setup.cfg"]\n'
+        for n in range(hooks)
+    )
+    root.joinpath(".pre-commit-config.yaml").write_text(
+        f"ci:\n  autoupdate_commit_msg: 'chore: update'\n\nrepos:\n{repos}",
+        encoding="utf-8",
+    )
+
+
+def make_pyproject(root: Path, entries: int) -> None:
+    text = PYPROJECT.format(
+        dependencies="".join(f'  "package{n}>=1.{n}",\n' for n in range(entries)),
+        extras="".join(f'extra{n} = ["package{n}[all]"]\n' for n in range(entries)),
+        mypy="".join(
+            f'[[tool.mypy.overrides]]\nmodule = "package{n}.*"\n'
+            "ignore_missing_imports = true\n"
+            for n in range(entries)
+        ),
+        ignores="".join(f'"src/module{n}.py" = ["E501"]\n' for n in range(entries)),
+    )
+    root.joinpath("pyproject.toml").write_text(text, encoding="utf-8")
+
+
+@pytest.fixture(scope="module")
+def registry() -> Registry:
+    return Registry.load()
+
+
+@pytest.fixture(autouse=True)
+def no_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    "Every run parses everything, serially."
+    monkeypatch.delenv(CACHE_ENV, raising=False)
+    monkeypatch.delenv(WORKERS_ENV, raising=False)
+
+
+@pytest.fixture(autouse=True)
+def no_gc() -> Iterator[None]:
+    "Like timeit, keep garbage collection out of the timings."
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+
+
+def run(bench: Bench, name: str, root: Path, registry: Registry) -> None:
+    "Records the best time for a full review, then for each fixture."
+    best = float("inf")
+    for _ in range(bench.repeat):
+        start = time.perf_counter()
+        process(root, registry=registry)
+        best = min(best, time.perf_counter() - start)
+    bench.record(f"{name}/process", best)
+
+    fixtures: dict[str, float] = {}
+    for _ in range(bench.repeat):
+        profiler = Profiler()
+        process(root, registry=registry, profiler=profiler)
+        totals: dict[str, float] = {}
+        for event in profiler.events:
+            if event.category in {"fixture", "parse"}:
+                totals[event.name] = totals.get(event.name, 0.0) + event.duration
+        for fixture, seconds in totals.items():
+            fixtures[fixture] = min(fixtures.get(fixture, seconds), seconds)
+    # Fixtures with nothing to read are too fast to time; a regression in them
+    # still shows in the full review
+    for fixture, seconds in sorted(fixtures.items()):
+        if seconds >= 1e-4:
+            bench.record(f"{name}/fixture/{fixture}", seconds)
+
+
+@pytest.mark.parametrize("count", [1, 10, 100, 1000])
+def test_workflows(tmp_path: Path, count: int, bench: Bench, registry: Registry):
+    make_pyproject(tmp_path, 5)
+    make_workflows(tmp_path, count, jobs=2)
+    run(bench, f"workflows-{count}", tmp_path, registry)
+
+
+@pytest.mark.parametrize("hooks", [5, 50, 500])
+def test_precommit(tmp_path: Path, hooks: int, bench: Bench, registry: Registry):
+    make_pyproject(tmp_path, 5)
+    make_precommit(tmp_path, hooks)
+    run(bench, f"precommit-{hooks}", tmp_path, registry)
+
+
+@pytest.mark.parametrize("entries", [10, 100, 1000])
+def test_pyproject(tmp_path: Path, entries: int, bench: Bench, registry: Registry):
+    make_pyproject(tmp_path, entries)
+    run(bench, f"pyproject-{entries}", tmp_path, registry)
@@ -0,0 +1,65 @@
+"""
+Benchmark for narrow selections: only the fixtures the selected checks read
+should be parsed.
+"""
+
+import time
+from pathlib import Path
+
+import pytest
+from repo_review.processor import process as repo_review_process
+from test_workflows import make_workflows
+
+from sp_repo_review.processor import process
+
+NOXFILE = """\
+import nox
+
+
+@nox.session
+def tests(session: nox.Session) -> None:
+    session.install(".[test]")
+    session.run("pytest")
+"""
+
+
+def make_repo(root: Path) -> None:
+    make_workflows(root, 100)
+    root.joinpath("pyproject.toml").write_text(
+        '[project]\nname = "example"\n\n[tool.ruff.lint]\nselect = ["ALL"]\n',
+        encoding="utf-8",
+    )
+    hooks = "".join(
+        f"  - repo: https://github.com/example/hook{n}\n"
+        f"    rev: v1.0.{n}\n"
+        f"    hooks:\n      - id: hook{n}\n"
+        for n in range(200)
+    )
+    root.joinpath(".pre-commit-config.yaml").write_text(
+        f"repos:\n{hooks}", encoding="utf-8"
+    )
+    root.joinpath(".readthedocs.yaml").write_text("version: 2\n", encoding="utf-8")
+    root.joinpath("noxfile.py").write_text(NOXFILE * 50, encoding="utf-8")
+
+
+@pytest.mark.parametrize("select", ["PP", "PY", "GH"])
+def test_narrow_selection(
+    tmp_path: Path, select: str, capsys: pytest.CaptureFixture[str]
+) -> None:
+    make_repo(tmp_path)
+
+    start = time.perf_counter()
+    expected = repo_review_process(tmp_path, select={select})
+    everything = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = process(tmp_path, select={select})
+    narrow = time.perf_counter() - start
+
+    assert result == expected
+
+    with capsys.disabled():
+        print(
+            f"\n--select {select}: all checks {everything:.3f}s, "
+            f"needed checks {narrow:.3f}s ({everything / narrow:.1f}x)"
+        )
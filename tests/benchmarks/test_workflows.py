@@ -0,0 +1,93 @@
+"""
+Benchmarks for sp-repo-review fixtures. These are not collected by default;
+run with ``nox -s rr_bench`` or ``pytest tests/benchmarks -s``.
+"""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from sp_repo_review._compat import yaml
+from sp_repo_review.checks.github import WORKERS_ENV, workflows
+from sp_repo_review.lazy import force
+
+WORKFLOW = """\
+name: CI {n}
+
+on:
+  workflow_dispatch:
+  pull_request:
+  push:
+    branches:
+      - main
+
+concurrency:
+  group: ${{{{ github.workflow }}}}-${{{{ github.ref }}}}
+  cancel-in-progress: true
+
+jobs:
+"""
+
+JOB = """\
+  job{j}:
+    name: Job {j} on ${{{{ matrix.os }}}}
+    runs-on: ${{{{ matrix.os }}}}
+    strategy:
+      fail-fast: false
+      matrix:
+        os: [ubuntu-latest, macos-latest, windows-latest]
+        python-version: ["3.10", "3.11", "3.12", "3.13", "3.14"]
+    steps:
+      - uses: actions/checkout@v5
+        with:
+          fetch-depth: 0
+          persist-credentials: false
+      - uses: astral-sh/setup-uv@v7
+        with:
+          python-version: ${{{{ matrix.python-version }}}}
+      - name: Test
+        run: uvx nox -s tests-${{{{ matrix.python-version }}}}
+      - uses: actions/upload-artifact@v5
+        with:
+          name: cov-{j}-${{{{ strategy.job-index }}}}
+          path: coverage.xml
+"""
+
+
+def make_workflows(root: Path, count: int, jobs: int = 10) -> None:
+    workflows_dir = root / ".github" / "workflows"
+    workflows_dir.mkdir(parents=True)
+    for n in range(count):
+        text = WORKFLOW.format(n=n) + "".join(JOB.format(j=j) for j in range(jobs))
+        workflows_dir.joinpath(f"ci{n:03}.yml").write_text(text, encoding="utf-8")
+
+
+def timed(root: Path) -> tuple[float, dict[str, object]]:
+    start = time.perf_counter()
+    result = force(workflows(root))
+    return time.perf_counter() - start, result
+
+
+def test_workflows_parallel(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    make_workflows(tmp_path, 200)
+
+    monkeypatch.setenv(WORKERS_ENV, "1")
+    serial_time, serial = timed(tmp_path)
+
+    workers = os.cpu_count() or 1
+    monkeypatch.setenv(WORKERS_ENV, str(max(workers, 2)))
+    parallel_time, parallel = timed(tmp_path)
+
+    assert parallel == serial
+    assert list(parallel) == list(serial)
+
+    with capsys.disabled():
+        print(
+            f"\n200 workflows: serial {serial_time:.3f}s, "
+            f"{max(workers, 2)} workers {parallel_time:.3f}s "
+            f"({serial_time / parallel_time:.2f}x, {yaml.BACKEND} parser)"
+        )
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from sp_repo_review.batch import review_many
+from sp_repo_review.batch.__main__ import main as batch_main
+
+np = pytest.importorskip("numpy")
+
+from sp_repo_review.analytics import (  # noqa: E402
+    FAILED,
+    MISSING,
+    PASSED,
+    SKIPPED,
+    ResultMatrix,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def line(path: str, **results: bool | None) -> dict[str, Any]:
+    return {
+        "type": "review",
+        "path": path,
+        "checks": [
+            {"id": name, "family": name[0], "result": result}
+            for name, result in results.items()
+        ],
+    }
+
+
+@pytest.fixture
+def matrix() -> ResultMatrix:
+    return ResultMatrix.from_records(
+        [
+            line("r0", A1=True, A2=True, B1=True),
+            line("r1", A1=False, A2=False, B1=True),
+            line("r2", A1=False, A2=False, B1=None),
+            line("r3", A1=True, A2=False),
+            {"type": "review", "path": "broken", "error": "boom"},
+        ],
+        header={"checks": {"B1": {"family": "B"}, "C1": {"family": "C"}}},
+    )
+
+
+def test_from_records(matrix: ResultMatrix):
+    assert matrix.checks == ("B1", "C1", "A1", "A2")
+    assert matrix.families == ("B", "C", "A", "A")
+    assert matrix.repos == ("r0", "r1", "r2", "r3", "broken")
+    assert matrix.states.dtype == np.int8
+    assert matrix.states[:, 0].tolist() == [PASSED, PASSED, SKIPPED, MISSING, MISSING]
+    assert matrix.states[:, 3].tolist() == [PASSED, FAILED, FAILED, FAILED, MISSING]
+
+
+def test_summaries(matrix: ResultMatrix):
+    assert matrix.counts().tolist() == [[2, 0, 1], [0, 0, 0], [2, 2, 0], [1, 3, 0]]
+    assert matrix.pass_rates() == {"B1": 1.0, "A1": 0.5, "A2": 0.25}
+    assert matrix.family_scores() == {"A": 3 / 8, "B": 1.0}
+
+    assert matrix.ranking() == [("r0", 1.0), ("r3", 0.5), ("r1", 1 / 3), ("r2", 0.0)]
+    assert matrix.ranking(worst=True, top=2) == [("r2", 0.0), ("r1", 1 / 3)]
+    assert matrix.ranking(family="B") == [("r0", 1.0), ("r1", 1.0)]
+
+    ((first, second, both, phi),) = matrix.co_failures()
+    assert (first, second, both) == ("A1", "A2", 2)
+    assert phi == pytest.approx(np.corrcoef([0, 1, 1, 0, 0], [0, 1, 1, 1, 0])[0, 1])
+
+
+def test_save_load(matrix: ResultMatrix, tmp_path: Path):
+    matrix.save(tmp_path / "scan.npz")
+    loaded = ResultMatrix.load(tmp_path / "scan.npz")
+    assert loaded.repos == matrix.repos
+    assert loaded.checks == matrix.checks
+    assert loaded.families == matrix.families
+    assert np.array_equal(loaded.states, matrix.states)
+
+    empty = ResultMatrix.from_records([])
+    empty.save(tmp_path / "empty.npz")
+    assert ResultMatrix.load(tmp_path / "empty.npz").states.shape == (0, 0)
+
+
+def test_from_batch(tmp_path: Path):
+    paths = []
+    for n in range(3):
+        path = tmp_path / f"repo{n}"
+        path.mkdir()
+        path.joinpath("pyproject.toml").write_text(
+            f"[project]\nname = 'repo{n}'\n", encoding="utf-8"
+        )
+        if n:
+            path.joinpath("noxfile.py").write_text("import nox\n", encoding="utf-8")
+        paths.append(path)
+
+    output = tmp_path / "scan.jsonl"
+    with pytest.raises(SystemExit):
+        batch_main([*map(str, paths), "-j1", "--format=jsonl", f"-o{output}"])
+
+    from_file = ResultMatrix.from_jsonl(output)
+    from_reviews = ResultMatrix.from_reviews(review_many(paths, workers=1))
+    assert from_file.pass_rates()["PY007"] == pytest.approx(2 / 3)
+    assert from_reviews.pass_rates() == from_file.pass_rates()
+    assert from_file.ranking()[-1][0] == str(paths[0])
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import copy
+import tarfile
+import zipfile
+from typing import TYPE_CHECKING
+
+import pytest
+from repo_review.processor import as_simple_dict
+
+from sp_repo_review.archivepath import ArchiveFiles, is_archive, open_archive
+from sp_repo_review.batch import review
+from sp_repo_review.cache import MAX_FILE_SIZE_ENV, FileTooLarge
+from sp_repo_review.processor import process
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+FILES = {
+    "pyproject.toml": b"[project]\nname = 'x'\n\n[tool.pytest.ini_options]\nminversion = '6'\n",
+    "README.md": b"# x\n",
+    "src/x/__init__.py": b"",
+    ".github/workflows/ci.yml": b"on: push\n",
+    "data/large.bin": bytes(100_000),
+}
+
+
+def make_tree(path: Path) -> Path:
+    for name, content in FILES.items():
+        file = path / name
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_bytes(content)
+    return path
+
+
+def make_archive(path: Path, name: str, *, prefix: str = "x-1.0/") -> Path:
+    archive = path / name
+    if name.endswith(".zip"):
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as f:
+            for member, content in FILES.items():
+                f.writestr(f"{prefix}{member}", content)
+    else:
+        tree = make_tree(path / "tree")
+        with tarfile.open(archive, "w:gz") as f:
+            for member in sorted(FILES):
+                f.add(tree / member, arcname=f"{prefix}{member}")
+    return archive
+
+
+@pytest.mark.parametrize("name", ["x-1.0.tar.gz", "x-1.0.zip"])
+def test_index(tmp_path: Path, name: str):
+    files = ArchiveFiles(make_archive(tmp_path, name))
+    try:
+        assert files.keys() == FILES.keys()
+        assert files.read == []
+        assert files["README.md"] == b"# x\n"
+        assert files.read == ["README.md"]
+    finally:
+        files.close()
+
+
+@pytest.mark.parametrize("name", ["x-1.0.tar.gz", "x-1.0.zip"])
+def test_size_limit(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, name: str):
+    monkeypatch.setenv(MAX_FILE_SIZE_ENV, "50")
+    with open_archive(make_archive(tmp_path, name)) as root:
+        assert isinstance(root.files, ArchiveFiles)
+        with pytest.raises(FileTooLarge, match=r"large\.bin` is larger than 50 bytes"):
+            root.files["data/large.bin"]
+        assert root.files["README.md"] == b"# x\n"
+        assert root.files.read == ["README.md"]
+
+        results = {r.name: r for r in process(root)[1]}
+        assert results["PP002"].result is False
+        assert "pyproject.toml` is larger than 50 bytes" in results["PP002"].err_msg
+
+
+@pytest.mark.parametrize("prefix", ["", "./", "x-1.0/"])
+def test_prefix(tmp_path: Path, prefix: str):
+    with open_archive(make_archive(tmp_path, "x.tar.gz", prefix=prefix)) as root:
+        assert root.joinpath("pyproject.toml").is_file()
+        assert root.joinpath("src/x").is_dir()
+
+
+def test_copy_is_free(tmp_path: Path):
+    with open_archive(make_archive(tmp_path, "x.zip")) as root:
+        assert copy.deepcopy(root) is root
+        assert copy.deepcopy(root) == root
+        assert isinstance(root.files, ArchiveFiles)
+        assert root.files.read == []
+
+
+@pytest.mark.parametrize("name", ["x-1.0.tar.gz", "x-1.0.zip"])
+def test_review_matches_directory(tmp_path: Path, name: str):
+    archive = make_archive(tmp_path, name)
+    with open_archive(archive) as root:
+        families, results = process(root)
+        assert isinstance(root.files, ArchiveFiles)
+        read = set(root.files.read)
+
+    expected_families, expected = process(make_tree(tmp_path / "expected"))
+    assert families == expected_families
+    assert as_simple_dict(results) == as_simple_dict(expected)
+    # Only the members the fixtures asked for are read
+    assert "pyproject.toml" in read
+    assert "data/large.bin" not in read
+
+
+def test_batch_review(tmp_path: Path):
+    archive = make_archive(tmp_path, "x-1.0.tar.gz")
+    assert is_archive(archive)
+    assert not is_archive(tmp_path)
+
+    result = review(archive, check_cache=False)
+    expected = review(make_tree(tmp_path / "expected"), check_cache=False)
+    assert not result.error
+    assert result.path == str(archive)
+    assert result.as_dict() == expected.as_dict()
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from repo_review.processor import collect_all
+from repo_review.processor import process as repo_review_process
+
+from sp_repo_review.batch import (
+    MAX_CHECK_RESULTS,
+    _init_worker,
+    get_check_cache,
+    jsonl,
+    review,
+    review_many,
+)
+from sp_repo_review.batch.__main__ import main
+from sp_repo_review.cache import CACHE_ENV
+from sp_repo_review.checks.github import WORKERS_ENV, get_workers
+from sp_repo_review.processor import Registry
+
+DIR = Path(__file__).parent.resolve()
+BASE = DIR.parent
+
+
+def make_repos(tmp_path: Path) -> list[Path]:
+    paths = []
+    for n in range(3):
+        path = tmp_path / f"repo{n}"
+        path.mkdir()
+        path.joinpath("pyproject.toml").write_text(
+            f"[project]\nname = 'repo{n}'\n", encoding="utf-8"
+        )
+        if n:
+            path.joinpath("noxfile.py").write_text("import nox\n", encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_registry_collect_matches_collect_all():
+    expected = collect_all(BASE)
+    collected = Registry.load().collect(BASE)
+    assert list(collected.checks) == list(expected.checks)
+    assert collected.families == expected.families
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_review_many(tmp_path: Path, workers: int):
+    paths = make_repos(tmp_path)
+    reviews = list(review_many(paths, workers=workers, select={"PY", "NOX"}))
+
+    assert [r.path for r in reviews] == [str(p) for p in paths]
+    for path, result in zip(paths, reviews, strict=True):
+        families, results = repo_review_process(path, select={"PY", "NOX"})
+        assert result.results == results
+        assert result.families == families
+        assert result.status == "errors"
+        assert result.exit_code == 3
+
+
+def test_review_pyproject_path(tmp_path: Path):
+    (path,) = make_repos(tmp_path)[:1]
+    assert review(path / "pyproject.toml").results == review(path).results
+
+
+def test_review_error(tmp_path: Path):
+    result = review(tmp_path / "missing")
+    assert result.error.startswith("FileNotFoundError")
+    assert result.exit_code == 1
+    assert result.as_dict() == {"error": result.error}
+
+
+def test_review_show_err(tmp_path: Path):
+    (path,) = make_repos(tmp_path)[:1]
+    result = review(path, show="err")
+    assert result.results
+    assert all(r.result is False for r in result.results)
+
+
+def test_batch_cli(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    paths = make_repos(tmp_path)
+    paths_file = tmp_path / "paths.txt"
+    paths_file.write_text(f"{paths[2]}\n\n", encoding="utf-8")
+
+    with pytest.raises(SystemExit) as exc:
+        main(
+            [
+                str(paths[0]),
+                str(paths[1]),
+                "--paths-from",
+                str(paths_file),
+                "--workers=1",
+                "--select=PY001,NOX",
+            ]
+        )
+    assert exc.value.code == 3
+
+    output = json.loads(capsys.readouterr().out)
+    assert list(output) == [str(p) for p in paths]
+    assert list(output[str(paths[0])]["checks"]) == ["PY001"]
+    assert output[str(paths[0])]["status"] == "passed"
+    assert "NOX101" in output[str(paths[1])]["checks"]
+
+
+def read_jsonl(path: Path) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_jsonl_header():
+    header = jsonl.header()
+    assert header["type"] == "header"
+    assert header["families"]["general"] == {"name": "General", "order": -3}
+    assert header["checks"]["PY001"]["family"] == "general"
+    assert header["checks"]["PY001"]["url"] == (
+        "https://learn.scientific-python.org/development/guides/packaging-simple#PY001"
+    )
+
+
+def test_jsonl_cli(tmp_path: Path):
+    paths = make_repos(tmp_path)
+    output = tmp_path / "out.jsonl"
+
+    with pytest.raises(SystemExit):
+        main([*map(str, paths), "-j1", "--select=PY", "--format=jsonl", f"-o{output}"])
+
+    header, *records = read_jsonl(output)
+    assert header["type"] == "header"
+    assert [r["path"] for r in records] == [str(p) for p in paths]
+    assert records[0]["status"] == "errors"
+    assert records[0]["duration"] >= 0
+    assert records[0]["checks"][0] == {
+        "id": "PY001",
+        "family": "general",
+        "result": True,
+        "err_msg": "",
+        "skip_reason": "",
+    }
+
+
+def test_jsonl_resume(tmp_path: Path):
+    paths = make_repos(tmp_path)
+    output = tmp_path / "out.jsonl"
+
+    main([str(paths[0]), "-j1", "--select=PY001", "--format=jsonl", f"-o{output}"])
+    # Simulate being interrupted while writing the next line
+    with output.open("a", encoding="utf-8") as f:
+        f.write('{"type":"review","path":')
+
+    main(
+        [
+            *map(str, paths),
+            "-j1",
+            "--select=PY001",
+            "--format=jsonl",
+            f"-o{output}",
+            "--resume",
+        ]
+    )
+
+    records = read_jsonl(output)
+    assert [r["type"] for r in records] == ["header", "review", "review", "review"]
+    assert [r["path"] for r in records[1:]] == [str(p) for p in paths]
+
+
+def test_jsonl_resume_needs_output():
+    with pytest.raises(SystemExit) as exc:
+        main([".", "--format=jsonl", "--resume"])
+    assert exc.value.code == 2
+
+
+def test_review_many_check_cache(tmp_path: Path):
+    paths = make_repos(tmp_path)[1:]
+    for path in paths:
+        path.joinpath("pyproject.toml").write_text(
+            "[project]\nname = 'same'\n", encoding="utf-8"
+        )
+
+    first, second = review_many(paths, workers=1)
+    assert first.cache_misses
+    assert second.cache_hits == first.cache_misses + first.cache_hits
+    assert second.cache_misses == 0
+    assert first.results == second.results
+
+    (uncached,) = review_many(paths[:1], workers=1, check_cache=False)
+    assert uncached.cache_hits == uncached.cache_misses == 0
+    assert uncached.results == first.results
+
+
+def test_workers_parse_serially(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv(WORKERS_ENV, "0")
+    _init_worker()
+    assert get_workers() == 1
+
+
+def test_check_cache_is_bounded():
+    assert get_check_cache().max_entries == MAX_CHECK_RESULTS
+
+
+def test_check_cache_in_memory(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[project]\nname = 'x'\n", encoding="utf-8"
+    )
+    monkeypatch.setenv(CACHE_ENV, str(tmp_path / "cache"))
+    get_check_cache.cache_clear()
+    try:
+        assert not review(tmp_path).error
+    finally:
+        get_check_cache.cache_clear()
+    assert list(tmp_path.glob("cache/*.pickle"))
+    assert not list(tmp_path.glob("cache/check-*.pickle"))
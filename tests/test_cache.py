@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from repo_review.processor import process as repo_review_process
+
+from sp_repo_review import cache, processor
+from sp_repo_review.checks.general import PY001, DirectoryTree
+from sp_repo_review.checks.github import workflows
+from sp_repo_review.checks.noxfile import Noxfile
+from sp_repo_review.checks.pyproject import parse_toml
+from sp_repo_review.lazy import lazy_mapping
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+
+def counting_parser() -> tuple[Callable[[bytes], dict[str, str]], list[bytes]]:
+    calls: list[bytes] = []
+
+    def parser(content: bytes) -> dict[str, str]:
+        calls.append(content)
+        return {"content": content.decode()}
+
+    return parser, calls
+
+
+def test_cache_disabled_by_default(monkeypatch):
+    monkeypatch.delenv(cache.CACHE_ENV, raising=False)
+    assert cache.get_cache() is None
+    monkeypatch.setenv(cache.CACHE_ENV, "0")
+    assert cache.get_cache() is None
+
+
+def test_cache_default_location(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv(cache.CACHE_ENV, "1")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    parse_cache = cache.get_cache()
+    assert parse_cache is not None
+    assert parse_cache.path == tmp_path / "sp-repo-review"
+
+
+def test_cache_hit(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv(cache.CACHE_ENV, str(tmp_path))
+    parser, calls = counting_parser()
+
+    assert cache.parse(b"one", parser) == {"content": "one"}
+    assert cache.parse(b"one", parser) == {"content": "one"}
+    assert calls == [b"one"]
+
+    assert cache.parse(b"two", parser) == {"content": "two"}
+    assert calls == [b"one", b"two"]
+    assert len(list(tmp_path.glob("*.pickle"))) == 2
+
+
+def test_cache_key():
+    key = cache.ParseCache.key(b"[tool]", parse_toml)
+    assert key == cache.ParseCache.key(b"[tool]", parse_toml)
+    assert key != cache.ParseCache.key(b"[tool2]", parse_toml)
+    assert key != cache.ParseCache.key(b"[tool]", str)
+
+
+def test_cache_parse_all_misses_only(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv(cache.CACHE_ENV, str(tmp_path))
+    parser, _ = counting_parser()
+    bulk_calls = []
+
+    def bulk(items: list[bytes]) -> list[dict[str, str]]:
+        bulk_calls.append(items)
+        return [parser(item) for item in items]
+
+    cache.parse(b"b", parser)
+    results = cache.parse_all([b"a", b"b", b"c"], parser, bulk=bulk)
+    assert [r["content"] for r in results] == ["a", "b", "c"]
+    assert bulk_calls == [[b"a", b"c"]]
+
+
+def test_cache_corrupt_entry(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv(cache.CACHE_ENV, str(tmp_path))
+    parser, calls = counting_parser()
+
+    cache.parse(b"one", parser)
+    (entry,) = tmp_path.glob("*.pickle")
+    entry.write_bytes(b"not a pickle")
+
+    assert cache.parse(b"one", parser) == {"content": "one"}
+    assert len(calls) == 2
+
+
+def test_cache_eviction(tmp_path: Path):
+    parse_cache = cache.ParseCache(tmp_path)
+    parse_cache.put("old", "x" * 100)
+    entry = tmp_path / "old.pickle"
+    os.utime(entry, (0, 0))
+
+    # Trimmed to two entries once past the limit, as it is three quarters
+    parse_cache.max_size = int(entry.stat().st_size * 2.8)
+    parse_cache.put("new", "y" * 100)
+    parse_cache.put("newer", "z" * 100)
+
+    assert not entry.exists()
+    assert parse_cache.get("new") == (True, "y" * 100)
+    assert parse_cache.get("newer") == (True, "z" * 100)
+    assert parse_cache.get("old") == (False, None)
+
+
+def test_cache_scans_rarely(monkeypatch, tmp_path: Path):
+    parse_cache = cache.ParseCache(tmp_path, max_size=20_000)
+    scans: list[None] = []
+    evict = parse_cache.evict
+    monkeypatch.setattr(parse_cache, "evict", lambda: scans.append(evict()))
+
+    for n in range(200):
+        parse_cache.put(str(n), "x" * 100)
+    entries = list(tmp_path.glob("*.pickle"))
+    size = sum(entry.stat().st_size for entry in entries)
+    # The first write, then each time it passes the limit
+    assert 1 < len(scans) < 10
+    assert 15_000 * 0.9 <= size <= 20_000
+    assert parse_cache._size == size  # noqa: SLF001
+
+
+def test_cache_touches_rarely(tmp_path: Path):
+    parse_cache = cache.ParseCache(tmp_path)
+    parse_cache.put("key", "value")
+    entry = tmp_path / "key.pickle"
+
+    os.utime(entry, (1000, 1000))
+    assert parse_cache.get("key") == (True, "value")
+    recent = entry.stat().st_mtime
+    assert recent > 1000
+
+    os.utime(entry, (recent - 60, recent - 60))
+    assert parse_cache.get("key") == (True, "value")
+    assert entry.stat().st_mtime == recent - 60
+
+
+@pytest.mark.parametrize(
+    ("value", "size"),
+    [
+        ("", 64 * 1024 * 1024),
+        ("1000", 1000),
+        ("64M", 64 * 1024 * 1024),
+        ("-1", 64 * 1024 * 1024),
+    ],
+)
+def test_get_cache_size(monkeypatch, tmp_path: Path, value: str, size: int):
+    monkeypatch.setenv(cache.CACHE_ENV, str(tmp_path))
+    monkeypatch.setenv(cache.CACHE_SIZE_ENV, value)
+    parse_cache = cache.get_cache()
+    assert parse_cache is not None
+    assert parse_cache.max_size == size
+    assert cache.get_cache() is parse_cache
+
+
+def test_workflows_cached(monkeypatch, tmp_path: Path):
+    root = tmp_path / "repo"
+    workflow_dir = root / ".github/workflows"
+    workflow_dir.mkdir(parents=True)
+    workflow_dir.joinpath("ci.yml").write_text("name: CI\non: push\n", encoding="utf-8")
+
+    uncached = workflows(root)
+    monkeypatch.setenv(cache.CACHE_ENV, str(tmp_path / "cache"))
+    assert workflows(root) == uncached
+    assert workflows(root) == uncached
+    assert len(list((tmp_path / "cache").glob("*.pickle"))) == 1
+
+
+def test_check_cache_key():
+    check: Any = PY001()
+    key = cache.CheckCache.key("PY001", check, {"pyproject": {"a": [1, {"b"}]}})
+    assert key is not None
+    assert key == cache.CheckCache.key(
+        "PY001", check, {"pyproject": lazy_mapping(lambda: {"a": [1, {"b"}]})}
+    )
+    assert key != cache.CheckCache.key("PY001", check, {"pyproject": {"a": [1]}})
+    assert key != cache.CheckCache.key("PY002", check, {"pyproject": {"a": [1]}})
+    assert key != cache.CheckCache.key("PY001", check, {"pyproject": {"a": (1, {"b"})}})
+
+    nox = Noxfile.from_str("import nox\n")
+    assert cache.CheckCache.key("NOX101", check, {"noxfile": nox}) == (
+        cache.CheckCache.key(
+            "NOX101", check, {"noxfile": Noxfile.from_str("import nox\n")}
+        )
+    )
+
+
+def test_check_cache_unkeyable(tmp_path: Path):
+    check: Any = PY001()
+    assert cache.CheckCache.key("PY001", check, {"package": tmp_path}) is None
+
+
+def test_check_cache_wrap():
+    calls = []
+
+    class Counted:
+        "Has a name"
+
+        family = "general"
+
+        @staticmethod
+        def check(pyproject: dict[str, str]) -> bool:
+            calls.append(pyproject)
+            return "name" in pyproject
+
+    check_cache = cache.CheckCache()
+    check: Any = Counted()
+    wrapped: Any = check_cache.wrap("PY001", check)
+    assert wrapped.__doc__ == Counted.__doc__
+    assert wrapped.family == "general"
+
+    assert wrapped.check(pyproject={"name": "x"})
+    assert wrapped.check(pyproject={"name": "x"})
+    assert not wrapped.check(pyproject={})
+    assert len(calls) == 2
+    assert (check_cache.hits, check_cache.misses) == (1, 2)
+
+
+def test_check_cache_process(tmp_path: Path):
+    for name in ("one", "two"):
+        repo = tmp_path / name
+        repo.mkdir()
+        repo.joinpath("pyproject.toml").write_text(
+            "[project]\nname = 'same'\n", encoding="utf-8"
+        )
+
+    check_cache = cache.CheckCache()
+    first = processor.process(tmp_path / "one", check_cache=check_cache)
+    misses = check_cache.misses
+    assert misses
+    assert check_cache.hits == 0
+
+    second = processor.process(tmp_path / "two", check_cache=check_cache)
+    assert check_cache.hits == misses
+    assert check_cache.misses == misses
+    assert first == second == repo_review_process(tmp_path / "two")
+
+
+def test_memory_cache(monkeypatch):
+    monkeypatch.delenv(cache.CACHE_ENV, raising=False)
+    monkeypatch.setattr(cache.MemoryCache, "current", None)
+    memory = cache.MemoryCache.enable()
+    parser, calls = counting_parser()
+
+    first = cache.parse(b"one", parser)
+    second = cache.parse(b"one", parser)
+    assert first == second == {"content": "one"}
+    assert first is not second
+    assert calls == [b"one"]
+    assert len(memory) == 1
+
+
+def test_memory_cache_in_front_of_disk(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv(cache.CACHE_ENV, str(tmp_path))
+    monkeypatch.setattr(cache.MemoryCache, "current", None)
+    parser, calls = counting_parser()
+    cache.parse(b"one", parser)
+
+    memory = cache.MemoryCache.enable()
+    assert cache.parse(b"one", parser) == {"content": "one"}
+    assert calls == [b"one"]
+    assert len(memory) == 1
+
+
+def test_memory_cache_eviction():
+    memory = cache.MemoryCache(max_size=120)
+    memory.put("a", "x" * 40)
+    memory.put("b", "y" * 40)
+    assert memory.get("a")[0]
+    memory.put("c", "z" * 40)
+    assert memory.get("a") == (True, "x" * 40)
+    assert memory.get("b") == (False, None)
+    memory.put("d", lambda: None)
+    assert memory.get("d") == (False, None)
+
+
+def test_check_cache_max_entries():
+    check: Any = PY001()
+    check_cache = cache.CheckCache(max_entries=1)
+    wrapped: Any = check_cache.wrap("PY001", check)
+    for files in ({"pyproject.toml"}, set(), {"pyproject.toml"}):
+        wrapped.check(package_tree=DirectoryTree(files=frozenset(files)))
+    assert (check_cache.hits, check_cache.misses) == (0, 3)
+
+
+def test_read_size_limit(monkeypatch, tmp_path: Path):
+    path = tmp_path / "big.yml"
+    path.write_bytes(b"x" * 100)
+    assert cache.read(path) == b"x" * 100
+
+    monkeypatch.setenv(cache.MAX_FILE_SIZE_ENV, "100")
+    assert cache.read(path) == b"x" * 100
+
+    monkeypatch.setenv(cache.MAX_FILE_SIZE_ENV, "99")
+    with pytest.raises(cache.FileTooLarge, match="larger than 99 bytes"):
+        cache.read(path)
+
+
+@pytest.mark.parametrize(
+    ("value", "limit"), [("", 0), ("10", 10), ("-1", 0), ("1k", 0)]
+)
+def test_max_file_size(monkeypatch, value: str, limit: int):
+    monkeypatch.setenv(cache.MAX_FILE_SIZE_ENV, value)
+    assert cache.max_file_size() == limit
+
+
+def test_size_limit_fails_checks(monkeypatch, tmp_path: Path):
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[project]\nname = 'x'\n", encoding="utf-8"
+    )
+    workflows_dir = tmp_path / ".github/workflows"
+    workflows_dir.mkdir(parents=True)
+    workflows_dir.joinpath("ci.yml").write_text(
+        "on: push\n" + "#" * 1000 + "\n", encoding="utf-8"
+    )
+
+    _, expected = processor.process(tmp_path, select={"PP", "GH"})
+    monkeypatch.setenv(cache.MAX_FILE_SIZE_ENV, "1000")
+    _, results = processor.process(tmp_path, select={"PP", "GH"})
+
+    limited = {r.name: r for r in results}
+    for result in expected:
+        if result.name == "GH100":
+            assert limited["GH100"].result is False
+            assert "ci.yml` is larger than 1,000 bytes" in limited["GH100"].err_msg
+        elif not result.name.startswith("GH"):
+            assert limited[result.name] == result
+
+
+@pytest.mark.parametrize(
+    ("name", "content", "check", "family"),
+    [
+        ("ruff.toml", "[lint]\nselect = ['B']\n", "RF101", "ruff"),
+        ("setup.cfg", "[metadata]\nname = x\n", "SCFG001", "general"),
+        ("pyproject.toml", "[project]\nname = 'x'\n", "PP002", "general"),
+    ],
+)
+def test_size_limit_while_collecting(
+    monkeypatch, tmp_path: Path, name: str, content: str, check: str, family: str
+):
+    "Files read for the fixtures or family descriptions fail only their checks."
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[project]\nname = 'x'\n", encoding="utf-8"
+    )
+    tmp_path.joinpath(name).write_text(content + "#" * 1000 + "\n", encoding="utf-8")
+    monkeypatch.setenv(cache.MAX_FILE_SIZE_ENV, "1000")
+
+    families, results = processor.process(tmp_path)
+    message = f"{name}` is larger than 1,000 bytes"
+    limited = {r.name: r for r in results}
+    assert limited[check].result is False
+    assert message in limited[check].err_msg
+    assert message in families[family].get("description", "")
+    assert limited["PY001"].result is True
+
+
+def test_size_limit_pyproject_dependents(monkeypatch, tmp_path: Path):
+    "Checks using a fixture computed from an oversized pyproject.toml fail too."
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[project]\nname = 'x'\n[tool.ruff]\n" + "#" * 1000 + "\n", encoding="utf-8"
+    )
+    monkeypatch.setenv(cache.MAX_FILE_SIZE_ENV, "1000")
+
+    _, results = processor.process(tmp_path, select={"PY001", "RF001"})
+    limited = {r.name: r for r in results}
+    assert limited["RF001"].result is False
+    assert "pyproject.toml` is larger than 1,000 bytes" in limited["RF001"].err_msg
+    assert limited["PY001"].result is True
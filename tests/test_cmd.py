@@ -1,9 +1,24 @@
+from __future__ import annotations
+
+import contextlib
+import json
 import subprocess
+from typing import TYPE_CHECKING, Any
 
 import pytest
 
 pytest.importorskip("rich")
 
+import repo_review.__main__
+
+import sp_repo_review.__main__
+import sp_repo_review.processor
+from sp_repo_review.cache import MAX_FILE_SIZE_ENV
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
 
 def test_cmd_help():
     subprocess.run(["repo-review", "--help"], check=True)
@@ -23,3 +38,78 @@ def test_cmd_json():
 
 def test_ruff_checks():
     subprocess.run(["sp-ruff-checks"], check=True)
+
+
+def test_sp_repo_review_skips_unselected(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+):
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[project]\nname = 'x'\n", encoding="utf-8"
+    )
+    selections = []
+    process = sp_repo_review.processor.process
+
+    def spy(*args: Any, **kwargs: Any) -> Any:
+        selections.append(kwargs["select"])
+        return process(*args, **kwargs)
+
+    monkeypatch.setattr(sp_repo_review.__main__, "process", spy)
+    with contextlib.suppress(SystemExit):
+        sp_repo_review.__main__.main([str(tmp_path), "--select=PY001", "--format=json"])
+
+    assert selections == [{"PY001"}]
+    assert list(json.loads(capsys.readouterr().out)["checks"]) == ["PY001"]
+
+
+def test_sp_repo_review_size_limit(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+):
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[project]\nname = 'x'\n" + "#" * 1000 + "\n", encoding="utf-8"
+    )
+    monkeypatch.setenv(MAX_FILE_SIZE_ENV, "200")
+    with pytest.raises(SystemExit):
+        sp_repo_review.__main__.main([str(tmp_path), "--format=json"])
+
+    checks = json.loads(capsys.readouterr().out)["checks"]
+    assert checks["PP002"]["result"] is False
+    assert "is larger than 200 bytes" in checks["PP002"]["err_msg"]
+
+
+def run_main(
+    main: Callable[[list[str]], None],
+    capsys: pytest.CaptureFixture[str],
+    *args: str,
+) -> tuple[str, str, int]:
+    code = 0
+    try:
+        main(list(args))
+    except SystemExit as exit_:
+        code = int(exit_.code or 0)
+    out, err = capsys.readouterr()
+    return out, err, code
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("--format", "json", "repo"),
+        ("--format", "json", "--show", "err", "repo", "repo/pyproject.toml"),
+        ("--format", "html", "--stderr", "json", "repo", "--select", "PY"),
+        ("--list-all",),
+    ],
+)
+def test_sp_repo_review_matches_repo_review(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    args: tuple[str, ...],
+):
+    tmp_path.joinpath("repo").mkdir()
+    tmp_path.joinpath("repo/pyproject.toml").write_text(
+        "[project]\nname = 'x'\n", encoding="utf-8"
+    )
+    monkeypatch.chdir(tmp_path)
+    assert run_main(sp_repo_review.__main__.main, capsys, *args) == run_main(
+        repo_review.__main__.main, capsys, *args
+    )
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import os
+import socket
+import sys
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+from repo_review.__main__ import main as repo_review_main
+
+from sp_repo_review import __version__
+from sp_repo_review.daemon import SOCKET_ENV, socket_path
+from sp_repo_review.daemon.client import _peer_is_user, request
+from sp_repo_review.daemon.client import main as client_main
+from sp_repo_review.daemon.server import DaemonServer, run, serve
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "getuid") or sys.platform == "emscripten",
+    reason="Needs Unix sockets",
+)
+
+
+def make_repo(path: Path) -> None:
+    path.joinpath("pyproject.toml").write_text(
+        "[project]\nname = 'x'\n", encoding="utf-8"
+    )
+    path.joinpath("noxfile.py").write_text("import nox\n", encoding="utf-8")
+
+
+def message(cwd: Path, *args: str) -> dict[str, object]:
+    return {"version": __version__, "cwd": str(cwd), "args": list(args)}
+
+
+def expected(
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+    cwd: Path,
+    *args: str,
+) -> tuple[str, str, int]:
+    monkeypatch.chdir(cwd)
+    code = 0
+    try:
+        repo_review_main(list(args))
+    except SystemExit as exit_:
+        code = int(exit_.code or 0)
+    out, err = capsys.readouterr()
+    return out, err, code
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("--format", "json", "repo"),
+        ("--format", "json", "--show", "err", "repo", "repo/pyproject.toml"),
+        ("repo", "--select", "PY"),
+        ("--format", "html", "--stderr", "json", "repo"),
+    ],
+)
+def test_run_matches_cli(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+    args: tuple[str, ...],
+):
+    (tmp_path / "repo").mkdir()
+    make_repo(tmp_path / "repo")
+    reply = run(message(tmp_path, *args))
+    out, err, code = expected(capsys, monkeypatch, tmp_path, *args)
+    assert reply == {"stdout": out, "stderr": err, "exit_code": code}
+
+
+@pytest.fixture
+def daemon(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    path = str(tmp_path / "d.sock")
+    monkeypatch.setenv(SOCKET_ENV, path)
+    server = DaemonServer(path, idle_timeout=10)
+    thread = threading.Thread(target=server.serve_until_stopped)
+    thread.start()
+    try:
+        yield path
+    finally:
+        request({"command": "stop"}, path)
+        thread.join()
+        server.server_close()
+
+
+def test_socket_path(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.delenv(SOCKET_ENV, raising=False)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert socket_path() == str(
+        tmp_path / f"sp-repo-review-{os.getuid()}" / "daemon.sock"
+    )
+
+
+def test_serve_needs_private_directory(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.delenv(SOCKET_ENV, raising=False)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    shared = tmp_path / f"sp-repo-review-{os.getuid()}"
+    shared.mkdir(mode=0o755)
+    shared.chmod(0o755)
+    with pytest.raises(RuntimeError, match="only this user"):
+        serve()
+
+
+@pytest.fixture
+def other_user(monkeypatch: pytest.MonkeyPatch) -> None:
+    "Makes everything this user owns look like it belongs to someone else."
+    uid = os.getuid()
+    monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+
+
+@pytest.mark.usefixtures("other_user")
+def test_foreign_socket_not_trusted(daemon: str):
+    assert request({"command": "status"}, daemon) is None
+    with pytest.raises(RuntimeError, match="another user"):
+        serve(daemon)
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_PEERCRED"), reason="Linux only")
+def test_peer_credentials(monkeypatch: pytest.MonkeyPatch):
+    first, second = socket.socketpair(socket.AF_UNIX)
+    with first, second:
+        assert _peer_is_user(first)
+        uid = os.getuid()
+        monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+        assert not _peer_is_user(first)
+
+
+def test_client_roundtrip(
+    daemon: str,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    make_repo(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit):
+        client_main(["--format", "json"])
+    out, _ = capsys.readouterr()
+
+    assert out == expected(capsys, monkeypatch, tmp_path, "--format", "json")[0]
+    status = request({"command": "status"}, daemon)
+    assert status is not None
+    assert status["requests"] == 2
+    assert status["version"] == __version__
+
+
+def test_client_reports_exit_code(
+    daemon: str,  # noqa: ARG001
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit) as exc:
+        client_main(["--format", "json"])
+    assert exc.value.code == 3
+    assert '"status": "errors"' in capsys.readouterr().out
+
+
+def test_client_without_daemon(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setenv(SOCKET_ENV, str(tmp_path / "missing.sock"))
+    make_repo(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit):
+        client_main(["--format", "json"])
+    out, _ = capsys.readouterr()
+    assert out == expected(capsys, monkeypatch, tmp_path, "--format", "json")[0]
+
+
+@pytest.mark.parametrize(
+    "args",
+    [("gh:org/repo",), ("--version",), ("--list-all",), ("--format", "nope")],
+)
+def test_daemon_falls_back(daemon: str, tmp_path: Path, args: tuple[str, ...]):
+    reply = request(message(tmp_path, *args), daemon)
+    assert reply is not None
+    assert "fallback" in reply
+
+
+def test_daemon_version_mismatch(daemon: str, tmp_path: Path):
+    reply = request({**message(tmp_path), "version": "0"}, daemon)
+    assert reply == {"fallback": f"daemon is version {__version__}"}
+
+
+def test_serve_refuses_second_daemon(daemon: str):
+    with pytest.raises(RuntimeError, match="already listening"):
+        serve(daemon)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import functools
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from repo_review.fixtures import collect_fixtures, compute_fixtures
+
+from sp_repo_review._compat.importlib.resources.abc import Traversable
+from sp_repo_review.files import (
+    FixtureFiles,
+    manifest,
+    matches,
+    prefetch_package,
+    prefetch_root,
+)
+from sp_repo_review.lazy import force
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+
+class RecordingPath(Traversable):
+    """
+    Wraps a local path, recording every file opened as ``(fixture, base,
+    relative path)``.
+    """
+
+    def __init__(
+        self, path: Path, base: str, rel: str, log: list[tuple[str, str, str]]
+    ) -> None:
+        self._path = path
+        self._base = base
+        self._rel = rel
+        self._log = log
+
+    @property
+    def name(self) -> str:
+        return self._path.name
+
+    def _child(self, child: str) -> RecordingPath:
+        rel = str(PurePosixPath(self._rel, child))
+        return RecordingPath(self._path / child, self._base, rel, self._log)
+
+    def joinpath(self, *descendants: str) -> RecordingPath:
+        result = self
+        for child in descendants:
+            result = result._child(child)
+        return result
+
+    def __truediv__(self, child: str) -> RecordingPath:
+        return self._child(child)
+
+    def iterdir(self) -> Iterator[RecordingPath]:
+        for path in self._path.iterdir():
+            yield self._child(path.name)
+
+    def is_dir(self) -> bool:
+        return self._path.is_dir()
+
+    def is_file(self) -> bool:
+        return self._path.is_file()
+
+    def read_bytes(self) -> bytes:
+        with self.open("rb") as f:
+            return f.read()  # type: ignore[no-any-return]
+
+    def read_text(self, encoding: str | None = None) -> str:
+        with self.open("r", encoding=encoding) as f:
+            return f.read()  # type: ignore[no-any-return]
+
+    def open(self, mode: str = "r", *args: Any, **kwargs: Any) -> Any:
+        fixture = self._log[-1][0] if self._log else ""
+        self._log.append((fixture, self._base, self._rel))
+        return self._path.open(mode, *args, **kwargs)
+
+
+def recorded(
+    name: str, func: Callable[..., Any], log: list[tuple[str, str, str]]
+) -> Callable[..., Any]:
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        log.append((name, "", ""))
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def make_repo(path: Path, *, alternate: bool) -> None:
+    "Writes every file a fixture might read, with either spelling."
+    yml = "yaml" if alternate else "yml"
+    workflows = path / ".github/workflows"
+    workflows.mkdir(parents=True)
+    workflows.joinpath(f"ci.{yml}").write_text("on: push\n", encoding="utf-8")
+    path.joinpath(f".github/dependabot.{yml}").write_text(
+        "version: 2\n", encoding="utf-8"
+    )
+    path.joinpath(f".readthedocs.{yml}").write_text("version: 2\n", encoding="utf-8")
+    path.joinpath(".pre-commit-config.yaml").write_text("repos: []\n", encoding="utf-8")
+    path.joinpath("pyproject.toml").write_text(
+        "[project]\nname = 'x'\n", encoding="utf-8"
+    )
+    path.joinpath(".pytest.toml" if alternate else "pytest.toml").write_text(
+        "[pytest]\n", encoding="utf-8"
+    )
+    path.joinpath("ruff.toml" if alternate else ".ruff.toml").write_text(
+        "", encoding="utf-8"
+    )
+    path.joinpath("setup.cfg").write_text("[metadata]\n", encoding="utf-8")
+    path.joinpath("noxfile.py").write_text("import nox\n", encoding="utf-8")
+
+
+@pytest.mark.parametrize("alternate", [False, True])
+def test_fixtures_read_declared_files(tmp_path: Path, alternate: bool) -> None:
+    make_repo(tmp_path, alternate=alternate)
+    log: list[tuple[str, str, str]] = []
+    fixtures = {
+        name: recorded(name, func, log) for name, func in collect_fixtures().items()
+    }
+    root = RecordingPath(tmp_path, "root", ".", log)
+    package = RecordingPath(tmp_path, "package", ".", log)
+    computed = compute_fixtures(root, package, fixtures)
+
+    # Most fixtures only read their files when used
+    for name, value in computed.items():
+        log.append((name, "", ""))
+        for item in value if isinstance(value, tuple) else [value]:
+            force(item)
+
+    declared = manifest()
+    opened = [entry for entry in log if entry[1]]
+    assert opened, "expected fixtures to open files"
+    for fixture, base, rel in opened:
+        files = declared.get(fixture, FixtureFiles())
+        patterns: frozenset[str] = getattr(files, base)
+        assert any(matches(rel, p) for p in patterns), (
+            f"fixture {fixture!r} read {rel!r} (relative to {base}), which isn't declared"
+        )
+
+
+def test_prefetch_from_manifest() -> None:
+    assert ".readthedocs.yaml" in prefetch_root()
+    assert {"pytest.toml", ".pytest.toml"} <= prefetch_root()
+    assert prefetch_package() == {"pyproject.toml"}
+
+
+def test_manifest_fixtures_exist() -> None:
+    fixtures = collect_fixtures()
+    for name in manifest():
+        assert name in fixtures, f"{name!r} is declared but not a fixture"
+
+
+def test_matches() -> None:
+    assert matches(".github/workflows/ci.yml", ".github/workflows/*.yml")
+    assert not matches("a/.github/workflows/ci.yml", ".github/workflows/*.yml")
+    assert not matches(".github/workflows/ci.yaml", ".github/workflows/*.yml")
+    assert matches("", "")
+    assert matches("src/pkg", "src/*")
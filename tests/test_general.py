@@ -4,20 +4,53 @@ import pytest
 from repo_review.testing import compute_check
 
 from sp_repo_review._compat import tomllib
-from sp_repo_review.checks.general import PY007_VALID_RUNNER_CONFS
+from sp_repo_review.checks.general import (
+    PY007_VALID_RUNNER_CONFS,
+    DirectoryTree,
+    package_tree,
+)
+
+
+def test_directory_tree(tmp_path: Path):
+    tmp_path.joinpath("README.md").touch()
+    tmp_path.joinpath("docs").mkdir()
+    tmp_path.joinpath("docs/index.md").touch()
+    pkg = tmp_path.joinpath("src/pkg")
+    pkg.mkdir(parents=True)
+    pkg.joinpath("__init__.py").touch()
+    pkg.joinpath("tests").mkdir()
+    pkg.joinpath("tests/test_pkg.py").touch()
+
+    tree = DirectoryTree.scan(tmp_path)
+    assert tree.files == {"README.md", "src/pkg/__init__.py"}
+    assert tree.dirs == {"docs", "src", "src/pkg", "src/pkg/tests"}
+    assert sorted(tree.listdir()) == ["README.md", "docs", "src"]
+    assert sorted(tree.listdir("src/pkg")) == ["__init__.py", "tests"]
+    assert tree.is_dir("src/pkg/tests")
+    assert not tree.is_file("docs")
+
+
+def test_package_tree_reuses_root(tmp_path: Path):
+    root = DirectoryTree.scan(tmp_path)
+    assert package_tree(tmp_path, tmp_path, root) is root
+
+    tmp_path.joinpath("sub").mkdir()
+    tmp_path.joinpath("sub/pyproject.toml").touch()
+    sub = package_tree(tmp_path / "sub", tmp_path, root)
+    assert sub.files == {"pyproject.toml"}
 
 
 def test_py001(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
     simple.joinpath("pyproject.toml").touch()
-    assert compute_check("PY001", package=simple).result
+    assert compute_check("PY001", package_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py001_missing(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
-    assert not compute_check("PY001", package=simple).result
+    assert not compute_check("PY001", package_tree=DirectoryTree.scan(simple)).result
 
 
 @pytest.mark.parametrize("readme", ["README.md", "README.rst"])
@@ -25,13 +58,13 @@ def test_py002(tmp_path: Path, readme: str):
     simple = tmp_path / "simple"
     simple.mkdir()
     simple.joinpath(readme).touch()
-    assert compute_check("PY002", root=simple).result
+    assert compute_check("PY002", root_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py002_missing(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
-    assert not compute_check("PY002", root=simple).result
+    assert not compute_check("PY002", root_tree=DirectoryTree.scan(simple)).result
 
 
 @pytest.mark.parametrize("license", ["LICENSE", "LICENCE", "COPYING"])
@@ -39,74 +72,74 @@ def test_py003(tmp_path: Path, license: str):
     simple = tmp_path / "simple"
     simple.mkdir()
     simple.joinpath(license).touch()
-    assert compute_check("PY003", package=simple).result
+    assert compute_check("PY003", package_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py003_missing(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
-    assert not compute_check("PY003", package=simple).result
+    assert not compute_check("PY003", package_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py004(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
     simple.joinpath("docs").mkdir()
-    assert compute_check("PY004", package=simple).result
+    assert compute_check("PY004", package_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py004_not_dir(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
     simple.joinpath("docs")
-    assert not compute_check("PY004", package=simple).result
+    assert not compute_check("PY004", package_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py004_missing(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
-    assert not compute_check("PY004", package=simple).result
+    assert not compute_check("PY004", package_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py005(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
     simple.joinpath("tests").mkdir()
-    assert compute_check("PY005", package=simple).result
+    assert compute_check("PY005", package_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py005_alt_singular(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
     simple.joinpath("test").mkdir()
-    assert compute_check("PY005", package=simple).result
+    assert compute_check("PY005", package_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py005_alt_integration(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
     simple.joinpath("tests-integration").mkdir()
-    assert compute_check("PY005", package=simple).result
+    assert compute_check("PY005", package_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py005_not_folder(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
     simple.joinpath("tests")
-    assert not compute_check("PY005", package=simple).result
+    assert not compute_check("PY005", package_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py005_not_tests(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
     simple.joinpath("fastest").mkdir()
-    assert not compute_check("PY005", package=simple).result
+    assert not compute_check("PY005", package_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py005_missing(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
-    assert not compute_check("PY005", package=simple).result
+    assert not compute_check("PY005", package_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py005_src(tmp_path: Path):
@@ -117,7 +150,7 @@ def test_py005_src(tmp_path: Path):
     pkg = src.joinpath("pkg")
     pkg.mkdir()
     pkg.joinpath("tests").mkdir()
-    assert compute_check("PY005", package=simple).result
+    assert compute_check("PY005", package_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py005_src_missing(tmp_path: Path):
@@ -125,20 +158,20 @@ def test_py005_src_missing(tmp_path: Path):
     simple.mkdir()
     src = simple.joinpath("src")
     src.mkdir()
-    assert not compute_check("PY005", package=simple).result
+    assert not compute_check("PY005", package_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py006(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
     simple.joinpath(".pre-commit-config.yaml").touch()
-    assert compute_check("PY006", root=simple).result
+    assert compute_check("PY006", root_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py006_missing(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
-    assert not compute_check("PY006", root=simple).result
+    assert not compute_check("PY006", root_tree=DirectoryTree.scan(simple)).result
 
 
 @pytest.mark.parametrize("runnerfile", sorted(PY007_VALID_RUNNER_CONFS))
@@ -146,7 +179,9 @@ def test_py007(tmp_path: Path, runnerfile: str):
     simple = tmp_path / "simple"
     simple.mkdir()
     simple.joinpath(runnerfile).touch()
-    assert compute_check("PY007", root=simple, pyproject={}).result
+    assert compute_check(
+        "PY007", root_tree=DirectoryTree.scan(simple), pyproject={}
+    ).result
 
 
 @pytest.mark.parametrize(
@@ -164,30 +199,34 @@ def test_py007_pyproject_sections(tmp_path: Path, section: str):
     pyproject = tomllib.loads(section)
     simple = tmp_path / "simple"
     simple.mkdir()
-    assert compute_check("PY007", root=simple, pyproject=pyproject).result
+    assert compute_check(
+        "PY007", root_tree=DirectoryTree.scan(simple), pyproject=pyproject
+    ).result
 
 
 def test_py007_missing(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
-    assert not compute_check("PY007", root=simple, pyproject={}).result
+    assert not compute_check(
+        "PY007", root_tree=DirectoryTree.scan(simple), pyproject={}
+    ).result
 
 
 def test_py008(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
     simple.joinpath(".gitignore").touch()
-    assert compute_check("PY008", root=simple).result
+    assert compute_check("PY008", root_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py008_not_file(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
     simple.joinpath(".gitignore").mkdir()
-    assert not compute_check("PY008", root=simple).result
+    assert not compute_check("PY008", root_tree=DirectoryTree.scan(simple)).result
 
 
 def test_py008_missing(tmp_path: Path):
     simple = tmp_path / "simple"
     simple.mkdir()
-    assert not compute_check("PY008", root=simple).result
+    assert not compute_check("PY008", root_tree=DirectoryTree.scan(simple)).result
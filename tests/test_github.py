@@ -1,6 +1,16 @@
+from pathlib import Path
+
+import pytest
 import yaml
 from repo_review.testing import compute_check
 
+from sp_repo_review.checks.github import (
+    WORKERS_ENV,
+    get_workers,
+    workflow_steps,
+    workflows,
+)
+
 
 def test_gh100() -> None:
     workflows = yaml.safe_load(
@@ -107,7 +117,9 @@ def test_gh104() -> None:
                     name: docs
         """
     )
-    assert compute_check("GH104", workflows=workflows).result
+    assert compute_check(
+        "GH104", workflows=workflows, workflow_steps=workflow_steps(workflows)
+    ).result
 
 
 def test_gh104_duplicate_names() -> None:
@@ -125,7 +137,9 @@ def test_gh104_duplicate_names() -> None:
                     name: wheel
         """
     )
-    res = compute_check("GH104", workflows=workflows)
+    res = compute_check(
+        "GH104", workflows=workflows, workflow_steps=workflow_steps(workflows)
+    )
     assert not res.result
     assert "Multiple matching upload artifact names" in res.err_msg
 
@@ -145,7 +159,9 @@ def test_gh104_matrix_without_substitution() -> None:
                     name: wheel
         """
     )
-    res = compute_check("GH104", workflows=workflows)
+    res = compute_check(
+        "GH104", workflows=workflows, workflow_steps=workflow_steps(workflows)
+    )
     assert not res.result
     assert "No variable substitutions were detected" in res.err_msg
 
@@ -160,7 +176,7 @@ def test_gh105_trusted_publishing() -> None:
                 - uses: pypa/gh-action-pypi-publish@release/v1
         """
     )
-    assert compute_check("GH105", workflows=workflows).result
+    assert compute_check("GH105", workflow_steps=workflow_steps(workflows)).result
 
 
 def test_gh105_token_based_upload() -> None:
@@ -175,7 +191,7 @@ def test_gh105_token_based_upload() -> None:
                     password: ${{ secrets.pypi_password }}
         """
     )
-    res = compute_check("GH105", workflows=workflows)
+    res = compute_check("GH105", workflow_steps=workflow_steps(workflows))
     assert not res.result
     assert "Token-based publishing" in res.err_msg
 
@@ -288,3 +304,66 @@ def test_gh212_missing_groups() -> None:
         """
     )
     assert not compute_check("GH212", dependabot=dependabot).result
+
+
+def test_workflow_steps() -> None:
+    workflows = yaml.safe_load(
+        """
+        ci:
+          jobs:
+            build:
+              steps:
+                - run: echo hi
+                - uses: actions/upload-artifact@v4
+                  with:
+                    name: dist
+            weird: not-a-job
+        cd:
+          jobs:
+            publish:
+              steps:
+                - uses: pypa/gh-action-pypi-publish@release/v1
+                - uses: ./.github/actions/local
+        """
+    )
+    steps = workflow_steps(workflows)
+    assert [(s.workflow, s.job, s.step, s.action) for s in steps.steps] == [
+        ("ci", "build", 1, "actions/upload-artifact"),
+        ("cd", "publish", 0, "pypa/gh-action-pypi-publish"),
+        ("cd", "publish", 1, "./.github/actions/local"),
+    ]
+    (upload,) = steps.find("actions/upload-artifact")
+    assert upload.ref == "v4"
+    assert upload.inputs == {"name": "dist"}
+    assert steps.find("pypa/gh-action-pypi-publish")[0].ref == "release/v1"
+    assert [s.job for s in steps.find("pypa/")] == ["publish"]
+    assert steps.find("actions/download-artifact") == []
+
+
+def test_workflows_parallel(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    workflows_dir = tmp_path / ".github" / "workflows"
+    workflows_dir.mkdir(parents=True)
+    for name in ["b", "c", "a"]:
+        workflows_dir.joinpath(f"{name}.yml").write_text(
+            f"name: {name}\njobs: {{}}\n", encoding="utf-8"
+        )
+    workflows_dir.joinpath("notes.txt").write_text("ignored", encoding="utf-8")
+
+    monkeypatch.setenv(WORKERS_ENV, "1")
+    serial = workflows(tmp_path)
+    monkeypatch.setenv(WORKERS_ENV, "2")
+    parallel = workflows(tmp_path)
+
+    assert list(serial) == ["a", "b", "c"]
+    assert parallel == serial
+    assert list(parallel) == list(serial)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"), [("", 1), ("3", 3), ("-2", 1), ("many", 1), (" 2 ", 2)]
+)
+def test_get_workers(
+    monkeypatch: pytest.MonkeyPatch, value: str, expected: int
+) -> None:
+    monkeypatch.setenv(WORKERS_ENV, value)
+    assert get_workers() == expected
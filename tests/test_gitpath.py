@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import subprocess
+from typing import TYPE_CHECKING
+
+import pytest
+from repo_review.processor import as_simple_dict
+
+from sp_repo_review.batch import review
+from sp_repo_review.batch.__main__ import main
+from sp_repo_review.cache import MAX_FILE_SIZE_ENV, FileTooLarge
+from sp_repo_review.gitpath import GitFiles, GitObjects, is_bare_repository, open_ref
+from sp_repo_review.processor import process
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+FILES = {
+    "pyproject.toml": b"[project]\nname = 'x'\n\n[tool.pytest.ini_options]\nminversion = '6'\n",
+    "README.md": b"# x\n",
+    "src/x/__init__.py": b"",
+    ".github/workflows/ci.yml": b"on: push\n",
+    "data/large.bin": bytes(100_000),
+}
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(  # noqa: S603
+        [
+            "git",
+            "-C",
+            str(repo),
+            "-c",
+            "user.name=Test",
+            "-c",
+            "user.email=test@example.com",
+            "-c",
+            "commit.gpgsign=false",
+            *args,
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+    ).stdout
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    "A repository with one commit of just the README, then one of everything."
+    repo = tmp_path / "tree"
+    repo.mkdir()
+    git(repo, "init", "-q", "-b", "main")
+    repo.joinpath("README.md").write_bytes(FILES["README.md"])
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "first")
+    git(repo, "tag", "first")
+    for name, content in FILES.items():
+        path = repo / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "second")
+    return repo
+
+
+@pytest.fixture
+def bare(tree: Path, tmp_path: Path) -> Path:
+    git(tmp_path, "clone", "-q", "--bare", str(tree), "mirror.git")
+    return tmp_path / "mirror.git"
+
+
+def test_files(bare: Path):
+    assert is_bare_repository(bare)
+    objects = GitObjects(bare)
+    try:
+        files = GitFiles(objects, "main")
+        assert files.keys() == FILES.keys()
+        assert files.directories == {
+            ".github",
+            ".github/workflows",
+            "src",
+            "src/x",
+            "data",
+        }
+        assert files.read == []
+        assert files["README.md"] == b"# x\n"
+        assert files.read == ["README.md"]
+
+        assert GitFiles(objects, "first").keys() == {"README.md"}
+        with pytest.raises(ValueError, match="not a commit"):
+            GitFiles(objects, "missing")
+    finally:
+        objects.close()
+
+
+def test_size_limit(bare: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv(MAX_FILE_SIZE_ENV, "50")
+    with open_ref(bare, "main") as root:
+        assert isinstance(root.files, GitFiles)
+        assert root.files.objects.sizes(["main:data/large.bin", "main:x"]) == [
+            100_000,
+            None,
+        ]
+        with pytest.raises(FileTooLarge, match=r"large\.bin` is larger than 50 bytes"):
+            root.files["data/large.bin"]
+        assert root.files["README.md"] == b"# x\n"
+        assert root.files.read == ["README.md"]
+
+        results = {r.name: r for r in process(root)[1]}
+        assert results["PP002"].result is False
+        assert "pyproject.toml` is larger than 50 bytes" in results["PP002"].err_msg
+
+
+def test_not_a_repository(tmp_path: Path):
+    assert not is_bare_repository(tmp_path)
+    with pytest.raises(OSError, match="git repository"), open_ref(tmp_path):
+        pass
+
+
+def test_review_matches_checkout(bare: Path, tree: Path):
+    with open_ref(bare, "main") as root:
+        families, results = process(root)
+        assert isinstance(root.files, GitFiles)
+        read = set(root.files.read)
+
+    expected_families, expected = process(tree)
+    assert families == expected_families
+    assert as_simple_dict(results) == as_simple_dict(expected)
+    # Only the blobs the fixtures asked for are read
+    assert "pyproject.toml" in read
+    assert "data/large.bin" not in read
+
+
+def test_batch_review(bare: Path, tree: Path, capsys: pytest.CaptureFixture[str]):
+    # Bare repositories are reviewed at HEAD
+    result = review(bare, check_cache=False)
+    assert not result.error
+    assert result.as_dict() == review(tree, check_cache=False).as_dict()
+
+    older = review(tree, ref="first", check_cache=False)
+    assert older.as_dict() != result.as_dict()
+    assert not older.error
+
+    with pytest.raises(SystemExit):
+        main([str(bare), "--ref", "missing", "--format", "jsonl"])
+    assert "not a commit" in capsys.readouterr().out
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+from typing import TYPE_CHECKING
+
+import pytest
+from repo_review.families import sort_family_keys
+from repo_review.processor import as_simple_dict
+from repo_review.processor import process as repo_review_process
+
+from sp_repo_review.incremental import (
+    Changes,
+    affected_checks,
+    affected_fixtures,
+    dependents,
+    review,
+)
+from sp_repo_review.incremental.__main__ import main
+from sp_repo_review.processor import Registry
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+
+@pytest.fixture(scope="module")
+def registry() -> Registry:
+    return Registry.load()
+
+
+def make_repo(path: Path) -> None:
+    path.joinpath("pyproject.toml").write_text(
+        "[project]\nname = 'x'\n\n[tool.pytest.ini_options]\nminversion = '6'\n",
+        encoding="utf-8",
+    )
+    path.joinpath("README.md").write_text("# x\n", encoding="utf-8")
+    path.joinpath(".pre-commit-config.yaml").write_text(
+        "repos:\n  - repo: https://github.com/astral-sh/ruff-pre-commit\n"
+        "    hooks:\n      - id: ruff\n",
+        encoding="utf-8",
+    )
+    workflows = path / ".github/workflows"
+    workflows.mkdir(parents=True)
+    workflows.joinpath("ci.yml").write_text(
+        "on: push\njobs:\n  test:\n    steps:\n      - uses: actions/checkout@v4\n",
+        encoding="utf-8",
+    )
+
+
+def test_changes_from_paths():
+    changes = Changes.from_paths(["./README.md", "docs/index.md"])
+    assert changes.modified == {"README.md", "docs/index.md"}
+    assert changes.added_or_removed == changes.modified
+    assert changes.directories == {"", "docs"}
+    assert Changes(modified=frozenset({"README.md"})).directories == frozenset()
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        (".github/workflows/ci.yml", {"workflows", "workflow_steps"}),
+        (".pre-commit-config.yaml", {"precommit", "precommit_index"}),
+        ("noxfile.py", {"noxfile"}),
+        ("pyproject.toml", {"pyproject", "pytest", "ruff"}),
+        ("README.md", set()),
+        ("src/pkg/__init__.py", set()),
+    ],
+)
+def test_affected_fixtures(registry: Registry, path: str, expected: set[str]):
+    changes = Changes(modified=frozenset({path}))
+    # list_all takes the repository without declaring any files
+    assert affected_fixtures(changes, registry.fixtures) == {*expected, "list_all"}
+
+
+def test_affected_fixtures_listing(registry: Registry):
+    added = Changes(added_or_removed=frozenset({"src/pkg/__init__.py"}))
+    assert {"root_tree", "package_tree"} <= affected_fixtures(added, registry.fixtures)
+
+    deep = Changes(added_or_removed=frozenset({"src/pkg/sub/mod.py"}))
+    assert "root_tree" in affected_fixtures(deep, registry.fixtures)
+
+
+def test_affected_fixtures_subdir(registry: Registry):
+    changes = Changes(modified=frozenset({"pkg/pyproject.toml"}))
+    assert "pyproject" in affected_fixtures(changes, registry.fixtures, subdir="pkg")
+    assert "pyproject" not in affected_fixtures(changes, registry.fixtures)
+
+
+def test_affected_checks(registry: Registry, tmp_path: Path):
+    make_repo(tmp_path)
+    checks = registry.collect(tmp_path).checks
+    affected = affected_checks(checks, {"workflows", "workflow_steps"})
+    assert {"GH100", "GH101"} <= affected
+    assert not any(name.startswith(("PP", "PC", "NOX")) for name in affected)
+
+    assert "PC100" in dependents(checks, {"PY006"})
+    assert "PY006" not in dependents(checks, {"PY006"})
+
+
+def write_noxfile(path: Path) -> None:
+    path.joinpath("noxfile.py").write_text(
+        "import nox\n\n@nox.session\ndef tests(session):\n    session.run('pytest')\n",
+        encoding="utf-8",
+    )
+
+
+def edit_workflow(path: Path) -> None:
+    path.joinpath(".github/workflows/ci.yml").write_text(
+        "on: push\njobs:\n  test:\n    steps:\n      - uses: actions/checkout@v3\n",
+        encoding="utf-8",
+    )
+
+
+def edit_pyproject(path: Path) -> None:
+    path.joinpath("pyproject.toml").write_text(
+        "[project]\nname = 'x'\n\n[tool.pytest.ini_options]\nminversion = '6'\n"
+        "xfail_strict = true\n\n[tool.repo-review]\nignore = {GH101 = 'no names'}\n",
+        encoding="utf-8",
+    )
+
+
+def remove_precommit(path: Path) -> None:
+    path.joinpath(".pre-commit-config.yaml").unlink()
+
+
+@pytest.mark.parametrize(
+    ("edit", "changed"),
+    [
+        (write_noxfile, "noxfile.py"),
+        (edit_workflow, ".github/workflows/ci.yml"),
+        (edit_pyproject, "pyproject.toml"),
+        (remove_precommit, ".pre-commit-config.yaml"),
+    ],
+)
+def test_review_matches_full(
+    registry: Registry, tmp_path: Path, edit: Callable[[Path], None], changed: str
+):
+    make_repo(tmp_path)
+    _, before = repo_review_process(tmp_path)
+    edit(tmp_path)
+
+    families, results, rerun = review(
+        tmp_path,
+        as_simple_dict(before),
+        Changes.from_paths([changed]),
+        registry=registry,
+    )
+    expected = repo_review_process(tmp_path)
+    assert results == expected.results
+    assert families == expected.families
+    assert len(rerun) < len(results)
+
+
+def test_review_readme_reruns_little(registry: Registry, tmp_path: Path):
+    make_repo(tmp_path)
+    _, before = repo_review_process(tmp_path)
+    tmp_path.joinpath("README.md").write_text("# x\n\nMore.\n", encoding="utf-8")
+
+    _, results, rerun = review(
+        tmp_path,
+        as_simple_dict(before),
+        Changes(modified=frozenset({"README.md"})),
+        registry=registry,
+    )
+    assert results == before
+    # Only checks that look at the repository directly
+    assert rerun <= {"RF003", "RTD103"}
+
+
+def test_review_missing_previous(registry: Registry, tmp_path: Path):
+    make_repo(tmp_path)
+    _, results, rerun = review(tmp_path, {}, Changes(), registry=registry)
+    assert results == repo_review_process(tmp_path).results
+    assert rerun == {r.name for r in results}
+
+
+def git(path: Path, *args: str) -> None:
+    subprocess.run(  # noqa: S603
+        ["git", "-C", str(path), *args], check=True, capture_output=True
+    )
+
+
+def test_changes_from_git(tmp_path: Path):
+    make_repo(tmp_path)
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")
+    git(
+        tmp_path,
+        *("-c", "user.name=x", "-c", "user.email=x@x", "commit", "-qm", "init"),
+    )
+
+    tmp_path.joinpath("README.md").write_text("# y\n", encoding="utf-8")
+    git(tmp_path, "mv", "pyproject.toml", "setup.toml")
+    write_noxfile(tmp_path)
+    # Not UTF-8; comes back as the same string the filesystem gives
+    undecodable = os.fsdecode(b"caf\xe9.txt")
+    tmp_path.joinpath(undecodable).write_text("", encoding="utf-8")
+
+    changes = Changes.from_git(tmp_path, "HEAD")
+    assert changes.modified == {"README.md"}
+    assert changes.added_or_removed == {
+        "pyproject.toml",
+        "setup.toml",
+        "noxfile.py",
+        undecodable,
+    }
+
+    with pytest.raises(ValueError, match="Not a revision"):
+        Changes.from_git(tmp_path, "--output=x")
+
+
+def test_incremental_cli(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    make_repo(repo)
+    families, results = repo_review_process(repo)
+    previous = tmp_path / "previous.json"
+    previous.write_text(
+        json.dumps({"checks": as_simple_dict(results)}), encoding="utf-8"
+    )
+    output = tmp_path / "output.json"
+
+    with pytest.raises(SystemExit) as exc:
+        main(
+            [
+                str(repo),
+                *("--previous", str(previous)),
+                *("--changed", "README.md"),
+                *("-o", str(output)),
+                "--stats",
+            ]
+        )
+    assert exc.value.code == 3
+    assert "checks" in capsys.readouterr().err
+
+    result = json.loads(output.read_text(encoding="utf-8"))
+    assert result["checks"] == as_simple_dict(results)
+    assert list(result["families"]) == sort_family_keys(families)
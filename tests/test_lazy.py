@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import copy
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from repo_review.processor import collect_all
+from repo_review.processor import process as repo_review_process
+
+from sp_repo_review.lazy import digest, force, is_evaluated, lazy, lazy_mapping, wrap
+from sp_repo_review.processor import needed_checks, process
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+
+def test_lazy_mapping():
+    calls = []
+
+    def load() -> dict[str, Any]:
+        calls.append(1)
+        return {"a": {"b": 1}}
+
+    value = lazy_mapping(load)
+    assert not is_evaluated(value)
+    assert not calls
+
+    match value:
+        case {"a": {"b": 1}}:
+            pass
+        case _:
+            pytest.fail("mapping pattern didn't match")
+
+    assert value.get("a") == {"b": 1}
+    assert "a" in value
+    assert list(value.items()) == [("a", {"b": 1})]
+    assert is_evaluated(value)
+    assert calls == [1]
+
+
+def test_lazy_mapping_not_a_mapping():
+    def load() -> Any:
+        "Like loading an empty YAML file."
+        return None
+
+    value: dict[str, Any] = lazy_mapping(load)
+    assert len(value) == 0
+    assert value.get("version") is None
+    match value:
+        case {"version": _}:
+            pytest.fail("empty mapping matched")
+    assert copy.deepcopy(value) == {}
+
+
+def test_lazy_copy_shares_parse():
+    calls = []
+
+    def load() -> dict[str, Any]:
+        calls.append(1)
+        return {"a": [1]}
+
+    value = lazy_mapping(load)
+    value_copy = copy.deepcopy(value)
+    assert value_copy == value
+    assert not calls
+
+    value_copy["a"].append(2)
+    assert calls == [1]
+    assert force(value) == {"a": [1]}
+    assert value != value_copy
+    assert calls == [1]
+
+
+def test_lazy_unread_copy_equal_without_comparing():
+    compared = []
+
+    class Value:
+        def __eq__(self, other: object) -> bool:
+            compared.append(1)
+            return isinstance(other, Value)
+
+        __hash__ = None  # type: ignore[assignment]
+
+    value = lazy(Value)
+    force(value)
+    value_copy = copy.deepcopy(value)
+    assert value_copy == value
+    assert value == value_copy
+    assert not compared
+
+    force(value_copy)
+    assert value_copy == value
+    assert compared == [1]
+
+
+def test_lazy_digest_shared():
+    calls = []
+
+    def func(value: dict[str, int]) -> bytes:
+        calls.append(1)
+        return repr(sorted(value.items())).encode()
+
+    value = lazy_mapping(lambda: {"a": 1})
+    value_copy = copy.deepcopy(value)
+    assert digest(value, func) == digest(value_copy, func) == b"[('a', 1)]"
+    assert calls == [1]
+    assert not is_evaluated(value_copy)
+
+    assert digest({"a": 1}, func) == b"[('a', 1)]"
+    assert value_copy["a"] == 1
+    assert digest(value_copy, func) == b"[('a', 1)]"
+    assert calls == [1, 1, 1]
+
+
+def test_lazy_wrap():
+    calls = []
+
+    def record(func: Callable[[], Any]) -> Callable[[], Any]:
+        def run() -> Any:
+            calls.append(1)
+            return func()
+
+        return run
+
+    value = lazy_mapping(lambda: {"a": 1})
+    wrap(value, record)
+    assert value["a"] == 1
+    assert calls == [1]
+    wrap(value, record)
+    wrap({"a": 1}, record)
+    assert value["a"] == 1
+    assert calls == [1]
+
+
+def test_lazy_object():
+    value = lazy(lambda: {"a": 1})
+    assert not is_evaluated(value)
+    assert value.get("a") == 1
+    assert "a" in value
+    assert bool(value)
+    assert force(value) == {"a": 1}
+
+
+def make_repo(path: Path) -> None:
+    path.joinpath("pyproject.toml").write_text(
+        "[project]\nname = 'x'\n", encoding="utf-8"
+    )
+    path.joinpath(".pre-commit-config.yaml").write_text("repos: []\n", encoding="utf-8")
+    path.joinpath(".readthedocs.yaml").write_text("version: 2\n", encoding="utf-8")
+    path.joinpath("noxfile.py").write_text("import nox\n", encoding="utf-8")
+    workflows = path / ".github/workflows"
+    workflows.mkdir(parents=True)
+    workflows.joinpath("ci.yml").write_text("on: push\njobs: {}\n", encoding="utf-8")
+
+
+def test_fixtures_are_lazy(tmp_path: Path):
+    make_repo(tmp_path)
+    fixtures, _, _ = collect_all(tmp_path)
+    for name in ("precommit", "readthedocs", "noxfile", "workflows", "workflow_steps"):
+        assert not is_evaluated(fixtures[name]), name
+
+
+def test_needed_checks():
+    class A:
+        requires: frozenset[str] = frozenset()
+
+    class B:
+        requires = frozenset({"A1"})
+
+    checks: dict[str, Any] = {"A1": A(), "B1": B(), "C1": A()}
+    assert list(needed_checks(checks, select={"B"})) == ["A1", "B1"]
+    assert list(needed_checks(checks, ignore={"B1"})) == ["A1", "C1"]
+    assert list(needed_checks(checks, select={"A"}, keep={"C1"})) == ["A1", "C1"]
+
+
+@pytest.mark.parametrize(
+    ("select", "ignore"),
+    [
+        (set(), set()),
+        ({"PP"}, set()),
+        ({"GH"}, {"GH102"}),
+        ({"RTD102"}, set()),
+    ],
+)
+def test_process_same_results(tmp_path: Path, select: set[str], ignore: set[str]):
+    make_repo(tmp_path)
+    expected = repo_review_process(tmp_path, select=select, ignore=ignore)
+    result = process(tmp_path, select=select, ignore=ignore)
+    assert result == expected
+
+
+def test_process_narrow_skips_parsing(tmp_path: Path):
+    make_repo(tmp_path)
+    collected = collect_all(tmp_path)
+    process(tmp_path, select={"PP"}, collected=collected)
+    assert not is_evaluated(collected.fixtures["workflows"])
+    assert not is_evaluated(collected.fixtures["noxfile"])
+    assert not is_evaluated(collected.fixtures["readthedocs"])
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from repo_review.processor import as_simple_dict
+
+from sp_repo_review.memorypath import MemoryPath
+from sp_repo_review.processor import process
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+FILES = {
+    "pyproject.toml": b"[project]\nname = 'x'\n\n[tool.pytest.ini_options]\nminversion = '6'\n",
+    "README.md": b"# x\n",
+    "./src/x/__init__.py": b"",
+    ".github/workflows/ci.yml": b"on: push\n",
+}
+
+
+def test_navigation():
+    root = MemoryPath(files=FILES, directories=frozenset({"docs"}))
+    assert root.is_dir()
+    assert not root.is_file()
+    assert str(root) == "."
+    assert [p.name for p in root.iterdir()] == [
+        ".github",
+        "README.md",
+        "docs",
+        "pyproject.toml",
+        "src",
+    ]
+
+    assert root.joinpath("src", "x").is_dir()
+    assert (root / "src/x/__init__.py").is_file()
+    assert (root / "src" / "x" / ".." / "x").path == "src/x"
+    assert root.joinpath("docs").is_dir()
+    assert list(root.joinpath("docs").iterdir()) == []
+    assert not root.joinpath("missing").is_dir()
+    assert not root.joinpath("missing").is_file()
+
+    workflows = root / ".github/workflows"
+    assert [str(p) for p in workflows.iterdir()] == [".github/workflows/ci.yml"]
+    assert (workflows / "ci.yml").name == "ci.yml"
+
+
+def test_read():
+    root = MemoryPath(files=FILES)
+    assert root.joinpath("README.md").read_text(encoding="utf-8") == "# x\n"
+    assert root.joinpath("README.md").read_bytes() == b"# x\n"
+    with root.joinpath("README.md").open("rb") as f:
+        assert f.read() == b"# x\n"
+
+    with pytest.raises(FileNotFoundError):
+        root.joinpath("missing").read_bytes()
+    with pytest.raises(IsADirectoryError):
+        root.joinpath("src").read_bytes()
+    with pytest.raises(NotADirectoryError):
+        list(root.joinpath("README.md").iterdir())
+    with pytest.raises(FileNotFoundError):
+        list(root.joinpath("missing").iterdir())
+
+
+def test_glob():
+    root = MemoryPath(files=FILES)
+    assert [str(p) for p in root.glob("*.toml")] == ["pyproject.toml"]
+    assert [str(p) for p in root.glob("**/*.py")] == ["src/x/__init__.py"]
+    assert [str(p) for p in root.joinpath("src").glob("*")] == ["src/x"]
+
+
+def test_from_directory(tmp_path: Path):
+    for name, content in FILES.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    tmp_path.joinpath("docs").mkdir()
+    tmp_path.joinpath(".git/objects").mkdir(parents=True)
+    tmp_path.joinpath(".git/HEAD").write_text(
+        "ref: refs/heads/main\n", encoding="utf-8"
+    )
+
+    root = MemoryPath.from_directory(tmp_path)
+    assert root.files.keys() == {
+        "pyproject.toml",
+        "README.md",
+        "src/x/__init__.py",
+        ".github/workflows/ci.yml",
+    }
+    # Excluded directories are listed, but empty
+    assert root.joinpath(".git").is_dir()
+    assert list(root.joinpath(".git").iterdir()) == []
+    assert root.joinpath("docs").is_dir()
+
+    families, results = process(root)
+    expected_families, expected = process(tmp_path)
+    assert families == expected_families
+    assert as_simple_dict(results) == as_simple_dict(expected)
+
+
+def test_review_with_subdir():
+    files = {f"pkg/{name}": content for name, content in FILES.items()}
+    _, results = process(MemoryPath(files=files), subdir="pkg", select={"PP"})
+    assert {r.name: r.result for r in results}["PP301"] is True
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from sp_repo_review.batch import find_packages, review, review_many, review_monorepo
+from sp_repo_review.batch.__main__ import main
+from sp_repo_review.processor import Registry, root_fixtures
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+PRECOMMIT = """\
+repos:
+  - repo: https://github.com/astral-sh/ruff-pre-commit
+    rev: v0.1.0
+    hooks:
+      - id: ruff
+"""
+
+
+@pytest.fixture
+def monorepo(tmp_path: Path) -> Path:
+    "A workspace root and two packages, one with a build-system table."
+    root = tmp_path / "mono"
+    root.mkdir()
+    root.joinpath(".pre-commit-config.yaml").write_text(PRECOMMIT, encoding="utf-8")
+    root.joinpath("pyproject.toml").write_text(
+        "[tool.uv.workspace]\n", encoding="utf-8"
+    )
+    for name in ("a", "b"):
+        package = root / "packages" / name
+        package.mkdir(parents=True)
+        package.joinpath("pyproject.toml").write_text(
+            f"[project]\nname = '{name}'\n", encoding="utf-8"
+        )
+    with root.joinpath("packages/b/pyproject.toml").open("a", encoding="utf-8") as f:
+        f.write("[build-system]\nrequires = ['hatchling']\nbuild-backend = 'x'\n")
+    for skipped in (".hidden", "node_modules/x", "venv"):
+        root.joinpath(skipped).mkdir(parents=True)
+        root.joinpath(skipped, "pyproject.toml").write_text("", encoding="utf-8")
+    root.joinpath("venv/pyvenv.cfg").write_text("", encoding="utf-8")
+    return root
+
+
+def test_find_packages(monorepo: Path):
+    assert find_packages(monorepo) == ["", "packages/a", "packages/b"]
+
+
+def test_root_fixtures():
+    def pyproject(package: object) -> None: ...
+    def precommit(root: object) -> None: ...
+    def hooks(precommit: object) -> None: ...
+    def both(root: object, pyproject: object) -> None: ...
+
+    fixtures: dict[str, Callable[..., Any]] = {
+        "pyproject": pyproject,
+        "precommit": precommit,
+        "hooks": hooks,
+        "both": both,
+    }
+    assert root_fixtures(fixtures) == {"precommit", "hooks"}
+
+
+def test_collect_shared(monorepo: Path):
+    registry = Registry.load()
+    first = registry.collect(monorepo, "packages/a")
+    names = root_fixtures(registry.fixtures)
+    assert {"precommit", "workflows"} <= names
+    assert "pyproject" not in names
+
+    shared = {name: first.fixtures[name] for name in names}
+    second = registry.collect(monorepo, "packages/b", shared=shared)
+    assert second.fixtures["precommit"] is first.fixtures["precommit"]
+    assert second.fixtures["pyproject"]["project"]["name"] == "b"
+
+
+@pytest.mark.parametrize("check_cache", [True, False])
+def test_review_monorepo(monorepo: Path, check_cache: bool):
+    reviews = review_monorepo(monorepo, check_cache=check_cache)
+    assert [r.path for r in reviews] == [
+        str(monorepo),
+        str(monorepo / "packages/a"),
+        str(monorepo / "packages/b"),
+    ]
+    # Same as reviewing each package on its own
+    for result, subdir in zip(reviews, ("", "packages/a", "packages/b"), strict=True):
+        expected = review(monorepo, subdir=subdir, check_cache=check_cache)
+        assert result.as_dict() == expected.as_dict()
+
+    results = [{r.name: r.result for r in review.results} for review in reviews]
+    assert [r["PP002"] for r in results] == [False, False, True]
+    assert results[0]["PC110"] is results[1]["PC110"] is results[2]["PC110"]
+
+
+def test_review_monorepo_errors(tmp_path: Path):
+    (result,) = review_monorepo(tmp_path)
+    assert result.error == f"FileNotFoundError: no pyproject.toml in {tmp_path}"
+
+    with pytest.raises(ValueError, match="monorepo"):
+        list(review_many([tmp_path], monorepo=True, subdir="x"))
+
+
+def test_monorepo_cli(monorepo: Path, capsys: pytest.CaptureFixture[str]):
+    with pytest.raises(SystemExit):
+        main([str(monorepo), "--monorepo", "-j1", "--select=PY,PP"])
+    output = json.loads(capsys.readouterr().out)
+    assert list(output) == [
+        str(monorepo),
+        str(monorepo / "packages/a"),
+        str(monorepo / "packages/b"),
+    ]
+    assert output[str(monorepo / "packages/b")]["checks"]["PP002"]["result"] is True
+
+    with pytest.raises(SystemExit):
+        main([str(monorepo), "--monorepo", "--shard=1/2"])
+    assert "--monorepo" in capsys.readouterr().err
@@ -4,7 +4,8 @@ import pytest
 import yaml
 from repo_review.testing import compute_check
 
-from sp_repo_review.checks.precommit import repo_review_checks
+from sp_repo_review.checks.general import DirectoryTree
+from sp_repo_review.checks.precommit import precommit_index, repo_review_checks
 
 
 @pytest.fixture(params=["ruff", "ruff-check"])
@@ -17,7 +18,7 @@ def test_pc100():
         repos:
           - repo: https://github.com/pre-commit/pre-commit-hooks
     """)
-    assert compute_check("PC100", precommit=precommit).result
+    assert compute_check("PC100", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc110_black():
@@ -25,7 +26,7 @@ def test_pc110_black():
         repos:
           - repo: https://github.com/psf/black-pre-commit-mirror
     """)
-    assert compute_check("PC110", precommit=precommit).result
+    assert compute_check("PC110", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc110_ruff():
@@ -35,7 +36,7 @@ def test_pc110_ruff():
             hooks:
               - id: ruff-format
     """)
-    assert compute_check("PC110", precommit=precommit).result
+    assert compute_check("PC110", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc110_ruff_no_hook():
@@ -43,7 +44,7 @@ def test_pc110_ruff_no_hook():
         repos:
           - repo: https://github.com/astral-sh/ruff-pre-commit
     """)
-    res = compute_check("PC110", precommit=precommit)
+    res = compute_check("PC110", precommit_index=precommit_index(precommit))
     assert not res.result
     assert "ruff-format" in res.err_msg
 
@@ -53,7 +54,7 @@ def test_pc110_rename():
         repos:
           - repo: https://github.com/psf/black
     """)
-    res = compute_check("PC110", precommit=precommit)
+    res = compute_check("PC110", precommit_index=precommit_index(precommit))
     assert not res.result
     assert "black-pre-commit-mirror" in res.err_msg
 
@@ -63,7 +64,7 @@ def test_pc111():
         repos:
           - repo: https://github.com/adamchainz/blacken-docs
     """)
-    assert compute_check("PC111", precommit=precommit).result
+    assert compute_check("PC111", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc111_ruff_markdown():
@@ -74,7 +75,7 @@ def test_pc111_ruff_markdown():
               - id: ruff-format
                 types_or: [python, pyi, jupyter, markdown, pyproject]
     """)
-    assert compute_check("PC111", precommit=precommit).result
+    assert compute_check("PC111", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc111_ruff_default_types():
@@ -84,7 +85,7 @@ def test_pc111_ruff_default_types():
             hooks:
               - id: ruff-format
     """)
-    assert compute_check("PC111", precommit=precommit).result
+    assert compute_check("PC111", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc111_ruff_markdown_excluded():
@@ -95,7 +96,7 @@ def test_pc111_ruff_markdown_excluded():
               - id: ruff-format
                 types_or: [python, pyi, jupyter]
     """)
-    assert not compute_check("PC111", precommit=precommit).result
+    assert not compute_check("PC111", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc111_ruff_check_only():
@@ -105,7 +106,7 @@ def test_pc111_ruff_check_only():
             hooks:
               - id: ruff-check
     """)
-    assert not compute_check("PC111", precommit=precommit).result
+    assert not compute_check("PC111", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc111_rename():
@@ -113,7 +114,7 @@ def test_pc111_rename():
         repos:
           - repo: https://github.com/asottile/blacken-docs
     """)
-    res = compute_check("PC111", precommit=precommit)
+    res = compute_check("PC111", precommit_index=precommit_index(precommit))
     assert not res.result
     assert "adamchainz" in res.err_msg
 
@@ -125,7 +126,7 @@ def test_pc190_ruff_check():
             hooks:
               - id: ruff-check
     """)
-    assert compute_check("PC190", precommit=precommit).result
+    assert compute_check("PC190", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc190_ruff():
@@ -135,7 +136,7 @@ def test_pc190_ruff():
             hooks:
               - id: ruff
     """)
-    assert compute_check("PC190", precommit=precommit).result
+    assert compute_check("PC190", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc190_flake8():
@@ -143,7 +144,7 @@ def test_pc190_flake8():
         repos:
           - repo: https://github.com/pycqa/flake8
     """)
-    assert compute_check("PC190", precommit=precommit).result
+    assert compute_check("PC190", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc190_rename_ruff():
@@ -153,7 +154,7 @@ def test_pc190_rename_ruff():
             hooks:
               - id: ruff-check
     """)
-    res = compute_check("PC190", precommit=precommit)
+    res = compute_check("PC190", precommit_index=precommit_index(precommit))
     assert not res.result
     assert "astral-sh" in res.err_msg
 
@@ -163,7 +164,7 @@ def test_pc190_rename_flake8():
         repos:
           - repo: https://gitlab.com/pycqa/flake8
     """)
-    res = compute_check("PC190", precommit=precommit)
+    res = compute_check("PC190", precommit_index=precommit_index(precommit))
     assert not res.result
     assert "github" in res.err_msg
 
@@ -173,7 +174,7 @@ def test_pc140():
         repos:
           - repo: https://github.com/pre-commit/mirrors-mypy
     """)
-    assert compute_check("PC140", precommit=precommit).result
+    assert compute_check("PC140", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc140_pyrefly():
@@ -181,7 +182,7 @@ def test_pc140_pyrefly():
         repos:
           - repo: https://github.com/facebook/pyrefly-pre-commit
     """)
-    assert compute_check("PC140", precommit=precommit).result
+    assert compute_check("PC140", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc140_ty():
@@ -189,7 +190,7 @@ def test_pc140_ty():
         repos:
           - repo: https://github.com/astral-sh/ty-pre-commit
     """)
-    assert compute_check("PC140", precommit=precommit).result
+    assert compute_check("PC140", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc160_codespell():
@@ -197,7 +198,7 @@ def test_pc160_codespell():
         repos:
           - repo: https://github.com/codespell-project/codespell
     """)
-    assert compute_check("PC160", precommit=precommit).result
+    assert compute_check("PC160", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc160_typos():
@@ -205,7 +206,7 @@ def test_pc160_typos():
         repos:
           - repo: https://github.com/crate-ci/typos
     """)
-    assert compute_check("PC160", precommit=precommit).result
+    assert compute_check("PC160", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc170():
@@ -213,7 +214,7 @@ def test_pc170():
         repos:
           - repo: https://github.com/pre-commit/pygrep-hooks
     """)
-    assert compute_check("PC170", precommit=precommit).result
+    assert compute_check("PC170", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc180():
@@ -221,7 +222,7 @@ def test_pc180():
         repos:
           - repo: https://github.com/rbubley/mirrors-prettier
     """)
-    assert compute_check("PC180", precommit=precommit).result
+    assert compute_check("PC180", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc180_rename():
@@ -229,7 +230,7 @@ def test_pc180_rename():
         repos:
           - repo: https://github.com/pre-commit/mirrors-prettier
     """)
-    res = compute_check("PC180", precommit=precommit)
+    res = compute_check("PC180", precommit_index=precommit_index(precommit))
     assert not res.result
     assert "https://github.com/rbubley/mirrors-prettier" in res.err_msg
 
@@ -239,7 +240,7 @@ def test_pc180_alt_2():
         repos:
           - repo: https://github.com/hukkin/mdformat
     """)
-    assert compute_check("PC180", precommit=precommit).result
+    assert compute_check("PC180", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc180_rename_1():
@@ -247,7 +248,7 @@ def test_pc180_rename_1():
         repos:
           - repo: https://github.com/executablebooks/mdformat
     """)
-    res = compute_check("PC180", precommit=precommit)
+    res = compute_check("PC180", precommit_index=precommit_index(precommit))
     assert not res.result
     assert "https://github.com/hukkin/mdformat" in res.err_msg
 
@@ -257,7 +258,7 @@ def test_pc180_alt_3():
         repos:
           - repo: https://github.com/rvben/rumdl-pre-commit
     """)
-    assert compute_check("PC180", precommit=precommit).result
+    assert compute_check("PC180", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc180_alt_4():
@@ -265,7 +266,7 @@ def test_pc180_alt_4():
         repos:
           - repo: https://github.com/DavidAnson/markdownlint-cli2
     """)
-    assert compute_check("PC180", precommit=precommit).result
+    assert compute_check("PC180", precommit_index=precommit_index(precommit)).result
 
 
 def test_pc191(ruff_check: str):
@@ -276,7 +277,9 @@ def test_pc191(ruff_check: str):
               - id: {ruff_check}
                 args: ["--fix", "--show-fixes"]
     """)
-    assert compute_check("PC191", precommit=precommit, ruff={}).result
+    assert compute_check(
+        "PC191", precommit_index=precommit_index(precommit), ruff={}
+    ).result
 
 
 def test_pc191_ruffconfig(ruff_check: str):
@@ -287,7 +290,9 @@ def test_pc191_ruffconfig(ruff_check: str):
               - id: {ruff_check}
                 args: ["--fix"]
     """)
-    assert compute_check("PC191", precommit=precommit, ruff={"show-fixes": True}).result
+    assert compute_check(
+        "PC191", precommit_index=precommit_index(precommit), ruff={"show-fixes": True}
+    ).result
 
 
 @pytest.mark.parametrize("ruffconfig", [{}, None])
@@ -299,7 +304,9 @@ def test_pc191_no_show_fixes(ruff_check: str, ruffconfig):
               - id: {ruff_check}
                 args: ["--fix"]
     """)
-    res = compute_check("PC191", precommit=precommit, ruff=ruffconfig)
+    res = compute_check(
+        "PC191", precommit_index=precommit_index(precommit), ruff=ruffconfig
+    )
     assert not res.result
     assert "--show-fixes" in res.err_msg
 
@@ -309,7 +316,7 @@ def test_pc191_no_ruff():
         repos:
           - repo: https://github.com/pycqa/flake8
     """)
-    res = compute_check("PC191", precommit=precommit, ruff={})
+    res = compute_check("PC191", precommit_index=precommit_index(precommit), ruff={})
     assert res.result is None
 
 
@@ -321,7 +328,7 @@ def test_pc192():
               - id: ruff
                 args: ["--fix"]
     """)
-    res = compute_check("PC192", precommit=precommit)
+    res = compute_check("PC192", precommit_index=precommit_index(precommit))
     assert not res.result
     assert "ruff-check" in res.err_msg
 
@@ -333,7 +340,7 @@ def test_pc192_not_needed():
             hooks:
               - id: ruff-format
     """)
-    res = compute_check("PC192", precommit=precommit)
+    res = compute_check("PC192", precommit_index=precommit_index(precommit))
     assert res.result is None
 
 
@@ -342,7 +349,9 @@ def test_pc901():
         ci:
           autoupdate_commit_msg: 'chore: update pre-commit hooks'
     """)
-    assert compute_check("PC901", precommit=precommit, dependabot={}).result
+    assert compute_check(
+        "PC901", precommit_index=precommit_index(precommit), dependabot={}
+    ).result
 
 
 def test_pc901_not_needed():
@@ -350,14 +359,21 @@ def test_pc901_not_needed():
         updates:
           - package-ecosystem: "pre-commit"
     """)
-    assert compute_check("PC901", precommit={}, dependabot=dependabot).result is None
+    assert (
+        compute_check(
+            "PC901", precommit_index=precommit_index({}), dependabot=dependabot
+        ).result
+        is None
+    )
 
 
 def test_pc901_no_msg():
     precommit = yaml.safe_load("""
     repos:
     """)
-    res = compute_check("PC901", precommit=precommit, dependabot={})
+    res = compute_check(
+        "PC901", precommit_index=precommit_index(precommit), dependabot={}
+    )
     assert not res.result
     assert "autoupdate_commit_msg" in res.err_msg
 
@@ -367,14 +383,18 @@ def test_pc902():
         ci:
           autofix_commit_msg: 'style: pre-commit fixes'
     """)
-    assert compute_check("PC902", precommit=precommit, dependabot={}).result
+    assert compute_check(
+        "PC902", precommit_index=precommit_index(precommit), dependabot={}
+    ).result
 
 
 def test_pc902_no_msg():
     precommit = yaml.safe_load("""
     repos:
     """)
-    res = compute_check("PC902", precommit=precommit, dependabot={})
+    res = compute_check(
+        "PC902", precommit_index=precommit_index(precommit), dependabot={}
+    )
     assert not res.result
     assert "autofix_commit_msg" in res.err_msg
 
@@ -384,7 +404,12 @@ def test_pc902_not_needed():
         updates:
           - package-ecosystem: "pre-commit"
     """)
-    assert compute_check("PC902", precommit={}, dependabot=dependabot).result is None
+    assert (
+        compute_check(
+            "PC902", precommit_index=precommit_index({}), dependabot=dependabot
+        ).result
+        is None
+    )
 
 
 def test_pc903():
@@ -393,14 +418,18 @@ def test_pc903():
           autoupdate_schedule: "monthly"
 
     """)
-    assert compute_check("PC903", precommit=precommit, dependabot={}).result
+    assert compute_check(
+        "PC903", precommit_index=precommit_index(precommit), dependabot={}
+    ).result
 
 
 def test_pc903_no_msg():
     precommit = yaml.safe_load("""
     repos:
     """)
-    res = compute_check("PC903", precommit=precommit, dependabot={})
+    res = compute_check(
+        "PC903", precommit_index=precommit_index(precommit), dependabot={}
+    )
     assert not res.result
     assert "autoupdate_schedule" in res.err_msg
 
@@ -410,7 +439,12 @@ def test_pc903_not_needed():
         updates:
           - package-ecosystem: "pre-commit"
     """)
-    assert compute_check("PC903", precommit={}, dependabot=dependabot).result is None
+    assert (
+        compute_check(
+            "PC903", precommit_index=precommit_index({}), dependabot=dependabot
+        ).result
+        is None
+    )
 
 
 def test_repo_review_checks_skips_with_lefthook_only(tmp_path: Path) -> None:
@@ -423,5 +457,73 @@ def test_repo_review_checks_skips_with_lefthook_only(tmp_path: Path) -> None:
     # Create only a lefthook configuration
     (tmp_path / "lefthook.yml").write_text("hooks:\n", encoding="utf-8")
 
-    checks = repo_review_checks(list_all=False, root=tmp_path)
+    checks = repo_review_checks(list_all=False, root_tree=DirectoryTree.scan(tmp_path))
     assert checks == {}
+
+
+def test_precommit_index():
+    precommit = yaml.safe_load("""
+        repos:
+          - repo: https://github.com/Astral-sh/Ruff-Pre-Commit
+            hooks:
+              - id: ruff-check
+                args: ["--fix"]
+          - repo: https://github.com/pre-commit/pre-commit-hooks
+          - repo: https://github.com/astral-sh/ruff-pre-commit
+            hooks:
+              - id: ruff-format
+                types_or: [python, markdown]
+        ci:
+          autoupdate_schedule: monthly
+    """)
+    index = precommit_index(precommit)
+    assert list(index.repos) == [
+        "https://github.com/astral-sh/ruff-pre-commit",
+        "https://github.com/pre-commit/pre-commit-hooks",
+    ]
+    ruff = index.repos["https://github.com/astral-sh/ruff-pre-commit"]
+    assert ruff.ids == {"ruff-check", "ruff-format"}
+    assert ruff.hooks[0].args == ("--fix",)
+    assert ruff.hooks[0].types_or is None
+    assert ruff.hooks[1].types_or == ("python", "markdown")
+    assert index.ci == {"autoupdate_schedule": "monthly"}
+
+
+def test_precommit_index_nulls():
+    precommit = yaml.safe_load("""
+        repos:
+          - repo: https://github.com/astral-sh/ruff-pre-commit
+            hooks:
+              - id: ruff-check
+                args:
+              - id: ruff-format
+                types_or:
+              - id:
+    """)
+    index = precommit_index(precommit)
+    ruff = index.repos["https://github.com/astral-sh/ruff-pre-commit"]
+    assert [(h.id, h.args, h.types_or) for h in ruff.hooks] == [
+        ("ruff-check", (), None),
+        ("ruff-format", (), None),
+        ("", (), None),
+    ]
+    # Only the hooks are affected, not every check
+    assert compute_check("PC111", precommit_index=index).result
+    assert compute_check("PC190", precommit_index=index).result
+
+
+def test_precommit_index_empty():
+    index = precommit_index(yaml.safe_load("repos:"))
+    assert index.repos == {}
+    assert index.ci == {}
+
+
+def test_pc110_rename_listed_first():
+    precommit = yaml.safe_load("""
+        repos:
+          - repo: https://github.com/psf/black
+          - repo: https://github.com/psf/black-pre-commit-mirror
+    """)
+    res = compute_check("PC110", precommit_index=precommit_index(precommit))
+    assert not res.result
+    assert "black-pre-commit-mirror" in res.err_msg
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import time
+from typing import TYPE_CHECKING
+
+from repo_review.processor import as_simple_dict
+
+from sp_repo_review.processor import Registry, process
+from sp_repo_review.profile import Profiler
+from sp_repo_review.profile.__main__ import main
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def make_repo(path: Path) -> None:
+    path.joinpath("pyproject.toml").write_text(
+        "[project]\nname = 'x'\n\n[tool.pytest.ini_options]\nminversion = '6'\n",
+        encoding="utf-8",
+    )
+    workflows = path / ".github/workflows"
+    workflows.mkdir(parents=True)
+    workflows.joinpath("ci.yml").write_text("on: push\n", encoding="utf-8")
+
+
+def test_span_self_time():
+    profiler = Profiler()
+    with profiler.span("outer", "review"):
+        time.sleep(0.01)
+        with profiler.span("inner", "check"):
+            time.sleep(0.02)
+
+    inner, outer = profiler.events
+    assert (inner.name, outer.name) == ("inner", "outer")
+    assert outer.duration >= inner.duration + 0.01
+    assert outer.self_time == outer.duration - inner.duration
+    assert inner.self_time == inner.duration
+
+    stats = {s.name: s for s in profiler.summary()}
+    assert stats["outer"].calls == 1
+    assert stats["inner"].total == inner.duration
+
+
+def test_process(tmp_path: Path):
+    make_repo(tmp_path)
+    registry = Registry.load()
+    profiler = Profiler()
+    families, results = process(
+        tmp_path, registry=registry, profiler=profiler, select={"PP", "GH"}
+    )
+    expected_families, expected = process(
+        tmp_path, registry=registry, select={"PP", "GH"}
+    )
+    assert families == expected_families
+    assert as_simple_dict(results) == as_simple_dict(expected)
+
+    kinds = {(e.name, e.category) for e in profiler.events}
+    assert ("review", "review") in kinds
+    assert ("pyproject", "fixture") in kinds
+    assert ("workflows", "parse") in kinds
+    checks = {name for name, kind in kinds if kind == "check"}
+    assert {"PP301", "GH100"} <= checks
+    # PY001 is run as a requirement, but not reported
+    assert checks <= {r.name for r in results} | {"PY001"}
+    # Unselected checks don't run, so their fixtures aren't parsed
+    assert ("precommit", "parse") not in kinds
+
+
+def test_trace():
+    profiler = Profiler()
+    with profiler.span("a", "check"):
+        pass
+    (event,) = profiler.trace()["traceEvents"]
+    assert event["name"] == "a"
+    assert event["cat"] == "check"
+    assert event["ph"] == "X"
+    assert event["dur"] >= 0
+
+
+def test_main(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    make_repo(tmp_path)
+    trace = tmp_path / "trace.json"
+    main([str(tmp_path), "--select", "PP", "--repeat", "2", "--trace", str(trace)])
+
+    out, _ = capsys.readouterr()
+    assert "PP301" in out
+    events = json.loads(trace.read_text(encoding="utf-8"))["traceEvents"]
+    assert sum(e["name"] == "review" for e in events) == 2
+
+
+def test_memory(tmp_path: Path):
+    make_repo(tmp_path)
+    profiler = Profiler(memory=True)
+    try:
+        process(tmp_path, registry=Registry.load(), profiler=profiler, select={"GH"})
+    finally:
+        profiler.stop()
+
+    (parse,) = (
+        e for e in profiler.events if e.name == "workflows" and e.category == "parse"
+    )
+    (review,) = (e for e in profiler.events if e.category == "review")
+    assert parse.peak >= parse.retained > 0
+    assert review.peak >= parse.peak
+    assert profiler.trace()["traceEvents"][0]["args"]["peak"] == review.peak
+
+
+def test_memory_off():
+    profiler = Profiler()
+    with profiler.span("a", "check"):
+        data = [0] * 1000
+    assert data
+    (event,) = profiler.events
+    assert (event.peak, event.retained) == (0, 0)
@@ -4,13 +4,16 @@ import pytest
 import yaml
 from repo_review.testing import compute_check
 
+from sp_repo_review.batch import review
+from sp_repo_review.checks.general import DirectoryTree
+
 
 @pytest.mark.parametrize("readthedocs", [".readthedocs.yml", ".readthedocs.yaml"])
 def test_rtd100(tmp_path: Path, readthedocs: str) -> None:
     simple = tmp_path / "simple"
     simple.mkdir()
     simple.joinpath(readthedocs).touch()
-    assert compute_check("RTD100", root=simple).result
+    assert compute_check("RTD100", root_tree=DirectoryTree.scan(simple)).result
 
 
 def test_rtd101_true() -> None:
@@ -120,3 +123,20 @@ def test_rtd104_false() -> None:
           os: ubuntu-22.04
     """)
     assert not compute_check("RTD104", readthedocs=readthedocs).result
+
+
+@pytest.mark.parametrize("contents", ["", "# nothing yet\n"])
+def test_rtd_empty_config(tmp_path: Path, contents: str) -> None:
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[project]\nname = 'x'\n", encoding="utf-8"
+    )
+    tmp_path.joinpath(".readthedocs.yaml").write_text(contents, encoding="utf-8")
+    result = review(tmp_path, select={"RTD"}, check_cache=False)
+    assert not result.error
+    assert {r.name: r.result for r in result.results} == {
+        "RTD100": True,
+        "RTD101": False,
+        "RTD102": False,
+        "RTD103": None,
+        "RTD104": False,
+    }
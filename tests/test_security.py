@@ -1,6 +1,9 @@
 import yaml
 from repo_review.testing import compute_check
 
+from sp_repo_review.checks.github import workflow_steps
+from sp_repo_review.checks.precommit import precommit_index
+
 
 def test_sec001_precommit() -> None:
     precommit = yaml.safe_load(
@@ -12,7 +15,11 @@ def test_sec001_precommit() -> None:
               - id: zizmor
         """
     )
-    assert compute_check("SEC001", precommit=precommit, workflows={"ci": {}}).result
+    assert compute_check(
+        "SEC001",
+        precommit_index=precommit_index(precommit),
+        workflow_steps=workflow_steps({"ci": {}}),
+    ).result
 
 
 def test_sec001_action() -> None:
@@ -25,7 +32,11 @@ def test_sec001_action() -> None:
                 - uses: zizmorcore/zizmor-action@v0.5.6
         """
     )
-    assert compute_check("SEC001", precommit={}, workflows=workflows).result
+    assert compute_check(
+        "SEC001",
+        precommit_index=precommit_index({}),
+        workflow_steps=workflow_steps(workflows),
+    ).result
 
 
 def test_sec001_missing() -> None:
@@ -38,4 +49,8 @@ def test_sec001_missing() -> None:
               - id: ruff-check
         """
     )
-    assert not compute_check("SEC001", precommit=precommit, workflows={"ci": {}}).result
+    assert not compute_check(
+        "SEC001",
+        precommit_index=precommit_index(precommit),
+        workflow_steps=workflow_steps({"ci": {}}),
+    ).result
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from sp_repo_review.batch.__main__ import main as batch_main
+from sp_repo_review.batch.merge import main
+from sp_repo_review.batch.shard import Shard, merge, shard_of
+from sp_repo_review.warehouse import Warehouse
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_shard_of_is_stable():
+    names = [f"/fleet/org/repo{n}" for n in range(200)]
+    shards = [shard_of(name, 4) for name in names]
+    assert set(shards) == {1, 2, 3, 4}
+    # Membership only depends on the repository itself
+    assert [shard_of(name, 4) for name in names[::-1]] == shards[::-1]
+    assert shard_of("/fleet/org/repo0", 4) == 3
+
+    assert Shard.parse("2/4") == Shard(index=2, count=4)
+    assert "/fleet/org/repo0" in Shard.parse("3/4")
+    assert str(Shard.parse(" 1 / 3 ")) == "1/3"
+    for bad in ("2", "0/4", "5/4", "a/b", "1/0"):
+        with pytest.raises(ValueError, match="shard"):
+            Shard.parse(bad)
+
+
+@pytest.fixture
+def repos(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    "Relative paths, so the shards are the same every time: 4, 2, 2 of 3."
+    monkeypatch.chdir(tmp_path)
+    paths = []
+    for n in range(8):
+        path = tmp_path / "fleet" / f"repo{n}"
+        path.mkdir(parents=True)
+        path.joinpath("pyproject.toml").write_text(
+            f"[project]\nname = 'repo{n}'\n", encoding="utf-8"
+        )
+        paths.append(f"fleet/repo{n}")
+    return paths
+
+
+def scan(repos: list[str], tmp_path: Path, shard: str) -> Path:
+    output = tmp_path / f"shard{shard.replace('/', 'of')}.jsonl"
+    with pytest.raises(SystemExit):
+        batch_main([*repos, "-j1", "--format=jsonl", f"-o{output}", f"--shard={shard}"])
+    return output
+
+
+def test_shards_merge(repos: list[str], tmp_path: Path):
+    outputs = [scan(repos, tmp_path, f"{i}/3") for i in (1, 2, 3)]
+    headers = [
+        json.loads(o.read_text(encoding="utf-8").splitlines()[0])["shard"]
+        for o in outputs
+    ]
+    assert [(h["index"], h["repos"]) for h in headers] == [(1, 4), (2, 2), (3, 2)]
+
+    merged = merge(outputs)
+    assert merged.problems == []
+    assert "shard" not in merged.header
+    assert [r["path"] for r in merged.reviews] == sorted(repos)
+
+    # A shard given twice is deduplicated
+    merged = merge([*outputs, outputs[0]])
+    assert merged.problems == []
+    assert merged.duplicates == 4
+    assert len(merged.reviews) == len(repos)
+
+
+def test_merge_problems(repos: list[str], tmp_path: Path):
+    outputs = [scan(repos, tmp_path, f"{i}/3") for i in (1, 2, 3)]
+    assert merge(outputs[:2]).problems == ["missing shards 3/3"]
+
+    # Killed partway through
+    lines = outputs[2].read_text(encoding="utf-8").splitlines()
+    outputs[2].write_text("\n".join(lines[:-1]) + "\n", encoding="utf-8")
+    assert merge(outputs).problems == ["shard 3/3 has 1 of 2 repositories"]
+
+    other = scan(repos, tmp_path, "1/2")
+    assert merge([*outputs, other]).problems == [
+        "shards were split different ways: into 2, into 3",
+        "shard 3/3 has 1 of 2 repositories",
+    ]
+
+    # Given a different list of paths
+    moved = tmp_path / "moved.jsonl"
+    moved.write_text(
+        outputs[1].read_text(encoding="utf-8").replace("fleet/", "./fleet/../fleet/"),
+        encoding="utf-8",
+    )
+    assert (
+        merge([outputs[0], moved, other])
+        .problems[0]
+        .endswith("2 repositories belong to another shard than 2/3")
+    )
+
+
+def test_merge_cli(
+    repos: list[str], tmp_path: Path, capsys: pytest.CaptureFixture[str]
+):
+    outputs = [str(scan(repos, tmp_path, f"{i}/2")) for i in (1, 2)]
+    capsys.readouterr()
+
+    with pytest.raises(SystemExit):
+        main(outputs[:1])
+    assert "error: missing shards 2/2" in capsys.readouterr().err
+
+    main([*outputs[:1], "--partial"])
+    captured = capsys.readouterr()
+    assert "warning: missing shards 2/2" in captured.err
+    assert json.loads(captured.out.splitlines()[0])["type"] == "header"
+
+    merged = tmp_path / "merged.jsonl"
+    db = tmp_path / "fleet.sqlite"
+    main([*outputs, "-o", str(merged), "--warehouse", str(db)])
+    assert f"{len(repos)} repositories from 2 files" in capsys.readouterr().err
+    assert len(merged.read_text(encoding="utf-8").splitlines()) == len(repos) + 1
+
+    warehouse = Warehouse(db)
+    try:
+        assert warehouse.scans().rows[0][-1] == len(repos)
+    finally:
+        warehouse.close()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import subprocess
+from typing import TYPE_CHECKING
+
+import pytest
+
+from sp_repo_review.batch import review_many
+from sp_repo_review.batch.__main__ import main
+from sp_repo_review.batch.store import ResultStore, revision
+from sp_repo_review.cache import MAX_FILE_SIZE_ENV
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(  # noqa: S603
+        [
+            "git",
+            "-C",
+            str(repo),
+            "-c",
+            "user.name=Test",
+            "-c",
+            "user.email=test@example.com",
+            "-c",
+            "commit.gpgsign=false",
+            *args,
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+    ).stdout
+
+
+def commit(repo: Path, message: str = "update") -> str:
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", message)
+    return git(repo, "rev-parse", "HEAD").strip()
+
+
+@pytest.fixture
+def repos(tmp_path: Path) -> list[Path]:
+    paths = []
+    for n in range(3):
+        repo = tmp_path / f"repo{n}"
+        repo.mkdir()
+        git(repo, "init", "-q", "-b", "main")
+        repo.joinpath("pyproject.toml").write_text(
+            f"[project]\nname = 'repo{n}'\n", encoding="utf-8"
+        )
+        commit(repo, "first")
+        paths.append(repo)
+    return paths
+
+
+def test_revision(repos: list[Path], tmp_path: Path):
+    repo = repos[0]
+    head = git(repo, "rev-parse", "HEAD").strip()
+    assert revision(repo) == head
+    assert revision(repo / "pyproject.toml") == head
+    assert revision(repo, ref="main") == head
+    assert revision(repo, ref="missing") is None
+
+    # Changes that aren't committed are reviewed, so there's no revision
+    repo.joinpath("README.md").write_text("# x\n", encoding="utf-8")
+    assert revision(repo) is None
+    assert revision(repo, ref="main") == head
+
+    git(tmp_path, "clone", "-q", "--bare", str(repo), "mirror.git")
+    assert revision(tmp_path / "mirror.git") == head
+
+    plain = tmp_path / "plain"
+    plain.mkdir()
+    assert revision(plain) is None
+
+
+def test_review_many_reuses_unchanged(repos: list[Path], tmp_path: Path):
+    path = tmp_path / "store.jsonl"
+    store = ResultStore(path)
+    first = list(review_many(repos, workers=1, store=store))
+    store.close()
+    assert (store.hits, store.misses) == (0, 3)
+    assert not any(r.stored for r in first)
+
+    repos[1].joinpath("noxfile.py").write_text("import nox\n", encoding="utf-8")
+    commit(repos[1])
+
+    store = ResultStore(path)
+    second = list(review_many(repos, workers=1, store=store))
+    store.close()
+    assert (store.hits, store.misses) == (2, 1)
+    assert [r.stored for r in second] == [True, False, True]
+    assert second[0].as_dict() == first[0].as_dict()
+    assert second[1].as_dict() != first[1].as_dict()
+    assert [r.path for r in second] == [str(p) for p in repos]
+
+    # Different settings are stored separately
+    store = ResultStore(path)
+    list(review_many(repos, workers=1, store=store, select={"PY"}))
+    store.close()
+    assert store.misses == 3
+
+
+def test_store_recovers_and_compacts(repos: list[Path], tmp_path: Path):
+    path = tmp_path / "store.jsonl"
+    store = ResultStore(path)
+    reviews = list(review_many(repos, workers=1, store=store))
+    store.close()
+
+    # A scan killed partway through a line
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"key": "trunc')
+    store = ResultStore(path)
+    assert len(store) == 3
+    assert path.read_bytes().endswith(b"\n")
+
+    key = ResultStore.key(repos[0], {})
+    for _ in range(10):
+        store.put(key, "0" * 40, reviews[0])
+    store.close()
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 13
+    store = ResultStore(path)
+    assert len(store) == 4
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 4
+    assert store.get(key, "0" * 40, "other").path == "other"  # type: ignore[union-attr]
+    assert store.get(key, "1" * 40, "other") is None
+    store.close()
+
+
+def test_key(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    key = ResultStore.key(tmp_path, {"select": ["PY"]})
+    assert ResultStore.key(tmp_path, {"select": ["PY"]}) == key
+    assert ResultStore.key(tmp_path, {"select": ["PP"]}) != key
+
+    monkeypatch.setenv(MAX_FILE_SIZE_ENV, "1000")
+    assert ResultStore.key(tmp_path, {"select": ["PY"]}) != key
+    monkeypatch.setenv(MAX_FILE_SIZE_ENV, "0")
+    assert ResultStore.key(tmp_path, {"select": ["PY"]}) == key
+
+    # Such as another version of a plugin
+    monkeypatch.setattr("sp_repo_review.batch.store._plugins", lambda: "other")
+    assert ResultStore.key(tmp_path, {"select": ["PY"]}) != key
+
+
+def test_batch_cli_store(
+    repos: list[Path], tmp_path: Path, capsys: pytest.CaptureFixture[str]
+):
+    args = [
+        *map(str, repos),
+        "--workers=1",
+        "--store",
+        str(tmp_path / "store.jsonl"),
+        "--cache-stats",
+    ]
+    with pytest.raises(SystemExit):
+        main(args)
+    first = capsys.readouterr()
+    assert "result store: 0 hits, 3 misses" in first.err
+
+    with pytest.raises(SystemExit):
+        main(args)
+    second = capsys.readouterr()
+    assert "result store: 3 hits, 0 misses" in second.err
+    assert second.out == first.out
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import yaml as pyyaml
+
+from sp_repo_review._compat import yaml
 from sp_repo_review.checks.ruff import merge
 
 
@@ -14,3 +17,18 @@ def test_merge():
         "d": {"one": 1},
         "e": {"two": 2},
     }
+
+
+def test_yaml_backend():
+    if pyyaml.__with_libyaml__:
+        assert yaml.SafeLoader is pyyaml.CSafeLoader
+        assert yaml.BACKEND == "libyaml"
+    else:
+        assert yaml.SafeLoader is pyyaml.SafeLoader
+        assert yaml.BACKEND == "python"
+
+
+def test_yaml_safe_load():
+    txt = b"on:\n  workflow_dispatch:\njobs:\n  a: {steps: [{uses: x@v1}]}\n"
+    assert yaml.safe_load(txt) == pyyaml.safe_load(txt)
+    assert True in yaml.safe_load(txt)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import csv
+import io
+from typing import TYPE_CHECKING
+
+import pytest
+
+from sp_repo_review.batch import review_many
+from sp_repo_review.batch.__main__ import main as batch_main
+from sp_repo_review.warehouse import Warehouse
+from sp_repo_review.warehouse.__main__ import main
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+def make_repos(tmp_path: Path) -> list[Path]:
+    "Two organizations, where only ``b/`` repositories have a noxfile."
+    paths = []
+    for org, count in (("a", 2), ("b", 3)):
+        for n in range(count):
+            path = tmp_path / org / f"repo{n}"
+            path.mkdir(parents=True)
+            path.joinpath("pyproject.toml").write_text(
+                f"[project]\nname = 'repo{n}'\n", encoding="utf-8"
+            )
+            if org == "b":
+                path.joinpath("noxfile.py").write_text("import nox\n", encoding="utf-8")
+            paths.append(path)
+    return paths
+
+
+@pytest.fixture
+def warehouse(tmp_path: Path) -> Iterator[Warehouse]:
+    db = Warehouse(tmp_path / "fleet.sqlite")
+    yield db
+    db.close()
+
+
+def test_add_reviews(tmp_path: Path, warehouse: Warehouse):
+    paths = make_repos(tmp_path)
+    scan = warehouse.add_reviews(
+        review_many(paths, workers=1), scanned_at="2026-01-01T00:00:00"
+    )
+    assert scan == warehouse.latest_scan() == 1
+
+    families = {row[0]: row for row in warehouse.families().rows}
+    assert families["general"][1] == "General"
+
+    checks = warehouse.checks(family="general")
+    assert set(checks.columns) >= {"check", "passed", "failed", "skipped", "pass_rate"}
+    assert {row[1] for row in checks.rows} == {"general"}
+    rows = {row[0]: dict(zip(checks.columns, row, strict=True)) for row in checks.rows}
+    # PY007 passes with a noxfile
+    assert rows["PY007"]["passed"] == 3
+    assert rows["PY007"]["failed"] == 2
+    assert rows["PY007"]["pass_rate"] == 0.6
+    assert rows["PY007"]["description"]
+
+    failing = warehouse.repos(failing=["PY007"])
+    assert [row[:2] for row in failing.rows] == [
+        (str(paths[0]), "a"),
+        (str(paths[1]), "a"),
+    ]
+    assert failing.rows[0][2]
+    assert warehouse.repos(failing=["PY007"], passing=["PY001"]).rows == failing.rows
+    assert warehouse.repos(failing=["PY007"], skipped=["PY001"]).rows == []
+
+
+def test_trend(tmp_path: Path, warehouse: Warehouse):
+    paths = make_repos(tmp_path)
+    warehouse.add_reviews(review_many(paths, workers=1), scanned_at="2026-01-01")
+    paths[0].joinpath("noxfile.py").write_text("import nox\n", encoding="utf-8")
+    warehouse.add_reviews(review_many(paths, workers=1), scanned_at="2026-02-01")
+
+    trend = warehouse.trend("PY007")
+    assert [(r[0], r[3], r[4]) for r in trend.rows] == [(1, 3, 2), (2, 4, 1)]
+
+    by_org = warehouse.trend("PY007", by_org=True)
+    assert [(r[0], r[2], r[-1]) for r in by_org.rows] == [
+        (1, "a", 0.0),
+        (1, "b", 1.0),
+        (2, "a", 0.5),
+        (2, "b", 1.0),
+    ]
+    # Earlier scans can still be asked about
+    assert len(warehouse.repos(failing=["PY007"], scan=1).rows) == 2
+    assert len(warehouse.repos(failing=["PY007"]).rows) == 1
+
+
+def test_cli(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    paths = make_repos(tmp_path)
+    output = tmp_path / "scan.jsonl"
+    db = str(tmp_path / "fleet.sqlite")
+    with pytest.raises(SystemExit):
+        batch_main([*map(str, paths), "-j1", "--format=jsonl", f"-o{output}"])
+
+    main([db, "import", str(output)])
+    assert "Scans" in capsys.readouterr().out
+
+    main([db, "--csv", "checks", "--family", "general"])
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "check,family,passed,failed,skipped,description,pass_rate"
+    assert any(line.startswith("PY007,general,3,2,0,") for line in lines)
+
+    main([db, "--csv", "repos", "--failing", "PY007"])
+    rows = list(csv.reader(io.StringIO(capsys.readouterr().out)))
+    assert [row[:2] for row in rows] == [
+        ["path", "org"],
+        [str(paths[0]), "a"],
+        [str(paths[1]), "a"],
+    ]
+    assert "noxfile" in rows[1][2]
+
+    main([db, "sql", "SELECT count(*) AS repos FROM repos"])
+    assert "5" in capsys.readouterr().out
+
+    with pytest.raises(SystemExit):
+        main([db, "repos"])
+    with pytest.raises(SystemExit):
+        main([db, "sql", "SELECT nonsense FROM nowhere"])
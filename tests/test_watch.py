@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from repo_review.processor import as_simple_dict
+
+from sp_repo_review.processor import Registry, process
+from sp_repo_review.watch import diff, snapshot, watch
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture(scope="module")
+def registry() -> Registry:
+    return Registry.load()
+
+
+def make_repo(path: Path) -> None:
+    path.joinpath("pyproject.toml").write_text(
+        "[project]\nname = 'x'\n", encoding="utf-8"
+    )
+    path.joinpath("README.md").write_text("# x\n", encoding="utf-8")
+    workflows = path / ".github/workflows"
+    workflows.mkdir(parents=True)
+    workflows.joinpath("ci.yml").write_text("on: push\n", encoding="utf-8")
+
+
+def test_snapshot(tmp_path: Path):
+    make_repo(tmp_path)
+    tmp_path.joinpath("docs").mkdir()
+    tmp_path.joinpath("docs/index.md").write_text("", encoding="utf-8")
+
+    state = snapshot(tmp_path)
+    assert state["pyproject.toml"] is not None
+    assert state[".github/workflows/ci.yml"] is not None
+    # Listed, but not read
+    assert state["README.md"] is None
+    assert state["docs"] is None
+    assert "docs/index.md" not in state
+
+
+def test_diff(tmp_path: Path):
+    make_repo(tmp_path)
+    old = snapshot(tmp_path)
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[project]\nname = 'y2'\n", encoding="utf-8"
+    )
+    tmp_path.joinpath("README.md").unlink()
+    tmp_path.joinpath("noxfile.py").write_text("", encoding="utf-8")
+
+    changes = diff(old, snapshot(tmp_path))
+    assert changes.modified == {"pyproject.toml"}
+    assert changes.added_or_removed == {"README.md", "noxfile.py"}
+    assert not diff(old, old).modified | diff(old, old).added_or_removed
+
+
+def test_watch(tmp_path: Path, registry: Registry):
+    make_repo(tmp_path)
+    updates = watch(tmp_path, interval=0.01, registry=registry)
+
+    first = next(updates)
+    assert first.changed == first.results
+    assert first.rerun == {r.name for r in first.results}
+    before = as_simple_dict(first.results)
+
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[project]\nname = 'x'\n\n[tool.pytest.ini_options]\nminversion = '6'\n",
+        encoding="utf-8",
+    )
+    update = next(updates)
+    _, expected = process(tmp_path, registry=registry)
+    assert as_simple_dict(update.results) == as_simple_dict(expected)
+    assert update.rerun < first.rerun
+    changed = {r.name for r in update.changed}
+    assert "PP301" in changed
+    assert changed == {
+        name
+        for name, result in as_simple_dict(update.results).items()
+        if result != before[name]
+    }
+
+
+def test_watch_survives_errors(tmp_path: Path, registry: Registry):
+    make_repo(tmp_path)
+    updates = watch(tmp_path, interval=0.01, registry=registry)
+    first = next(updates)
+
+    # Saved halfway through an edit
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text("[project]\nname = \n", encoding="utf-8")
+    broken = next(updates)
+    assert broken.error is not None
+    assert broken.error.startswith("TOMLDecodeError: ")
+    assert broken.results == first.results
+    assert broken.changed == []
+
+    pyproject.write_text(
+        "[project]\nname = 'x'\n\n[tool.pytest.ini_options]\nminversion = '6'\n",
+        encoding="utf-8",
+    )
+    fixed = next(updates)
+    assert fixed.error is None
+    _, expected = process(tmp_path, registry=registry)
+    assert as_simple_dict(fixed.results) == as_simple_dict(expected)
+    assert "PP301" in {r.name for r in fixed.changed}
+
+
+def test_watch_starts_broken(tmp_path: Path, registry: Registry):
+    make_repo(tmp_path)
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text("[project\n", encoding="utf-8")
+    updates = watch(tmp_path, interval=0.01, registry=registry)
+    assert next(updates).error is not None
+
+    pyproject.write_text("[project]\nname = 'x'\n", encoding="utf-8")
+    update = next(updates)
+    assert update.error is None
+    assert update.changed == update.results
+    assert update.rerun == {r.name for r in update.results}